@@ -4,7 +4,6 @@ import logging
 from datetime import datetime, timedelta, timezone
 
 import discord
-import requests
 from discord.ext import commands, tasks
 
 log = logging.getLogger(__name__)
@@ -36,7 +35,7 @@ class TwitchMonitor(commands.Cog):
             return None
         return fetched if isinstance(fetched, discord.TextChannel) else None
 
-    def _get_app_token(self) -> str:
+    async def _get_app_token(self) -> str:
         now = datetime.now(timezone.utc)
         if self._token and self._token_expire_at and now < self._token_expire_at:
             return self._token
@@ -46,14 +45,14 @@ class TwitchMonitor(commands.Cog):
         if not client_id or not client_secret:
             raise RuntimeError("TWITCH_CLIENT_ID / TWITCH_CLIENT_SECRET missing")
 
-        resp = requests.post(
+        resp = await self.bot.http_client.post(
             "https://id.twitch.tv/oauth2/token",
+            provider="twitch",
             data={
                 "client_id": client_id,
                 "client_secret": client_secret,
                 "grant_type": "client_credentials",
             },
-            timeout=20,
         )
         resp.raise_for_status()
         data = resp.json()
@@ -62,17 +61,17 @@ class TwitchMonitor(commands.Cog):
         self._token_expire_at = now + timedelta(seconds=max(60, expires_in - 60))
         return self._token
 
-    def _fetch_live_stream(self) -> dict | None:
-        token = self._get_app_token()
+    async def _fetch_live_stream(self) -> dict | None:
+        token = await self._get_app_token()
         client_id = self.bot.settings.twitch_client_id
-        resp = requests.get(
+        resp = await self.bot.http_client.get(
             "https://api.twitch.tv/helix/streams",
+            provider="twitch",
             params={"user_login": MONITOR_LOGIN},
             headers={
                 "Client-ID": client_id,
                 "Authorization": f"Bearer {token}",
             },
-            timeout=20,
         )
         resp.raise_for_status()
         payload = resp.json()
@@ -110,7 +109,7 @@ class TwitchMonitor(commands.Cog):
             return
 
         try:
-            stream = self._fetch_live_stream()
+            stream = await self._fetch_live_stream()
         except Exception as exc:
             log.warning("twitch fetch failed: %s", exc)
             return
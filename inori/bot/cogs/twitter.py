@@ -4,8 +4,8 @@ import logging
 import re
 from datetime import datetime, timedelta, timezone
 
+import aiohttp
 import discord
-import requests
 from discord.ext import commands, tasks
 
 log = logging.getLogger(__name__)
@@ -116,7 +116,7 @@ class TwitterMonitor(commands.Cog):
             return None
         return fetched if isinstance(fetched, discord.TextChannel) else None
 
-    def _fetch_latest_tweet(self) -> dict | None:
+    async def _fetch_latest_tweet(self) -> dict | None:
         key = self.bot.settings.twitterapi_io_key
         if not key:
             raise RuntimeError("TWITTERAPI_IO_KEY missing")
@@ -132,11 +132,12 @@ class TwitterMonitor(commands.Cog):
             f"until:{now_utc.strftime('%Y-%m-%d_%H:%M:%S_UTC')} "
             "-is:retweet"
         )
-        response = requests.get(
+        response = await self.bot.http_client.get(
             f"{self.bot.settings.twitterapi_io_base}/twitter/tweet/advanced_search",
+            provider="twitter",
             headers={"X-API-Key": key},
             params={"query": query, "queryType": "Latest"},
-            timeout=30,
+            timeout=aiohttp.ClientTimeout(total=30),
         )
         response.raise_for_status()
         self._last_checked_utc = now_utc
@@ -164,7 +165,7 @@ class TwitterMonitor(commands.Cog):
             return
 
         try:
-            tweet = self._fetch_latest_tweet()
+            tweet = await self._fetch_latest_tweet()
         except Exception as exc:
             log.warning("twitter fetch failed: %s", exc)
             return
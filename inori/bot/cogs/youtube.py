@@ -3,7 +3,6 @@
 import logging
 
 import discord
-import requests
 from discord.ext import commands, tasks
 
 log = logging.getLogger(__name__)
@@ -32,22 +31,22 @@ class YouTubeMonitor(commands.Cog):
             return None
         return fetched if isinstance(fetched, discord.TextChannel) else None
 
-    def _fetch_latest_video(self) -> dict | None:
+    async def _fetch_latest_video(self) -> dict | None:
         key = self.bot.settings.youtube_api_key
         if not key:
             raise RuntimeError("YOUTUBE_API_KEY missing")
 
-        resp = requests.get(
+        resp = await self.bot.http_client.get(
             "https://www.googleapis.com/youtube/v3/search",
+            provider="youtube",
             params={
                 "part": "snippet",
                 "channelId": MONITOR_CHANNEL_ID,
                 "order": "date",
                 "type": "video",
-                "maxResults": 1,
+                "maxResults": "1",
                 "key": key,
             },
-            timeout=20,
         )
         resp.raise_for_status()
         payload = resp.json()
@@ -66,7 +65,7 @@ class YouTubeMonitor(commands.Cog):
             return
 
         try:
-            item = self._fetch_latest_video()
+            item = await self._fetch_latest_video()
         except Exception as exc:
             log.warning("youtube fetch failed: %s", exc)
             return
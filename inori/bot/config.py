@@ -31,6 +31,8 @@ class Settings:
     twitch_poll_seconds: int
     youtube_poll_seconds: int
     twitter_poll_seconds: int
+    http_timeout_seconds: int
+    http_max_retries: int
     state_file: Path
 
 
@@ -48,6 +50,8 @@ def load_settings() -> Settings:
         twitch_poll_seconds=_to_int("TWITCH_POLL_SECONDS", 60),
         youtube_poll_seconds=_to_int("YOUTUBE_POLL_SECONDS", 300),
         twitter_poll_seconds=_to_int("TWITTER_POLL_SECONDS", 600),
+        http_timeout_seconds=_to_int("HTTP_TIMEOUT_SECONDS", 20),
+        http_max_retries=_to_int("HTTP_MAX_RETRIES", 2),
         state_file=BASE_DIR / "data" / "state.json",
     )
 
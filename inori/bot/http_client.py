@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+import aiohttp
+
+log = logging.getLogger(__name__)
+
+# Statuses worth another attempt; anything else goes back to the caller.
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_RETRY_ERRORS = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError)
+# A Retry-After longer than this is not waited out inline; the response is returned instead.
+_MAX_RETRY_AFTER_SECONDS = 30.0
+_BACKOFF_BASE_SECONDS = 0.5
+_BACKOFF_CAP_SECONDS = 8.0
+
+
+class HttpStatusError(Exception):
+    def __init__(self, response: HttpResponse) -> None:
+        super().__init__(f"HTTP {response.status} for {response.url}")
+        self.response = response
+        self.status = response.status
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+    url: str
+
+    def json(self) -> Any:
+        return json.loads(self.body) if self.body else None
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise HttpStatusError(self)
+
+
+class HttpClient:
+    """Pooled keep-alive aiohttp session shared by the monitor cogs.
+
+    Requests wait for a per-provider concurrency slot; connection errors,
+    timeouts, 429s and 5xx responses are retried with jittered backoff.
+    """
+
+    def __init__(self, *, timeout: float = 20.0, retries: int = 2, limit_per_provider: int = 2) -> None:
+        self.timeout = timeout
+        self.retries = retries
+        self.limit_per_provider = limit_per_provider
+        self._session: aiohttp.ClientSession | None = None
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=4, ttl_dns_cache=300, keepalive_timeout=30),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    def _slot(self, provider: str) -> asyncio.Semaphore:
+        if provider not in self._semaphores:
+            self._semaphores[provider] = asyncio.Semaphore(max(1, self.limit_per_provider))
+        return self._semaphores[provider]
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def request(self, method: str, url: str, *, provider: str = "default", **kwargs: Any) -> HttpResponse:
+        attempt = 0
+        while True:
+            try:
+                async with self._slot(provider):
+                    async with self._get_session().request(method, url, **kwargs) as raw:
+                        response = HttpResponse(raw.status, raw.headers, await raw.read(), str(raw.url))
+            except _RETRY_ERRORS as exc:
+                if attempt >= self.retries:
+                    raise
+                log.debug("%s %s %s failed: %r", provider, method, url, exc)
+                delay = 0.0
+            else:
+                if response.status not in _RETRY_STATUSES or attempt >= self.retries:
+                    return response
+                try:
+                    delay = float(response.headers.get("Retry-After") or 0)
+                except ValueError:
+                    delay = 0.0
+                if delay > _MAX_RETRY_AFTER_SECONDS:
+                    return response
+            backoff = min(_BACKOFF_CAP_SECONDS, _BACKOFF_BASE_SECONDS * 2**attempt) * random.uniform(0.5, 1.0)
+            attempt += 1
+            await asyncio.sleep(max(delay, backoff))
+
+    async def get(self, url: str, **kwargs: Any) -> HttpResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> HttpResponse:
+        return await self.request("POST", url, **kwargs)
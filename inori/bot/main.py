@@ -5,6 +5,7 @@ import logging
 
 import discord
 from bot.config import BASE_DIR, load_settings
+from bot.http_client import HttpClient
 from bot.logging_conf import setup_logging
 from bot.state import StateStore
 from discord.ext import commands
@@ -20,6 +21,7 @@ class InoriBot(commands.Bot):
 
         self.settings = load_settings()
         self.state = StateStore(self.settings.state_file)
+        self.http_client = HttpClient(timeout=self.settings.http_timeout_seconds, retries=self.settings.http_max_retries)
 
         super().__init__(command_prefix="z!", intents=intents, help_command=None)
 
@@ -33,6 +35,10 @@ class InoriBot(commands.Bot):
             await self.load_extension(ext)
             log.info("Loaded extension: %s", ext)
 
+    async def close(self) -> None:
+        await super().close()
+        await self.http_client.close()
+
     async def on_ready(self) -> None:
         log.info("Logged in as %s (%s)", self.user, self.user.id if self.user else "unknown")
 
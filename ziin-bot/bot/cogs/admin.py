@@ -116,6 +116,78 @@ class Admin(Cog_Extension):
         else:
             await ctx.send(t_ctx(ctx, "message_clear_limit"))
 
+    @commands.is_owner()
+    @commands.hybrid_command(with_app_command=True, hidden=True)
+    async def whofollows(self, ctx: commands.Context, provider: str, source: str):
+        provider = provider.strip().lower()
+        if provider not in {"twitch", "youtube", "twitter"}:
+            await ctx.send("provider must be twitch, youtube or twitter")
+            return
+        if provider != "youtube":
+            source = source.strip().lstrip("@").lower()
+
+        subscriptions = self.bot.subscriptions
+        subscriptions.sync()
+        guild_ids = sorted(subscriptions.guild_ids(provider, source))
+        if not guild_ids:
+            await ctx.send(f"no guild follows **{source}** on {provider}")
+            return
+
+        lines = [f"**{source}** on {provider}: {len(guild_ids)} guilds"]
+        for guild_id in guild_ids[:25]:
+            guild = self.bot.get_guild(guild_id)
+            lines.append(f"- {guild.name if guild else 'not joined'} ({guild_id})")
+        if len(guild_ids) > 25:
+            lines.append(f"... and {len(guild_ids) - 25} more")
+        await ctx.send("\n".join(lines))
+
+    @commands.is_owner()
+    @commands.hybrid_command(with_app_command=True, hidden=True)
+    async def polls(self, ctx: commands.Context):
+        lines = ["poll scheduler"]
+        for provider, state in sorted(self.bot.scheduler.status().items()):
+            parts = [f"{state['sources']} sources", f"{state['ready']} waiting"]
+            if state["running"]:
+                parts.append("batch running")
+            if state["failing"]:
+                parts.append(f"{state['failing']} backing off")
+            if state["paused_for"]:
+                paused_for = state["paused_for"]
+                parts.append("paused" if paused_for == float("inf") else f"paused for {paused_for / 60:.0f}m")
+            if state["next_due_in"] is not None:
+                parts.append(f"next in {state['next_due_in']:.0f}s")
+            lines.append(f"- {provider}: " + ", ".join(parts))
+        lines.append("rate limits")
+        for provider, state in sorted(self.bot.governor.stats().items()):
+            parts = [
+                f"{state['tokens']:.0f} tokens",
+                f"{state['throttled']} throttled",
+                f"{state['deferred']} deferred",
+                f"{state['rejected']} rejected",
+            ]
+            if state["blocked_for"]:
+                parts.append(f"blocked for {state['blocked_for']:.0f}s")
+            lines.append(f"- {provider}: " + ", ".join(parts))
+        await ctx.send("\n".join(lines))
+
+    @commands.is_owner()
+    @commands.hybrid_command(with_app_command=True, hidden=True)
+    async def pollpause(self, ctx: commands.Context, provider: str, minutes: Optional[int] = None):
+        provider = provider.strip().lower()
+        if not self.bot.scheduler.pause(provider, minutes * 60 if minutes else None):
+            await ctx.send(f"no poller registered for {provider}")
+            return
+        await ctx.send(f"paused {provider} polling" + (f" for {minutes} minutes" if minutes else " until resumed"))
+
+    @commands.is_owner()
+    @commands.hybrid_command(with_app_command=True, hidden=True)
+    async def pollresume(self, ctx: commands.Context, provider: str):
+        provider = provider.strip().lower()
+        if not self.bot.scheduler.resume(provider):
+            await ctx.send(f"no poller registered for {provider}")
+            return
+        await ctx.send(f"resumed {provider} polling")
+
 
 async def setup(bot: commands.Bot) -> None:
     await bot.add_cog(Admin(bot))
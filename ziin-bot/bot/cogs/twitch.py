@@ -1,24 +1,45 @@
+import asyncio
 import typing
 from datetime import datetime
 import logging
 import os
+import time
 
 import discord
-import requests
 from bot.core.classed import Cog_Extension
 from bot.services.channel_data import (
     ensure_twitch_data,
     ensure_youtube_data,
-    get_twitch_data,
-    save_twitch_data,
-    get_youtube_data,
-    save_youtube_data,
+    get_twitch_followers,
+    load_twitch_followers,
+    list_twitch_logins,
+    set_twitch_live_state,
 )
-from discord.ext import commands, tasks
+from bot.services.http_client import HttpClient, HttpStatusError
+from bot.services.polling import poll_concurrently
+from bot.services.rate_limit import RateLimited
+from bot.services.twitch_eventsub import EventSubClient
+from bot.services.twitch_state import (
+    delete_twitch_live_message,
+    get_twitch_profile,
+    get_twitch_profile_image,
+    load_twitch_live_messages,
+    save_twitch_live_message,
+    save_twitch_profiles,
+    stale_twitch_logins,
+    touch_twitch_profiles,
+    update_twitch_live_fingerprint,
+)
+from discord.ext import commands
 from discord.ext.commands import has_permissions
 
 AUTH_URL = "https://id.twitch.tv/oauth2/token"
-online_title = [{}]
+_HELIX_USERS_BATCH = 100
+# Stream checks still running this long into a batch are dropped and retried shortly.
+_CYCLE_DEADLINE_SECONDS = 50
+# Each login is rescheduled within +/-25% of its interval so checks spread evenly over time.
+_POLL_JITTER = 0.5
+_MAX_BACKOFF_SECONDS = 900
 logger = logging.getLogger("__main__")
 _DEBUG_TWITCH = os.getenv("DEBUG_TWITCH", "0") == "1"
 
@@ -28,7 +49,7 @@ def _debug_twitch(message: str) -> None:
         logger.info("[twitch] %s", message)
 
 
-def _fetch_access_token(client_id: str, client_secret: str) -> str | None:
+async def _fetch_access_token(http: HttpClient, client_id: str, client_secret: str) -> str | None:
     if not client_id or not client_secret:
         return None
     params = {
@@ -37,94 +58,115 @@ def _fetch_access_token(client_id: str, client_secret: str) -> str | None:
         "grant_type": "client_credentials",
     }
     try:
-        response = requests.post(url=AUTH_URL, params=params, timeout=15)
+        response = await http.post(AUTH_URL, provider="twitch", params=params)
         response.raise_for_status()
         return response.json().get("access_token")
     except Exception:
         return None
 
 
-def stream_check(usr: str, guild_data: dict, client_id: str, access_token: str):
+async def stream_check(http: HttpClient, usr: str, client_id: str, access_token: str) -> dict | None:
+    """Return the live helix stream for ``usr`` or None when offline; raises on request failure."""
     head = {
         "Client-ID": client_id,
         "Authorization": f"Bearer {access_token}",
     }
-    try:
-        streams_response = requests.get(
-            "https://api.twitch.tv/helix/streams?user_login=" + usr,
-            headers=head,
-            timeout=15,
-        )
-        streams_response.raise_for_status()
-        streams = streams_response.json().get("data", [])
-    except Exception:
-        return None
-
-    if streams and isinstance(streams[0], dict) and streams[0].get("type") == "live":
-        stream = streams[0]
-        became_online = False
-        if usr in guild_data["offline_streamers"]:
-            guild_data["offline_streamers"].remove(usr)
-        if usr not in guild_data["online_streamers"]:
-            guild_data["online_streamers"].append(usr)
-            became_online = True
-            user_login = stream.get("user_login", usr)
-            online_title[0][user_login] = {"title": stream.get("title", "")}
-            _debug_twitch(
-                f"{usr} -> ONLINE | online={guild_data['online_streamers']} | offline={guild_data['offline_streamers']}"
-            )
-
-        usr_icon = ""
-        try:
-            user_response = requests.get(
-                f"https://api.twitch.tv/helix/users?login={usr}",
-                headers=head,
-                timeout=15,
-            )
-            user_response.raise_for_status()
-            user_data = user_response.json().get("data", [])
-            if user_data and isinstance(user_data[0], dict):
-                usr_icon = user_data[0].get("profile_image_url", "")
-        except Exception:
-            usr_icon = ""
-
-        return stream, usr_icon, became_online
-
-    if usr in guild_data["online_streamers"]:
-        guild_data["online_streamers"].remove(usr)
-    online_title[0].pop(usr, None)
-    if usr not in guild_data["offline_streamers"]:
-        guild_data["offline_streamers"].append(usr)
-    _debug_twitch(
-        f"{usr} -> OFFLINE | online={guild_data['online_streamers']} | offline={guild_data['offline_streamers']}"
+    streams_response = await http.get(
+        "https://api.twitch.tv/helix/streams",
+        provider="twitch",
+        params={"user_login": usr},
+        headers=head,
     )
+    streams_response.raise_for_status()
+    streams = streams_response.json().get("data", [])
+    if streams and isinstance(streams[0], dict) and streams[0].get("type") == "live":
+        return streams[0]
     return None
 
 
-def user_check(streamer: str, client_id: str, access_token: str):
+async def fetch_user_profiles(http: HttpClient, logins: list[str], client_id: str, access_token: str) -> list[dict]:
     head = {
         "Client-ID": client_id,
         "Authorization": f"Bearer {access_token}",
     }
-    url = "https://api.twitch.tv/helix/users?login=" + streamer
-    r = requests.get(url, headers=head, timeout=15).json().get("data", [])
-    if r:
-        return r[0]
-    return False
+    users: list[dict] = []
+    for start in range(0, len(logins), _HELIX_USERS_BATCH):
+        chunk = logins[start : start + _HELIX_USERS_BATCH]
+        response = await http.get(
+            "https://api.twitch.tv/helix/users",
+            provider="twitch",
+            params=[("login", login) for login in chunk],
+            headers=head,
+        )
+        response.raise_for_status()
+        rows = response.json().get("data", [])
+        users.extend(row for row in rows if isinstance(row, dict))
+    return users
+
+
+def live_embed_fingerprint(stream: dict, viewer_granularity: int, thumbnail_bucket: int) -> list:
+    """Summarize what a live embed shows; the first two entries are content, the rest are volatile."""
+    try:
+        viewers = int(stream.get("viewer_count") or 0)
+    except (TypeError, ValueError):
+        viewers = 0
+    return [
+        str(stream.get("title") or ""),
+        str(stream.get("game_name") or ""),
+        viewers // max(1, viewer_granularity),
+        thumbnail_bucket,
+    ]
+
+
+def stream_from_event(login: str, event: dict) -> dict:
+    """Build a minimal helix-shaped stream from a stream.online event when helix lags behind."""
+    return {
+        "id": str(event.get("id") or ""),
+        "user_login": login,
+        "user_name": str(event.get("broadcaster_user_name") or login),
+        "type": "live",
+        "title": "",
+        "game_name": "",
+        "viewer_count": 0,
+        "thumbnail_url": f"https://static-cdn.jtvnw.net/previews-ttv/live_user_{login}-{{width}}x{{height}}.jpg",
+    }
+
+
+def _is_adopted(follower: dict) -> bool:
+    """Live with no stream id: imported from the legacy online list (or marked online on the dashboard).
+
+    The ongoing stream was already announced, so it is left alone until the
+    streamer goes offline.
+    """
+    return bool(follower["is_live"]) and not follower["stream_id"]
+
+
+def _is_transition(followers: list[dict], stream: dict | None) -> bool:
+    if stream is None:
+        return any(follower["is_live"] for follower in followers)
+    stream_id = str(stream.get("id", ""))
+    return any(
+        not follower["is_live"] or (not _is_adopted(follower) and follower["stream_id"] != stream_id)
+        for follower in followers
+    )
 
 
 class Twitch(Cog_Extension):
     def __init__(self, bot):
         super().__init__(bot)
-        self._live_message_ids: dict[tuple[int, str], int] = {}
-        self._live_user_icons: dict[tuple[int, str], str] = {}
+        self._live_messages: dict[tuple[int, str], dict] = load_twitch_live_messages()
+        self._access_token: str | None = None
+        self._eventsub: EventSubClient | None = None
+        self._eventsub_task: asyncio.Task | None = None
+        self._reconciled_session: str | None = None
+        self._eventsub_covers: set[str] = set()
 
-    def _build_live_embed(self, r: dict, usr_icon: str) -> discord.Embed:
+    def _build_live_embed(self, r: dict, usr_icon: str, thumbnail_ts: int) -> discord.Embed:
         title = r.get("title", "Twitch Live")
         twitch_link = "https://www.twitch.tv/" + r.get("user_login", "")
         author_name = f"{r.get('user_name', 'Streamer')} is live now!!"
         thumbnail_base = str(r.get("thumbnail_url", "")).replace("{width}x{height}", "1920x1080")
-        thumbnail = f"{thumbnail_base}?ts={int(datetime.utcnow().timestamp())}" if thumbnail_base else ""
+        thumbnail = f"{thumbnail_base}?ts={thumbnail_ts}" if thumbnail_base else ""
 
         embed = discord.Embed(title=title, url=twitch_link, timestamp=datetime.utcnow())
         embed.set_author(name=author_name, icon_url=usr_icon)
@@ -142,70 +184,261 @@ class Twitch(Cog_Extension):
 
     @commands.Cog.listener()
     async def on_ready(self):
-        if not self.check_online_twitch.is_running():
-            self.check_online_twitch.start()
+        self.bot.scheduler.register(
+            "twitch",
+            self._poll_streams,
+            self._twitch_sources,
+            jitter=_POLL_JITTER,
+            max_backoff=_MAX_BACKOFF_SECONDS,
+        )
+        self._start_eventsub()
+
+    async def cog_unload(self) -> None:
+        self.bot.scheduler.unregister("twitch")
+        if self._eventsub_task is not None:
+            self._eventsub_task.cancel()
+
+    def _start_eventsub(self) -> None:
+        settings = self.bot.settings
+        if not settings.twitch_eventsub_enabled or self._eventsub_task is not None:
+            return
+        if not settings.twitch_client_id or not settings.twitch_user_access_token:
+            logger.warning("TWITCH_EVENTSUB=1 but TWITCH_CLIENT_ID/TWITCH_USER_ACCESS_TOKEN missing; polling only")
+            return
+        self._eventsub = EventSubClient(
+            http=self.http_client,
+            client_id=settings.twitch_client_id,
+            access_token=settings.twitch_user_access_token,
+            on_event=self._on_eventsub_event,
+            ws_url=settings.twitch_eventsub_ws_url,
+            api_url=settings.twitch_eventsub_api_url,
+        )
+        self._eventsub_task = asyncio.create_task(self._eventsub.run())
+
+    async def _lookup_stream(self, login: str, attempts: int = 1) -> dict | None:
+        client_id = self.bot.settings.twitch_client_id
+        for attempt in range(attempts):
+            if attempt:
+                await asyncio.sleep(5)
+            if not self._access_token:
+                self._access_token = await _fetch_access_token(
+                    self.http_client, client_id, self.bot.settings.twitch_client_secret
+                )
+            if not self._access_token:
+                return None
+            try:
+                stream = await stream_check(self.http_client, login, client_id, self._access_token)
+            except Exception as exc:
+                _debug_twitch(f"stream lookup failed user={login} error={exc}")
+                continue
+            if stream is not None:
+                return stream
+        return None
+
+    async def _on_eventsub_event(self, subscription_type: str, event: dict) -> None:
+        login = str(event.get("broadcaster_user_login") or "").strip().lower()
+        if not login:
+            return
+        _debug_twitch(f"eventsub {subscription_type} user={login}")
+
+        if subscription_type == "stream.offline":
+            await self._apply_stream(login, None)
+            return
+
+        if subscription_type == "stream.online":
+            stream = await self._lookup_stream(login, attempts=3) or stream_from_event(login, event)
+            await self._apply_stream(login, stream)
+            return
+
+        if subscription_type == "channel.update":
+            if not any(follower["is_live"] for follower in get_twitch_followers(login)):
+                return
+            stream = await self._lookup_stream(login)
+            if stream is not None:
+                await self._apply_stream(login, stream)
+
+    async def _sync_eventsub(self, logins: list[str]) -> set[str]:
+        """Keep EventSub subscriptions in line with ``logins``; return the logins polling can skip."""
+        if self._eventsub is None:
+            return set()
+        logins_by_id: dict[str, str] = {}
+        for login in logins:
+            profile = get_twitch_profile(login)
+            if profile and profile["id"]:
+                logins_by_id[profile["id"]] = login
+        self._eventsub.sync_broadcasters(logins_by_id)
+
+        if not self._eventsub.connected:
+            self._reconciled_session = None
+            return set()
+        if self._reconciled_session != self._eventsub.session_id:
+            # New session: poll everything once to catch transitions missed while disconnected.
+            self._reconciled_session = self._eventsub.session_id
+            self.bot.scheduler.wake("twitch")
+            return set()
+        return {logins_by_id[broadcaster_id] for broadcaster_id in self._eventsub.covered & set(logins_by_id)}
 
     @commands.Cog.listener()
     async def on_guild_join(self, guild: discord.Guild):
         ensure_twitch_data(guild.id)
         ensure_youtube_data(guild.id)
 
-    @tasks.loop(seconds=60)
-    async def check_online_twitch(self):
+    async def _refresh_profiles(self, logins: list[str], client_id: str, access_token: str) -> None:
+        ttl_seconds = self.bot.settings.twitch_profile_ttl_hours * 3600
+        stale = stale_twitch_logins(logins, ttl_seconds)
+        if not stale:
+            return
+        try:
+            users = await fetch_user_profiles(self.http_client, stale, client_id, access_token)
+        except Exception as exc:
+            _debug_twitch(f"profile refresh failed logins={len(stale)} error={exc}")
+            return
+
+        save_twitch_profiles(users)
+        returned = {str(user.get("login", "")).lower() for user in users}
+        touch_twitch_profiles([login for login in stale if login not in returned])
+        _debug_twitch(f"profile refresh requested={len(stale)} returned={len(users)}")
+
+    def _should_edit(self, live_message: dict, fingerprint: list, now: int) -> bool:
+        previous = live_message.get("fingerprint")
+        if previous == fingerprint:
+            return False
+        if not previous or previous[:2] != fingerprint[:2]:
+            return True
+        return now - live_message.get("edited_at", 0) >= self.bot.settings.twitch_min_edit_seconds
+
+    async def _apply_stream(self, login: str, stream: dict | None, followers: list[dict] | None = None) -> None:
+        """Apply ``stream`` (None when offline) to every guild following ``login``.
+
+        ``followers`` may be a snapshot preloaded for the whole cycle; it is
+        re-read before a live/offline transition in case EventSub got there first.
+        """
+        if followers is None or _is_transition(followers, stream):
+            followers = get_twitch_followers(login)
+        if stream is None:
+            if any(follower["is_live"] for follower in followers):
+                set_twitch_live_state(login, False)
+                _debug_twitch(f"{login} -> OFFLINE | guilds={len(followers)}")
+            for follower in followers:
+                key = (follower["guild_id"], login)
+                if self._live_messages.pop(key, None):
+                    delete_twitch_live_message(*key)
+            return
+
+        stream_id = str(stream.get("id", ""))
+        if not stream_id:
+            # Stored without an id the stream would look already announced; wait for a full one.
+            _debug_twitch(f"stream without id user={login}")
+            return
+        if _is_transition(followers, stream):
+            set_twitch_live_state(login, True, stream_id)
+            _debug_twitch(f"{login} -> ONLINE | stream={stream_id} guilds={len(followers)}")
+
+        for follower in followers:
+            try:
+                await self._notify_guild(follower, login, stream)
+            except Exception as exc:
+                _debug_twitch(f"notify failed guild={follower['guild_id']} user={login} error={exc}")
+
+    async def _notify_guild(self, follower: dict, login: str, stream: dict) -> None:
+        if _is_adopted(follower):
+            return
+        channel_id = follower["twitch_notification_channel"]
+        channel = self.bot.get_channel(int(channel_id)) if channel_id else None
+        if not channel:
+            return
+
+        guild_id = follower["guild_id"]
+        key = (guild_id, login)
+        refresh_seconds = self.bot.settings.twitch_thumbnail_refresh_seconds
+        now = int(time.time())
+        thumbnail_bucket = now // refresh_seconds
+        fingerprint = live_embed_fingerprint(stream, self.bot.settings.twitch_viewer_granularity, thumbnail_bucket)
+        stream_id = str(stream.get("id", ""))
+        live_message = self._live_messages.get(key)
+        became_online = not follower["is_live"] or follower["stream_id"] != stream_id
+        is_new = became_online or live_message is None or live_message["stream_id"] != stream_id
+        if not is_new and not self._should_edit(live_message, fingerprint, now):
+            return
+
+        usr_icon = get_twitch_profile_image(stream.get("user_login", login))
+        embed = self._build_live_embed(stream, usr_icon, thumbnail_bucket * refresh_seconds)
+
+        if is_new:
+            twitch_link = "https://www.twitch.tv/" + stream.get("user_login", login)
+            text = follower["twitch_notification_text"].replace("{streamer}", stream.get("user_name", login)).replace("{url}", twitch_link)
+            msg = await channel.send(content=text, embed=embed)
+            self._live_messages[key] = {
+                "stream_id": stream_id,
+                "message_id": msg.id,
+                "channel_id": channel.id,
+                "fingerprint": fingerprint,
+                "edited_at": now,
+            }
+            save_twitch_live_message(guild_id, login, stream_id, msg.id, channel.id, fingerprint)
+            return
+
+        msg_id = live_message["message_id"]
+        try:
+            partial = self.bot.get_partial_messageable(live_message["channel_id"]).get_partial_message(msg_id)
+            await partial.edit(embed=embed)
+        except Exception:
+            _debug_twitch(f"message edit failed guild={guild_id} user={login} message_id={msg_id}")
+            return
+        live_message["fingerprint"] = fingerprint
+        live_message["edited_at"] = now
+        update_twitch_live_fingerprint(guild_id, login, fingerprint, now)
+
+    async def _twitch_sources(self) -> dict[str, float]:
+        self.bot.subscriptions.sync()
+        logins = self.bot.subscriptions.sources("twitch")
+        self._eventsub_covers = await self._sync_eventsub(logins)
+        interval = self.bot.settings.twitch_poll_seconds
+        return {login: interval for login in logins}
+
+    async def _poll_streams(self, logins: list[str]) -> dict[str, bool]:
+        """Check the streams of a due batch of ``logins``; the scheduler reschedules each by its outcome."""
+        blocked = self.bot.governor.deferral("twitch", len(logins))
+        if blocked:
+            # Twitch told us to back off; leave the batch unreached so it is retried, not failed.
+            self.bot.scheduler.pause("twitch", blocked)
+            return {}
         client_id = self.bot.settings.twitch_client_id
-        client_secret = self.bot.settings.twitch_client_secret
-        access_token = _fetch_access_token(client_id, client_secret)
+        if not self._access_token:
+            self._access_token = await _fetch_access_token(
+                self.http_client, client_id, self.bot.settings.twitch_client_secret
+            )
+        access_token = self._access_token
         if not access_token:
-            return
+            return dict.fromkeys(logins, False)
 
-        for guild in self.bot.guilds:
-            guild_data = get_twitch_data(guild.id)
-            for usr in list(guild_data["all_streamers"]):
-                try:
-                    result = stream_check(usr, guild_data, client_id, access_token)
-                except Exception:
-                    _debug_twitch(f"stream_check exception guild={guild.id} user={usr}")
-                    continue
-
-                save_twitch_data(guild.id, guild_data)
-                _debug_twitch(
-                    f"saved guild={guild.id} user={usr} | online={guild_data['online_streamers']} | offline={guild_data['offline_streamers']}"
-                )
+        await self._refresh_profiles(logins, client_id, access_token)
+        results: dict[str, bool] = {}
+        covered = self._eventsub_covers.intersection(logins)
+        if covered:
+            # Transitions of covered streamers arrive over EventSub; only refresh viewer counts of
+            # the live ones. Streamers EventSub could not subscribe are polled as usual.
+            live = set(list_twitch_logins(live_only=True))
+            results = {login: True for login in covered if login not in live}
+            logins = [login for login in logins if login not in results]
 
-                key = (guild.id, usr)
-                if not result:
-                    if usr not in guild_data["online_streamers"]:
-                        self._live_message_ids.pop(key, None)
-                        self._live_user_icons.pop(key, None)
-                    continue
-
-                r, usr_icon, became_online = result
-                if not isinstance(r, dict):
-                    continue
-
-                channel_id = guild_data.get("twitch_notification_channel")
-                channel = self.bot.get_channel(int(channel_id)) if channel_id else None
-                if not channel:
-                    continue
-
-                cached_icon = usr_icon or self._live_user_icons.get(key, "")
-                embed = self._build_live_embed(r, cached_icon)
-
-                if became_online or key not in self._live_message_ids:
-                    twitch_link = "https://www.twitch.tv/" + r.get("user_login", usr)
-                    text = guild_data["twitch_notification_text"].replace("{streamer}", r.get("user_name", usr)).replace("{url}", twitch_link)
-                    msg = await channel.send(content=text, embed=embed)
-                    self._live_message_ids[key] = msg.id
-                    self._live_user_icons[key] = cached_icon
-                else:
-                    msg_id = self._live_message_ids.get(key)
-                    if not msg_id:
-                        continue
-                    try:
-                        msg = await channel.fetch_message(msg_id)
-                        await msg.edit(embed=embed)
-                    except Exception:
-                        _debug_twitch(f"message edit failed guild={guild.id} user={usr} message_id={msg_id}")
+        followers = load_twitch_followers(logins)
+        async for login, stream, error in poll_concurrently(
+            logins,
+            lambda login: stream_check(self.http_client, login, client_id, access_token),
+            concurrency=self.bot.settings.twitch_concurrency,
+            deadline=_CYCLE_DEADLINE_SECONDS,
+        ):
+            if isinstance(error, RateLimited):
+                continue
+            results[login] = error is None
+            if error is not None:
+                _debug_twitch(f"stream_check failed user={login} error={error}")
+                if isinstance(error, HttpStatusError) and error.status == 401:
+                    self._access_token = None
+                continue
+            await self._apply_stream(login, stream, followers.get(login, []))
+        return results
 
 async def setup(bot: commands.Bot) -> None:
     await bot.add_cog(Twitch(bot))
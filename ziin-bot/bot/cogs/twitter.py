@@ -8,16 +8,41 @@ import traceback
 import typing
 
 import discord
-import requests
 from bot.core.classed import Cog_Extension
-from bot.services.channel_data import ensure_twitter_data, get_twitter_data, save_twitter_data
-from discord.ext import commands, tasks
+from bot.services.channel_data import (
+    ensure_twitter_data,
+    get_twitter_data,
+    record_twitter_post,
+    save_twitter_data,
+)
+from bot.services.http_client import HttpClient
+from bot.services.polling import poll_concurrently
+from bot.services.rate_limit import RateLimited
+from bot.services.seen_items import filter_unseen, mark_seen, prune_seen_items
+from bot.services.twitter_state import load_twitter_cursors, save_twitter_cursors
+from discord.ext import commands
 from discord.ext.commands import has_permissions
 
 logger = logging.getLogger("__main__")
 _DEBUG_TWITTER = os.getenv("DEBUG_TWITTER", "0") == "1"
 _TWITTERAPI_IO_BASE = (os.getenv("TWITTERAPI_IO_BASE", "https://api.twitterapi.io") or "https://api.twitterapi.io").rstrip("/")
 _TWITTERAPI_IO_KEY = (os.getenv("TWITTERAPI_IO_KEY", "") or "").strip()
+# advanced_search rejects queries longer than this; combined from:a OR from:b queries are packed under it.
+_MAX_QUERY_LENGTH = 512
+_MAX_SEARCH_PAGES = 5
+# A search cut short by the page limit is re-run this many times with ``until:`` moved back.
+_MAX_SEARCH_CONTINUATIONS = 4
+# Each window starts this far before the previous one ended to absorb search indexing lag;
+# the per-handle since-id filter drops anything already seen.
+_WINDOW_OVERLAP = timedelta(seconds=60)
+# Announced tweet ids are pruned from seen_items at most this often.
+_SEEN_PRUNE_INTERVAL_SECONDS = 24 * 3600
+# Searches still running this long into a batch are dropped; their handles keep their cursors.
+_CYCLE_DEADLINE_SECONDS = 480
+# Handles are rescheduled within +/-5% of the interval and those coming due within two minutes
+# of each other are searched together, keeping combined queries full.
+_POLL_JITTER = 0.1
+_POLL_COALESCE_SECONDS = 120
 
 
 def _debug_twitter(message: str) -> None:
@@ -37,15 +62,6 @@ def _normalize_handle(value: str) -> str:
     return raw.lstrip("@").lower()
 
 
-def _append_unique_id(bucket: list[str], value: str) -> bool:
-    if not isinstance(value, str) or not value:
-        return False
-    if value in bucket:
-        return False
-    bucket.append(value)
-    return True
-
-
 def _get_nested(data: object, *path: str) -> object:
     current = data
     for key in path:
@@ -55,53 +71,113 @@ def _get_nested(data: object, *path: str) -> object:
     return current
 
 
-def _extract_tweets(payload: object) -> list[dict[str, object]]:
-    direct_candidates: list[object] = []
-    if isinstance(payload, dict):
-        direct_candidates.extend(
-            [
-                payload.get("tweets"),
-                payload.get("data"),
-                _get_nested(payload, "result", "tweets"),
-                payload.get("result"),
-                _get_nested(payload, "timeline", "tweets"),
-            ]
-        )
-    elif isinstance(payload, list):
-        direct_candidates.append(payload)
-    else:
-        return []
-
-    for candidate in direct_candidates:
-        if isinstance(candidate, list):
-            rows = [item for item in candidate if isinstance(item, dict)]
-            if rows:
-                return rows
-
+# Where known providers put the tweet list, tried before walking the whole payload.
+_TWEET_LIST_PATHS: tuple[tuple[str, ...], ...] = (
+    ("tweets",),
+    ("data",),
+    ("result", "tweets"),
+    ("result",),
+    ("timeline", "tweets"),
+)
+# A route is the key path from the payload root to a tweet; None steps iterate a list.
+_Route = typing.Tuple[typing.Optional[str], ...]
+_tweet_routes: tuple[_Route, ...] | None = None
+
+
+def _follow_route(payload: object, route: _Route) -> list[dict[str, object]]:
+    nodes: list[object] = [payload]
+    for step in route:
+        following: list[object] = []
+        for node in nodes:
+            if step is None:
+                if isinstance(node, list):
+                    following.extend(node)
+            elif isinstance(node, dict):
+                value = node.get(step)
+                if value is not None:
+                    following.append(value)
+        nodes = following
+        if not nodes:
+            break
+    return [node for node in nodes if isinstance(node, dict)]
+
+
+def _walk_tweets(payload: object) -> tuple[list[dict[str, object]], list[_Route]]:
+    """Find tweets anywhere in ``payload``; also return the distinct routes they were found at."""
     matches: list[dict[str, object]] = []
+    routes: dict[_Route, None] = {}
 
-    def _walk(node: object) -> None:
+    def _walk(node: object, route: _Route) -> None:
         if isinstance(node, dict):
             normalized = node.get("tweet")
             if isinstance(normalized, dict):
                 node = normalized
+                route = route + ("tweet",)
 
             if any(key in node for key in ("id", "tweetId", "rest_id")):
                 matches.append(node)
+                routes.setdefault(route)
                 return
 
-            for value in node.values():
-                _walk(value)
+            for key, value in node.items():
+                _walk(value, route + (key,))
             return
 
         if isinstance(node, list):
             for item in node:
-                _walk(item)
+                _walk(item, route + (None,))
 
-    _walk(payload)
+    _walk(payload, ())
+    return matches, list(routes)
+
+
+def _extract_tweets(payload: object) -> list[dict[str, object]]:
+    """Return the tweet dicts in a search payload.
+
+    The first payload that yields tweets teaches the routes to them; later
+    payloads are read along those routes directly. Anything that does not fit
+    goes through detection again, with a recursive walk as the last resort.
+    """
+    global _tweet_routes
+    if isinstance(payload, list):
+        return [item for item in payload if isinstance(item, dict)]
+    if not isinstance(payload, dict):
+        return []
+
+    if _tweet_routes is not None:
+        rows = [row for route in _tweet_routes for row in _follow_route(payload, route)]
+        if rows:
+            return rows
+        first = _tweet_routes[0]
+        if len(_tweet_routes) == 1 and first[-1:] == (None,) and isinstance(_get_nested(payload, *first[:-1]), list):
+            return []  # the learned list is there, just empty
+
+    for path in _TWEET_LIST_PATHS:
+        candidate = _get_nested(payload, *path)
+        if isinstance(candidate, list):
+            rows = [item for item in candidate if isinstance(item, dict)]
+            if rows:
+                _learn_tweet_routes([path + (None,)])
+                return rows
+
+    matches, routes = _walk_tweets(payload)
+    if routes:
+        _learn_tweet_routes(routes)
     return matches
 
 
+def _learn_tweet_routes(routes: list[_Route]) -> None:
+    global _tweet_routes
+    learned = tuple(routes)
+    if learned != _tweet_routes:
+        _debug_twitter(f"payload shape: tweets at {[_format_route(route) for route in learned]}")
+        _tweet_routes = learned
+
+
+def _format_route(route: _Route) -> str:
+    return ".".join("[]" if step is None else step for step in route)
+
+
 def _tweet_author_handle(tweet: dict[str, object]) -> str:
     author = tweet.get("author") if isinstance(tweet.get("author"), dict) else {}
     raw = (
@@ -124,7 +200,37 @@ def _is_retweet(tweet: dict[str, object]) -> bool:
     return False
 
 
-def _extract_first_image_url(tweet: dict[str, object]) -> str:
+class _FieldAccessor:
+    """Reads one field from tweets whose layout varies between providers.
+
+    ``probes`` maps the top-level tweet key a probe reads to the probe, in
+    priority order. Every tweet is probed in that order, so the result only
+    depends on the tweet itself. The probes worth running are learned once
+    per tweet shape (which of those keys it carries); the rest are skipped.
+    """
+
+    def __init__(self, name: str, probes: dict[str, typing.Callable[[dict[str, object]], str]]) -> None:
+        self.name = name
+        self._probes = probes
+        self._shapes: dict[tuple[str, ...], tuple[typing.Callable[[dict[str, object]], str], ...]] = {}
+
+    def reset(self) -> None:
+        self._shapes.clear()
+
+    def __call__(self, tweet: dict[str, object]) -> str:
+        shape = tuple(key for key in self._probes if key in tweet)
+        probes = self._shapes.get(shape)
+        if probes is None:
+            _debug_twitter(f"payload shape: {self.name} from {list(shape)}")
+            probes = self._shapes[shape] = tuple(self._probes[key] for key in shape)
+        for probe in probes:
+            value = probe(tweet)
+            if value:
+                return value
+        return ""
+
+
+def _image_from_media(tweet: dict[str, object]) -> str:
     media = tweet.get("media")
     if isinstance(media, list):
         for item in media:
@@ -132,7 +238,10 @@ def _extract_first_image_url(tweet: dict[str, object]) -> str:
                 value = item.get("media_url_https") or item.get("mediaUrl") or item.get("url") or item.get("media_url")
                 if isinstance(value, str) and value.strip():
                     return value.strip()
+    return ""
+
 
+def _image_from_photos(tweet: dict[str, object]) -> str:
     photos = tweet.get("photos")
     if isinstance(photos, list):
         for item in photos:
@@ -140,7 +249,10 @@ def _extract_first_image_url(tweet: dict[str, object]) -> str:
                 value = item.get("url")
                 if isinstance(value, str) and value.strip():
                     return value.strip()
+    return ""
+
 
+def _image_from_extended_entities(tweet: dict[str, object]) -> str:
     extended = tweet.get("extendedEntities")
     if isinstance(extended, dict):
         media = extended.get("media")
@@ -154,7 +266,7 @@ def _extract_first_image_url(tweet: dict[str, object]) -> str:
     return ""
 
 
-def _extract_first_video_url(tweet: dict[str, object]) -> str:
+def _video_from_media(tweet: dict[str, object]) -> str:
     media = tweet.get("media")
     if isinstance(media, list):
         for item in media:
@@ -182,13 +294,19 @@ def _extract_first_video_url(tweet: dict[str, object]) -> str:
             if isinstance(media_type, str) and media_type.lower() in {"video", "animated_gif"}:
                 if isinstance(url, str) and url.strip():
                     return url.strip()
+    return ""
 
+
+def _video_from_video(tweet: dict[str, object]) -> str:
     video = tweet.get("video")
     if isinstance(video, dict):
         direct = video.get("url")
         if isinstance(direct, str) and direct.strip():
             return direct.strip()
+    return ""
+
 
+def _video_from_extended_entities(tweet: dict[str, object]) -> str:
     extended = tweet.get("extendedEntities")
     if isinstance(extended, dict):
         media = extended.get("media")
@@ -226,23 +344,52 @@ def _extract_first_video_url(tweet: dict[str, object]) -> str:
     return ""
 
 
-def _extract_profile_image_url(tweet: dict[str, object]) -> str:
-    author = tweet.get("author")
-    if isinstance(author, dict):
-        keys = ["profilePicture", "profile_image_url_https", "profile_image_url", "avatar", "avatarUrl"]
-        for key in keys:
-            value = author.get(key)
-            if isinstance(value, str) and value.strip():
-                return value.strip()
-
-    user = tweet.get("user")
-    if isinstance(user, dict):
-        keys = ["profile_image_url_https", "profile_image_url", "avatar", "avatarUrl"]
-        for key in keys:
-            value = user.get(key)
-            if isinstance(value, str) and value.strip():
-                return value.strip()
-    return ""
+def _profile_image_from(container: str, keys: tuple[str, ...]) -> typing.Callable[[dict[str, object]], str]:
+    def _probe(tweet: dict[str, object]) -> str:
+        owner = tweet.get(container)
+        if isinstance(owner, dict):
+            for key in keys:
+                value = owner.get(key)
+                if isinstance(value, str) and value.strip():
+                    return value.strip()
+        return ""
+
+    return _probe
+
+
+_extract_first_image_url = _FieldAccessor(
+    "image",
+    {
+        "media": _image_from_media,
+        "photos": _image_from_photos,
+        "extendedEntities": _image_from_extended_entities,
+    },
+)
+_extract_first_video_url = _FieldAccessor(
+    "video",
+    {
+        "media": _video_from_media,
+        "video": _video_from_video,
+        "extendedEntities": _video_from_extended_entities,
+    },
+)
+_extract_profile_image_url = _FieldAccessor(
+    "profile image",
+    {
+        "author": _profile_image_from(
+            "author", ("profilePicture", "profile_image_url_https", "profile_image_url", "avatar", "avatarUrl")
+        ),
+        "user": _profile_image_from("user", ("profile_image_url_https", "profile_image_url", "avatar", "avatarUrl")),
+    },
+)
+
+
+def _reset_payload_shape() -> None:
+    """Forget the learned payload layout (used by the benchmark to measure cold parsing)."""
+    global _tweet_routes
+    _tweet_routes = None
+    for accessor in (_extract_first_image_url, _extract_first_video_url, _extract_profile_image_url):
+        accessor.reset()
 
 
 def _clean_tweet_text(text: str) -> str:
@@ -271,75 +418,138 @@ def _format_advanced_search_time(value: datetime) -> str:
     return value.astimezone(timezone.utc).strftime("%Y-%m-%d_%H:%M:%S_UTC")
 
 
-def _resolve_latest_tweet(handle: str, since_utc: datetime, until_utc: datetime) -> dict[str, str] | None:
+def _build_search_queries(
+    handles: list[str],
+    since_utc: datetime,
+    until_utc: datetime,
+    since_ids: dict[str, str] | None = None,
+) -> list[tuple[str, list[str]]]:
+    """Pack handles into ``(from:a OR from:b ...)`` queries that stay under ``_MAX_QUERY_LENGTH``.
+
+    When every handle in a query has a known last tweet id, the smallest one is
+    added as ``since_id:`` so the provider skips what was already delivered.
+    """
+    since_ids = since_ids or {}
+    window = (
+        f" since:{_format_advanced_search_time(since_utc)}"
+        f" until:{_format_advanced_search_time(until_utc)}"
+        " -is:retweet"
+    )
+    queries: list[tuple[str, list[str]]] = []
+    group: list[str] = []
+
+    def _render(members: list[str]) -> str:
+        query = "(" + " OR ".join(f"from:{member}" for member in members) + ")" + window
+        ids = [since_ids.get(member, "") for member in members]
+        if all(tweet_id.isdigit() for tweet_id in ids):
+            query += f" since_id:{min(ids, key=int)}"
+        return query
+
+    for handle in handles:
+        if group and len(_render(group + [handle])) > _MAX_QUERY_LENGTH:
+            queries.append((_render(group), group))
+            group = []
+        group.append(handle)
+    if group:
+        queries.append((_render(group), group))
+    return queries
+
+
+async def _search_tweets(http: HttpClient, query: str) -> tuple[list[dict[str, object]], bool]:
+    """Run one advanced_search query, following ``next_cursor`` for up to ``_MAX_SEARCH_PAGES`` pages.
+
+    Returns the tweets and whether the page limit cut the results short, in
+    which case older tweets in the window were not fetched.
+    """
     if not _TWITTERAPI_IO_KEY:
         raise RuntimeError("TWITTERAPI_IO_KEY is missing")
 
     url = f"{_TWITTERAPI_IO_BASE}/twitter/tweet/advanced_search"
     headers = {"X-API-Key": _TWITTERAPI_IO_KEY}
-    query = (
-        f"from:{handle} "
-        f"since:{_format_advanced_search_time(since_utc)} "
-        f"until:{_format_advanced_search_time(until_utc)} "
-        "-is:retweet"
-    )
     params = {"query": query, "queryType": "Latest"}
-
-    _debug_twitter(f"twitterapi request start handle={handle} query={query}")
-    response = requests.get(url, headers=headers, params=params, timeout=30)
-    response.raise_for_status()
-
-    payload = response.json()
-    tweets = _extract_tweets(payload)
-    if not tweets:
-        if isinstance(payload, dict):
-            _debug_twitter(f"twitterapi payload keys handle={handle} keys={list(payload.keys())}")
-        _debug_twitter(f"twitterapi empty tweets handle={handle}")
-        return None
-
-    monitor = _normalize_handle(handle)
-    first: dict[str, object] | None = None
-    for row in tweets:
+    tweets: list[dict[str, object]] = []
+    for page in range(_MAX_SEARCH_PAGES):
+        _debug_twitter(f"twitterapi request page={page} query={query}")
+        response = await http.get(url, provider="twitter", headers=headers, params=params, timeout=30)
+        response.raise_for_status()
+
+        payload = response.json()
+        rows = _extract_tweets(payload)
+        if not rows and isinstance(payload, dict):
+            _debug_twitter(f"twitterapi payload keys={list(payload.keys())}")
+        tweets.extend(rows)
+
+        next_cursor = payload.get("next_cursor") if isinstance(payload, dict) else None
+        if not rows or not payload.get("has_next_page") or not isinstance(next_cursor, str) or not next_cursor:
+            return tweets, False
+        params["cursor"] = next_cursor
+    _debug_twitter(f"twitterapi search truncated after {_MAX_SEARCH_PAGES} pages query={query}")
+    return tweets, True
+
+
+def _oldest_tweet_time(rows: list[dict[str, object]]) -> datetime | None:
+    times = []
+    for row in rows:
         candidate = row.get("tweet") if isinstance(row.get("tweet"), dict) else row
-        if not isinstance(candidate, dict):
-            continue
-        if _is_retweet(candidate):
-            continue
-        if _tweet_author_handle(candidate) != monitor:
-            continue
-        first = candidate
-        break
-
-    if first is None:
-        _debug_twitter(f"twitterapi no matched tweet handle={handle}")
-        return None
-
-    tweet_id_raw = first.get("id") or first.get("tweetId") or first.get("rest_id") or first.get("tweet_id")
+        created_at = candidate.get("createdAt") or candidate.get("created_at")
+        parsed = _parse_twitter_time(str(created_at)) if created_at else None
+        if parsed is not None:
+            times.append(parsed)
+    return min(times, default=None)
+
+
+async def _search_window(http: HttpClient, query: str) -> tuple[list[dict[str, object]], bool]:
+    """Fetch every tweet ``query`` matches, working back through its window.
+
+    Results come newest first, so when the page limit cuts a search short the
+    query is re-run with ``until:`` moved back to the oldest tweet fetched,
+    up to ``_MAX_SEARCH_CONTINUATIONS`` times. Returns the tweets and whether
+    the window is still not fully covered.
+    """
+    tweets: list[dict[str, object]] = []
+    for _ in range(_MAX_SEARCH_CONTINUATIONS + 1):
+        rows, truncated = await _search_tweets(http, query)
+        tweets.extend(rows)
+        if not truncated:
+            return tweets, False
+        oldest = _oldest_tweet_time(rows)
+        if oldest is None:
+            break
+        # until: is exclusive at second precision; tweets from that second are fetched twice and deduped later.
+        narrowed = re.sub(r"until:\S+", f"until:{_format_advanced_search_time(oldest + timedelta(seconds=1))}", query)
+        if narrowed == query:
+            break
+        query = narrowed
+    return tweets, True
+
+
+def _tweet_to_latest(tweet: dict[str, object], handle: str) -> dict[str, str] | None:
+    tweet_id_raw = tweet.get("id") or tweet.get("tweetId") or tweet.get("rest_id") or tweet.get("tweet_id")
     tweet_id = str(tweet_id_raw).strip() if tweet_id_raw is not None else ""
 
-    author = first.get("author") if isinstance(first.get("author"), dict) else {}
+    author = tweet.get("author") if isinstance(tweet.get("author"), dict) else {}
     screen_name_raw = (
         author.get("userName")
         or author.get("username")
-        or first.get("userName")
-        or first.get("screenName")
+        or tweet.get("userName")
+        or tweet.get("screenName")
         or handle
     )
     screen_name = str(screen_name_raw).strip() or handle
 
-    display_name_raw = author.get("name") or author.get("displayName") or first.get("name") or screen_name
+    display_name_raw = author.get("name") or author.get("displayName") or tweet.get("name") or screen_name
     display_name = str(display_name_raw).strip() or screen_name
 
-    tweet_url_raw = first.get("url") or first.get("tweetUrl") or first.get("permanentUrl")
+    tweet_url_raw = tweet.get("url") or tweet.get("tweetUrl") or tweet.get("permanentUrl")
     tweet_url = str(tweet_url_raw).strip() if tweet_url_raw is not None else ""
-    tweet_text_raw = first.get("text") or first.get("fullText") or first.get("full_text")
+    tweet_text_raw = tweet.get("text") or tweet.get("fullText") or tweet.get("full_text")
     tweet_text = str(tweet_text_raw).strip() if tweet_text_raw is not None else ""
     tweet_text = _clean_tweet_text(tweet_text)
-    created_at_raw = first.get("createdAt") or first.get("created_at")
+    created_at_raw = tweet.get("createdAt") or tweet.get("created_at")
     created_at = str(created_at_raw).strip() if created_at_raw is not None else ""
-    image_url = _extract_first_image_url(first)
-    video_url = _extract_first_video_url(first)
-    profile_image_url = _extract_profile_image_url(first)
+    image_url = _extract_first_image_url(tweet)
+    video_url = _extract_first_video_url(tweet)
+    profile_image_url = _extract_profile_image_url(tweet)
 
     if not tweet_id and tweet_url:
         match = re.search(r"/status/(\d+)", tweet_url)
@@ -353,9 +563,6 @@ def _resolve_latest_tweet(handle: str, since_utc: datetime, until_utc: datetime)
     if not tweet_url:
         tweet_url = f"https://x.com/{screen_name}/status/{tweet_id}"
 
-    _debug_twitter(
-        f"twitterapi resolve ok handle={handle} tweet_id={tweet_id} screen_name={screen_name} display_name={display_name}"
-    )
     return {
         "tweet_id": tweet_id,
         "tweet_url": tweet_url,
@@ -369,6 +576,97 @@ def _resolve_latest_tweet(handle: str, since_utc: datetime, until_utc: datetime)
     }
 
 
+def _tweet_sort_key(tweet: dict[str, str]) -> int:
+    tweet_id = tweet.get("tweet_id", "")
+    return int(tweet_id) if tweet_id.isdigit() else 0
+
+
+def _plan_searches(
+    handles: list[str],
+    since_utc: datetime,
+    until_utc: datetime,
+    since_ids: dict[str, str] | None = None,
+) -> list[tuple[str, dict[str, str]]]:
+    """Return ``(query, {normalized handle: handle})`` pairs covering ``handles`` for one window.
+
+    Handles are searched together in combined queries, so one request covers
+    up to a few dozen accounts.
+    """
+    since_ids = since_ids or {}
+    monitored = {_normalize_handle(handle): handle for handle in handles}
+    normalized_ids = {normalized: since_ids.get(handle, "") for normalized, handle in monitored.items()}
+    return [
+        (query, {member: monitored[member] for member in group})
+        for query, group in _build_search_queries(list(monitored), since_utc, until_utc, normalized_ids)
+    ]
+
+
+def _plan_windows(
+    handles: list[str],
+    cursors: dict[str, dict],
+    until_utc: datetime,
+    earliest: datetime,
+) -> tuple[dict[datetime, list[str]], dict[str, datetime]]:
+    """Group ``handles`` by the start of the window to search up to ``until_utc``.
+
+    Handles with a cursor share one window from the earliest of their own
+    (minus ``_WINDOW_OVERLAP``), so the whole batch packs into combined
+    queries; handles never searched before start at ``earliest``, the
+    backfill limit. Cursors older than that are clamped to it too; those
+    handles are returned with where they would have resumed.
+    """
+    windows: dict[datetime, list[str]] = {}
+    resumed: list[tuple[datetime, str]] = []
+    clamped: dict[str, datetime] = {}
+    for handle in handles:
+        last_checked_at = int(cursors.get(handle, {}).get("last_checked_at") or 0)
+        if not last_checked_at:
+            windows.setdefault(earliest, []).append(handle)
+            continue
+        resume_at = datetime.fromtimestamp(last_checked_at, timezone.utc) - _WINDOW_OVERLAP
+        if resume_at < earliest:
+            clamped[handle] = resume_at
+        resumed.append((max(resume_at, earliest), handle))
+    if resumed:
+        window_start = min(start for start, _ in resumed)
+        if window_start >= until_utc:
+            window_start = until_utc - timedelta(seconds=5)
+        windows.setdefault(window_start, []).extend(handle for _, handle in resumed)
+    return windows, clamped
+
+
+def _route_tweets(
+    rows: list[dict[str, object]],
+    monitored: dict[str, str],
+    since_ids: dict[str, str] | None = None,
+) -> dict[str, list[dict[str, str]]]:
+    """Return every original tweet in ``rows`` per monitored handle, oldest first, routed by author.
+
+    Tweets not newer than the handle's entry in ``since_ids`` are dropped.
+    """
+    since_ids = since_ids or {}
+    found: dict[str, dict[str, dict[str, str]]] = {}
+    for row in rows:
+        candidate = row.get("tweet") if isinstance(row.get("tweet"), dict) else row
+        if not isinstance(candidate, dict) or _is_retweet(candidate):
+            continue
+        handle = monitored.get(_tweet_author_handle(candidate))
+        if handle is None:
+            continue
+        resolved = _tweet_to_latest(candidate, handle)
+        if resolved is None:
+            continue
+        since_id = since_ids.get(handle, "")
+        if since_id.isdigit() and _tweet_sort_key(resolved) <= int(since_id):
+            continue
+        found.setdefault(handle, {})[resolved["tweet_id"]] = resolved
+
+    tweets = {handle: sorted(by_id.values(), key=_tweet_sort_key) for handle, by_id in found.items()}
+    for handle, rows_for_handle in tweets.items():
+        _debug_twitter(f"twitterapi resolve ok handle={handle} tweets={[row['tweet_id'] for row in rows_for_handle]}")
+    return tweets
+
+
 def _build_twitter_embed_message(
     *,
     template: str | None,
@@ -412,100 +710,215 @@ def _build_twitter_embed_message(
     return text, embed
 
 
+def _build_twitter_digest_embed(tweets: list[tuple[str, dict[str, str]]]) -> discord.Embed:
+    """Collapse ``(handle, tweet)`` pairs past the per-guild cap into one embed of links."""
+    lines: list[str] = []
+    length = 0
+    for index, (_, tweet) in enumerate(tweets):
+        snippet = re.sub(r"\s+", " ", tweet.get("text", "")).strip()
+        if len(snippet) > 80:
+            snippet = snippet[:77] + "..."
+        line = f"**{tweet['display_name']}** (@{tweet['screen_name']}): [{snippet or 'post'}]({tweet['tweet_url']})"
+        if length + len(line) + 1 > 3900:
+            lines.append(f"...and {len(tweets) - index} more")
+            break
+        lines.append(line)
+        length += len(line) + 1
+
+    embed = discord.Embed(
+        title=f"{len(tweets)} more new posts",
+        description="\n".join(lines),
+        color=discord.Color.from_rgb(240, 171, 252),
+    )
+    embed.set_footer(
+        text="X - Made by dinnn._o",
+        icon_url="https://upload.wikimedia.org/wikipedia/commons/thumb/c/ce/X_logo_2023.svg/1200px-X_logo_2023.svg.png",
+    )
+    parsed_time = _parse_twitter_time(tweets[-1][1].get("created_at", ""))
+    embed.timestamp = parsed_time or datetime.now(tz=timezone(timedelta(hours=8)))
+    return embed
+
+
 class Twitter(Cog_Extension):
     def __init__(self, bot: commands.Bot):
         super().__init__(bot)
-        self._last_checked_utc: dict[str, datetime] = {}
+        self._cursors: dict[str, dict] = load_twitter_cursors()
+        self._seen_pruned_at = 0.0
+        self._followers: dict[str, list[dict]] = {}
 
     @commands.Cog.listener()
     async def on_ready(self):
-        if not self.check_twitter_posts.is_running():
-            self.check_twitter_posts.start()
+        self.bot.scheduler.register(
+            "twitter",
+            self._poll_handles,
+            self._twitter_sources,
+            jitter=_POLL_JITTER,
+            coalesce=_POLL_COALESCE_SECONDS,
+            first_due=self._first_due,
+        )
+
+    async def cog_unload(self) -> None:
+        self.bot.scheduler.unregister("twitter")
 
     @commands.Cog.listener()
     async def on_guild_join(self, guild: discord.Guild):
         ensure_twitter_data(guild.id)
 
-    @tasks.loop(seconds=600)
-    async def check_twitter_posts(self):
-        for guild in self.bot.guilds:
-            guild_data = get_twitter_data(guild.id)
-            channel_id = guild_data.get("twitter_notification_channel")
+    async def _twitter_sources(self) -> dict[str, float]:
+        subscriptions = self.bot.subscriptions
+        subscriptions.sync()
+        # handle -> subscribing guilds the bot is still in; every handle is queried once per interval.
+        followers: dict[str, list[dict]] = {}
+        for handle in subscriptions.sources("twitter"):
+            joined = [
+                follower
+                for follower in subscriptions.followers("twitter", handle)
+                if self.bot.get_guild(follower["guild_id"]) is not None
+            ]
+            if joined:
+                followers[handle] = joined
+        self._followers = followers
+        interval = self.bot.settings.twitter_poll_seconds
+        return {handle: interval for handle in followers}
+
+    def _first_due(self, handle: str) -> float:
+        last_checked_at = int(self._cursors.get(handle, {}).get("last_checked_at") or 0)
+        return last_checked_at + self.bot.settings.twitter_poll_seconds if last_checked_at else 0.0
+
+    async def _poll_handles(self, handles: list[str]) -> dict[str, bool]:
+        """Search a due batch of handles for new tweets and announce them."""
+        blocked = self.bot.governor.deferral("twitter", len(handles))
+        if blocked:
+            self.bot.scheduler.pause("twitter", blocked)
+            return {}
+        followers = self._followers
+        until_utc = datetime.now(timezone.utc)
+        self._prune_seen(until_utc.timestamp())
+        backfill_minutes = self.bot.settings.twitter_max_backfill_minutes
+        earliest = until_utc - timedelta(minutes=backfill_minutes)
+        windows, clamped = _plan_windows(handles, self._cursors, until_utc, earliest)
+        if clamped:
+            behind = (until_utc - min(clamped.values())).total_seconds() / 60
+            logger.warning(
+                "Twitter cursors for %d handles are up to %.0f minutes old; tweets older than"
+                " TWITTER_MAX_BACKFILL_MINUTES=%d are skipped for: %s",
+                len(clamped),
+                behind,
+                backfill_minutes,
+                ", ".join(sorted(clamped)[:20]),
+            )
+
+        # (query, {normalized handle: handle}, since ids) per combined search, run concurrently.
+        searches: list[tuple[str, dict[str, str], dict[str, str]]] = []
+        for window_start, window_handles in windows.items():
+            since_ids = {handle: self._cursors.get(handle, {}).get("last_tweet_id", "") for handle in window_handles}
+            searches.extend(
+                (query, monitored, since_ids)
+                for query, monitored in _plan_searches(window_handles, window_start, until_utc, since_ids)
+            )
+
+        results: dict[str, bool] = {}
+        resolved: dict[str, list[dict[str, str]]] = {}
+        touched_cursors: dict[str, dict] = {}
+        async for (query, monitored, since_ids), fetched, error in poll_concurrently(
+            searches,
+            lambda search: _search_window(self.http_client, search[0]),
+            concurrency=self.bot.settings.twitter_concurrency,
+            deadline=_CYCLE_DEADLINE_SECONDS,
+        ):
+            if isinstance(error, RateLimited):
+                continue
+            searched = list(monitored.values())
+            results.update(dict.fromkeys(searched, error is None))
+            if error is not None:
+                _debug_twitter(f"fetch failed handles={searched} error={error}")
+                if _DEBUG_TWITTER:
+                    trace = "".join(traceback.format_exception(type(error), error, error.__traceback__))
+                    _debug_twitter(f"fetch traceback handles={searched}\n{trace}")
+                continue
+            rows, truncated = fetched
+            found = _route_tweets(rows, monitored, since_ids)
+            resolved.update(found)
+            if truncated:
+                # Older tweets in the window are still unfetched; keep the cursors so the next
+                # search covers them again. Tweets announced now are skipped then as seen.
+                _debug_twitter(f"search truncated handles={searched}; cursors kept")
+                continue
+            for handle in searched:
+                cursor = self._cursors.setdefault(handle, {"last_tweet_id": "", "last_checked_at": 0})
+                cursor["last_checked_at"] = int(until_utc.timestamp())
+                if found.get(handle):
+                    cursor["last_tweet_id"] = found[handle][-1]["tweet_id"]
+                touched_cursors[handle] = cursor
+        if touched_cursors:
+            save_twitter_cursors(touched_cursors)
+
+        # The search window overlaps the previous one, so drop tweets that were already announced.
+        unseen = filter_unseen("twitter", {handle: [tweet["tweet_id"] for tweet in tweets] for handle, tweets in resolved.items()})
+        mark_seen("twitter", [(handle, tweet_id) for handle, tweet_ids in unseen.items() for tweet_id in tweet_ids])
+
+        # guild id -> new (follower, handle, tweet) triples, announced oldest first.
+        pending: dict[int, list[tuple[dict, str, dict[str, str]]]] = {}
+        for handle, tweet_ids in unseen.items():
+            fresh = set(tweet_ids)
+            tweets = [tweet for tweet in resolved[handle] if tweet["tweet_id"] in fresh]
+            record_twitter_post(handle, tweets[-1]["tweet_id"], tweets[-1]["display_name"])
+            for follower in followers.get(handle, []):
+                pending.setdefault(follower["guild_id"], []).extend((follower, handle, tweet) for tweet in tweets)
+
+        cap = self.bot.settings.twitter_max_posts_per_guild
+        for guild_id, items in pending.items():
+            channel_id = items[0][0]["channel"]
             channel = self.bot.get_channel(int(channel_id)) if channel_id else None
-            accounts = guild_data.get("twitter_accounts", {})
-            if not isinstance(accounts, dict):
-                accounts = {}
-                guild_data["twitter_accounts"] = accounts
-
-            for handle in list(accounts.keys()):
-                item = accounts.get(handle)
-                if not isinstance(item, dict):
-                    continue
-                until_utc = datetime.now(timezone.utc)
-                since_utc = self._last_checked_utc.get(handle, until_utc - timedelta(hours=1))
-                if since_utc >= until_utc:
-                    since_utc = until_utc - timedelta(seconds=5)
+            if channel is None:
+                _debug_twitter(f"guild={guild_id} has {len(items)} new tweets but no notify channel")
+                continue
+            items.sort(key=lambda item: _tweet_sort_key(item[2]))
+            for follower, handle, tweet in items[:cap]:
+                await self._send_tweet(follower, channel, handle, tweet)
+            if len(items) > cap:
                 try:
-                    latest = _resolve_latest_tweet(handle, since_utc, until_utc)
-                    self._last_checked_utc[handle] = until_utc
+                    await channel.send(embed=_build_twitter_digest_embed([(handle, tweet) for _, handle, tweet in items[cap:]]))
+                    _debug_twitter(f"sent digest guild={guild_id} tweets={len(items) - cap}")
                 except Exception as exc:
-                    _debug_twitter(f"fetch failed guild={guild.id} handle={handle} error={exc}")
-                    if _DEBUG_TWITTER:
-                        _debug_twitter(f"fetch traceback guild={guild.id} handle={handle}\n{traceback.format_exc()}")
-                    continue
-
-                if not latest:
-                    continue
-
-                tweet_id = latest["tweet_id"]
-                tweet_url = latest["tweet_url"]
-                display_name = latest["display_name"]
-                screen_name = latest["screen_name"]
-                tweet_text = re.sub(r'https://t\.co/\S+', '', latest["text"])
-                created_at = latest["created_at"]
-                image_url = latest["image_url"]
-                video_url = latest["video_url"]
-                profile_image_url = latest["profile_image_url"]
-                history = item.setdefault("tweetHistory", [])
-                if not isinstance(history, list):
-                    history = []
-                    item["tweetHistory"] = history
-
-                is_new = _append_unique_id(history, tweet_id)
-                if not is_new:
-                    continue
-
-                item["tweetId"] = tweet_id
-                item["name"] = display_name or handle
+                    _debug_twitter(f"send digest failed guild={guild_id} error={exc}")
+        return results
 
-                if channel is None:
-                    _debug_twitter(f"guild={guild.id} handle={handle} new={tweet_id} but no notify channel")
-                    continue
-
-                text, embed = _build_twitter_embed_message(
-                    template=guild_data.get("twitter_notification_text"),
-                    xuser=item["name"],
-                    tweet_url=tweet_url,
-                    display_name=display_name,
-                    screen_name=screen_name,
-                    tweet_text=tweet_text,
-                    created_at=created_at,
-                    image_url=image_url,
-                    video_url=video_url,
-                    profile_image_url=profile_image_url,
-                )
-                if not _parse_twitter_time(created_at) and created_at:
-                    _debug_twitter(f"parse created_at failed handle={handle} value={created_at!r}")
-                try:
-                    message_parts = [text]
-                    #if video_url:
-                    #    message_parts.append(video_url)
-                    await channel.send("\n".join(message_parts), embed=embed)
-                    _debug_twitter(f"sent guild={guild.id} handle={handle} tweet={tweet_id}")
-                except Exception as exc:
-                    _debug_twitter(f"send failed guild={guild.id} handle={handle} error={exc}")
+    def _prune_seen(self, now: float) -> None:
+        if now - self._seen_pruned_at < _SEEN_PRUNE_INTERVAL_SECONDS:
+            return
+        self._seen_pruned_at = now
+        settings = self.bot.settings
+        removed = prune_seen_items("twitter", settings.seen_items_max_age_days * 86400, settings.seen_items_max_per_source)
+        _debug_twitter(f"pruned {removed} seen tweet ids")
+
+    async def _send_tweet(self, follower: dict, channel, handle: str, latest: dict[str, str]) -> None:
+        tweet_id = latest["tweet_id"]
+        created_at = latest["created_at"]
+        guild_id = follower["guild_id"]
+        text, embed = _build_twitter_embed_message(
+            template=follower["text"],
+            xuser=latest["display_name"] or handle,
+            tweet_url=latest["tweet_url"],
+            display_name=latest["display_name"],
+            screen_name=latest["screen_name"],
+            tweet_text=re.sub(r'https://t\.co/\S+', '', latest["text"]),
+            created_at=created_at,
+            image_url=latest["image_url"],
+            video_url=latest["video_url"],
+            profile_image_url=latest["profile_image_url"],
+        )
+        if not _parse_twitter_time(created_at) and created_at:
+            _debug_twitter(f"parse created_at failed handle={handle} value={created_at!r}")
+        try:
+            message_parts = [text]
+            #if video_url:
+            #    message_parts.append(video_url)
+            await channel.send("\n".join(message_parts), embed=embed)
+            _debug_twitter(f"sent guild={guild_id} handle={handle} tweet={tweet_id}")
+        except Exception as exc:
+            _debug_twitter(f"send failed guild={guild_id} handle={handle} error={exc}")
 
-            save_twitter_data(guild.id, guild_data)
     @has_permissions(manage_guild=True)
     @commands.hybrid_command(with_app_command=True)
     async def xusers(self, ctx: commands.Context, arg: str, account: typing.Optional[str] = None):
@@ -534,7 +947,6 @@ class Twitter(Cog_Extension):
                         "id": handle,
                         "name": handle,
                         "tweetId": "",
-                        "tweetHistory": [],
                     }
                 save_twitter_data(ctx.guild.id, c_data)
                 await ctx.send(f"added x account: **{handle}**")
@@ -1,18 +1,59 @@
+import asyncio
+import heapq
 import logging
 import os
 import re
+import time
 import typing
+from collections import OrderedDict
+from datetime import datetime
 
-import requests
 from bot.core.classed import Cog_Extension
-from bot.services.channel_data import get_youtube_data, save_youtube_data
-from discord.ext import commands, tasks
+from bot.services.channel_data import record_youtube_video
+from bot.services.http_client import HttpResponse
+from bot.services.polling import poll_concurrently
+from bot.services.rate_limit import RateLimited
+from bot.services.seen_items import filter_unseen, mark_seen, prune_seen_items
+from bot.services.youtube_feed import FEED_PROVIDER, fetch_feed
+from bot.services.youtube_quota import YouTubeQuota, seconds_until_reset
+from bot.services.youtube_state import (
+    delete_youtube_upcoming_stream,
+    derive_uploads_playlist_id,
+    load_youtube_channel_polls,
+    load_youtube_upcoming_streams,
+    load_youtube_uploads_playlists,
+    save_youtube_channel_polls,
+    save_youtube_upcoming_stream,
+    save_youtube_uploads_playlists,
+)
+from discord.ext import commands
 from discord.ext.commands import has_permissions
 
 logger = logging.getLogger("__main__")
 _DEBUG_YOUTUBE = os.getenv("DEBUG_YOUTUBE", "0") == "1"
 
 _YOUTUBE_API_BASE = "https://www.googleapis.com/youtube/v3"
+# channels.list and videos.list accept at most 50 comma-separated ids per call.
+_YOUTUBE_BATCH_SIZE = 50
+# Conditional-request cache: ETag + parsed payload per (endpoint, params), least recently used evicted.
+_ETAG_CACHE_SIZE = 512
+# Upcoming streams are checked this long before their scheduled start, once just after it,
+# then every retry interval until they go live or are given up on.
+_UPCOMING_LEAD_SECONDS = 120
+_UPCOMING_AFTER_START_SECONDS = 60
+_UPCOMING_RETRY_SECONDS = 300
+_UPCOMING_GIVE_UP_SECONDS = 3 * 3600
+# Upcoming streams that never started are remembered in seen_items under this provider.
+_ABANDONED_PROVIDER = "youtube_abandoned"
+# Announced video ids are pruned from seen_items at most this often.
+_SEEN_PRUNE_INTERVAL_SECONDS = 24 * 3600
+# Channel polls still running this long into a batch are dropped; those channels are retried shortly.
+_CYCLE_DEADLINE_SECONDS = 240
+# Channels coming due within this many seconds of each other are polled in one batch,
+# so their new ids share videos.list calls.
+_POLL_COALESCE_SECONDS = 60
+# "rateLimitExceeded" is a short-term limit, unlike the daily quota; hold requests back this long.
+_RATE_LIMIT_PENALTY_SECONDS = 60
 _DURATION_RE = re.compile(r"PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?")
 
 
@@ -21,13 +62,26 @@ def _debug_youtube(message: str) -> None:
         logger.info("[youtube] %s", message)
 
 
-def _append_unique_id(bucket: list[str], value: str) -> bool:
-    if not isinstance(value, str) or not value:
-        return False
-    if value in bucket:
-        return False
-    bucket.append(value)
-    return True
+def _chunks(items: list[str], size: int) -> typing.Iterator[list[str]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _parse_iso_timestamp(raw: typing.Any) -> int:
+    if not isinstance(raw, str) or not raw:
+        return 0
+    try:
+        return int(datetime.fromisoformat(raw.replace("Z", "+00:00")).timestamp())
+    except ValueError:
+        return 0
+
+
+def _next_upcoming_check(scheduled_start: int, now: float) -> float:
+    if now < scheduled_start - _UPCOMING_LEAD_SECONDS:
+        return scheduled_start - _UPCOMING_LEAD_SECONDS
+    if now < scheduled_start + _UPCOMING_AFTER_START_SECONDS:
+        return scheduled_start + _UPCOMING_AFTER_START_SECONDS
+    return now + _UPCOMING_RETRY_SECONDS
 
 
 def _parse_duration_seconds(raw: str) -> int:
@@ -42,15 +96,54 @@ def _parse_duration_seconds(raw: str) -> int:
     return hours * 3600 + minutes * 60 + seconds
 
 
+def _quota_error_reason(response: HttpResponse) -> str | None:
+    try:
+        errors = response.json()["error"]["errors"]
+    except Exception:
+        return None
+    for error in errors:
+        reason = error.get("reason") if isinstance(error, dict) else None
+        if reason in {"quotaExceeded", "dailyLimitExceeded", "rateLimitExceeded"}:
+            return reason
+    return None
+
+
 class Youtube(Cog_Extension):
     def __init__(self, bot: commands.Bot):
         super().__init__(bot)
-        self._uploads_playlist_cache: dict[str, str] = {}
+        self._uploads_playlist_cache: dict[str, str] = load_youtube_uploads_playlists()
+        self._quota = YouTubeQuota(bot.settings.youtube_daily_quota)
+        self._polls: dict[str, dict] = load_youtube_channel_polls()
+        self._intervals: dict[str, int] = {}
+        self._followers: dict[str, list[dict]] = {}
+        self._feed_validators: dict[str, dict[str, str]] = {}
+        self._etag_cache: OrderedDict[tuple, tuple[str, dict]] = OrderedDict()
+        self._etag_stats: dict[str, dict[str, int]] = {}
+        self._upcoming: dict[str, dict] = load_youtube_upcoming_streams()
+        self._upcoming_heap: list[tuple[float, str]] = []
+        self._upcoming_wakeup = asyncio.Event()
+        self._upcoming_task: asyncio.Task | None = None
+        self._seen_pruned_at = 0.0
+        now = time.time()
+        for video_id, upcoming in self._upcoming.items():
+            self._schedule_upcoming(video_id, _next_upcoming_check(upcoming["scheduled_start"], now))
 
     @commands.Cog.listener()
     async def on_ready(self):
-        if not self.check_video_youtube.is_running():
-            self.check_video_youtube.start()
+        self.bot.scheduler.register(
+            "youtube",
+            self._poll_channels,
+            self._youtube_sources,
+            coalesce=_POLL_COALESCE_SECONDS,
+            first_due=self._first_due,
+        )
+        if self._upcoming_task is None:
+            self._upcoming_task = asyncio.create_task(self._run_upcoming_timers())
+
+    async def cog_unload(self) -> None:
+        self.bot.scheduler.unregister("youtube")
+        if self._upcoming_task is not None:
+            self._upcoming_task.cancel()
 
     def _resolve_notification_channel(self, channel_id):
         if channel_id is None:
@@ -60,52 +153,100 @@ class Youtube(Cog_Extension):
         except Exception:
             return None
 
-    def _youtube_get(self, endpoint: str, params: dict[str, str], api_key: str) -> dict:
-        response = requests.get(
+    async def _youtube_get(self, endpoint: str, params: dict[str, str], api_key: str) -> dict:
+        """GET a Data API endpoint, revalidating earlier responses with If-None-Match.
+
+        A 304 returns the payload parsed last time without reading a body.
+        """
+        cache_key = (endpoint, tuple(sorted(params.items())))
+        cached = self._etag_cache.get(cache_key)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        stats = self._etag_stats.setdefault(endpoint, {"hits": 0, "misses": 0})
+
+        self._quota.charge(endpoint)
+        response = await self.http_client.get(
             f"{_YOUTUBE_API_BASE}/{endpoint}",
+            provider="youtube",
             params={**params, "key": api_key},
-            timeout=15,
+            headers=headers,
         )
+        if response.status == 304 and cached:
+            stats["hits"] += 1
+            self._etag_cache.move_to_end(cache_key)
+            return cached[1]
+
+        stats["misses"] += 1
+        reason = _quota_error_reason(response) if response.status == 403 else None
+        if reason == "rateLimitExceeded":
+            self.bot.governor.penalize("youtube", _RATE_LIMIT_PENALTY_SECONDS)
+        elif reason:
+            # The daily budget is tracked by the quota ledger; the governor only records the rejection.
+            self.bot.governor.penalize("youtube", 0)
+            self._quota.mark_exhausted()
+            logger.warning("YouTube API quota exhausted; polling paused until the daily reset")
         response.raise_for_status()
         data = response.json()
         if not isinstance(data, dict):
             return {}
-        return data
-
-    def _get_uploads_playlist_id(self, channel_id: str, api_key: str) -> str | None:
-        cached = self._uploads_playlist_cache.get(channel_id)
-        if cached:
-            return cached
-
-        data = self._youtube_get(
-            "channels",
-            {
-                "part": "contentDetails",
-                "id": channel_id,
-                "maxResults": "1",
-            },
-            api_key,
-        )
-        items = data.get("items")
-        if not isinstance(items, list) or not items:
-            return None
 
-        item = items[0] if isinstance(items[0], dict) else {}
-        uploads = (
-            item.get("contentDetails", {})
-            .get("relatedPlaylists", {})
-            .get("uploads")
-            if isinstance(item.get("contentDetails"), dict)
-            else None
-        )
-        if not isinstance(uploads, str) or not uploads:
-            return None
-
-        self._uploads_playlist_cache[channel_id] = uploads
-        return uploads
+        etag = data.get("etag") or response.headers.get("ETag")
+        if isinstance(etag, str) and etag:
+            self._etag_cache[cache_key] = (etag, data)
+            self._etag_cache.move_to_end(cache_key)
+            while len(self._etag_cache) > _ETAG_CACHE_SIZE:
+                self._etag_cache.popitem(last=False)
+        return data
 
-    def _get_latest_upload_video_id(self, uploads_playlist_id: str, api_key: str) -> str | None:
-        data = self._youtube_get(
+    async def _get_uploads_playlist_ids(self, channel_ids: list[str], api_key: str) -> dict[str, str]:
+        """Resolve uploads playlists for ``channel_ids``.
+
+        ``UC...`` ids are derived locally; anything else is looked up in batched
+        channels.list calls and persisted, so restarts do not spend quota on it.
+        """
+        missing: list[str] = []
+        for channel_id in channel_ids:
+            if channel_id in self._uploads_playlist_cache:
+                continue
+            derived = derive_uploads_playlist_id(channel_id)
+            if derived:
+                self._uploads_playlist_cache[channel_id] = derived
+            else:
+                missing.append(channel_id)
+
+        resolved: dict[str, str] = {}
+        for batch in _chunks(missing, _YOUTUBE_BATCH_SIZE):
+            data = await self._youtube_get(
+                "channels",
+                {
+                    "part": "contentDetails",
+                    "id": ",".join(batch),
+                    "maxResults": str(len(batch)),
+                },
+                api_key,
+            )
+            items = data.get("items")
+            if not isinstance(items, list):
+                continue
+            for item in items:
+                if not isinstance(item, dict) or not isinstance(item.get("id"), str):
+                    continue
+                content = item.get("contentDetails") if isinstance(item.get("contentDetails"), dict) else {}
+                related = content.get("relatedPlaylists") if isinstance(content.get("relatedPlaylists"), dict) else {}
+                uploads = related.get("uploads")
+                if isinstance(uploads, str) and uploads:
+                    resolved[item["id"]] = uploads
+        if resolved:
+            self._uploads_playlist_cache.update(resolved)
+            save_youtube_uploads_playlists(resolved)
+
+        return {
+            channel_id: self._uploads_playlist_cache[channel_id]
+            for channel_id in channel_ids
+            if channel_id in self._uploads_playlist_cache
+        }
+
+    async def _get_latest_upload_video_id(self, uploads_playlist_id: str, api_key: str) -> str | None:
+        data = await self._youtube_get(
             "playlistItems",
             {
                 "part": "snippet",
@@ -126,108 +267,392 @@ class Youtube(Cog_Extension):
             return None
         return video_id
 
-    def _get_video_meta(self, video_id: str, api_key: str) -> tuple[str, str]:
-        data = self._youtube_get(
-            "videos",
-            {
-                "part": "snippet,contentDetails,liveStreamingDetails",
-                "id": video_id,
-                "maxResults": "1",
-            },
-            api_key,
+    async def _get_latest_feed_video_id(self, channel_id: str, poll: dict) -> str | None:
+        """Read the newest upload from the channel's Atom feed; a 304 reuses the last seen id."""
+        validators = self._feed_validators.get(channel_id)
+        result = await fetch_feed(
+            self.http_client, channel_id, validators, base_url=self.bot.settings.youtube_feed_url, limit=1
         )
-        items = data.get("items")
-        if not isinstance(items, list) or not items:
-            return "video", ""
-
-        item = items[0] if isinstance(items[0], dict) else {}
+        if result.etag or result.last_modified:
+            self._feed_validators[channel_id] = {"etag": result.etag, "last_modified": result.last_modified}
+        if result.not_modified:
+            return poll.get("last_video_id") or None
+        return result.entries[0]["video_id"] if result.entries else None
+
+    async def _get_video_metas(self, video_ids: list[str], api_key: str) -> dict[str, tuple[str, str, int]]:
+        """Classify ``video_ids`` as video/short/stream/upcoming in batched videos.list calls.
+
+        Returns ``{video_id: (kind, channel_title, scheduled_start)}``; ids the API
+        does not return are left out.
+        """
+        metas: dict[str, tuple[str, str, int]] = {}
+        for batch in _chunks(video_ids, _YOUTUBE_BATCH_SIZE):
+            data = await self._youtube_get(
+                "videos",
+                {
+                    "part": "snippet,contentDetails,liveStreamingDetails",
+                    "id": ",".join(batch),
+                    "maxResults": str(len(batch)),
+                },
+                api_key,
+            )
+            items = data.get("items")
+            if not isinstance(items, list):
+                continue
+            for item in items:
+                if isinstance(item, dict) and isinstance(item.get("id"), str):
+                    metas[item["id"]] = self._classify_video(item)
+        return metas
+
+    @staticmethod
+    def _classify_video(item: dict) -> tuple[str, str, int]:
         snippet = item.get("snippet") if isinstance(item.get("snippet"), dict) else {}
         content = item.get("contentDetails") if isinstance(item.get("contentDetails"), dict) else {}
+        live = item.get("liveStreamingDetails")
 
         channel_name = snippet.get("channelTitle") if isinstance(snippet.get("channelTitle"), str) else ""
         duration_sec = _parse_duration_seconds(content.get("duration") if isinstance(content.get("duration"), str) else "")
 
-        if isinstance(item.get("liveStreamingDetails"), dict):
-            return "stream", channel_name
+        if isinstance(live, dict):
+            scheduled_start = _parse_iso_timestamp(live.get("scheduledStartTime"))
+            if snippet.get("liveBroadcastContent") == "upcoming" and not live.get("actualStartTime"):
+                return "upcoming", channel_name, scheduled_start
+            return "stream", channel_name, scheduled_start
         if 0 < duration_sec <= 60:
-            return "short", channel_name
-        return "video", channel_name
-
-    def _record_video_id(self, target: dict, video_kind: str, video_id: str) -> bool:
-        history_key = "videoHistory"
-        current_id_key = "videoId"
-        if video_kind == "short":
-            history_key = "shortHistory"
-            current_id_key = "shortId"
-        elif video_kind == "stream":
-            history_key = "streamHistory"
-            current_id_key = "streamId"
-
-        history = target.setdefault(history_key, [])
-        if not isinstance(history, list):
-            history = []
-            target[history_key] = history
-
-        is_new = _append_unique_id(history, video_id)
-        if is_new:
-            target[current_id_key] = video_id
-        return is_new
-
-    @tasks.loop(seconds=300)
-    async def check_video_youtube(self):
+            return "short", channel_name, 0
+        return "video", channel_name, 0
+
+    def _prune_seen(self, now: float) -> None:
+        if now - self._seen_pruned_at < _SEEN_PRUNE_INTERVAL_SECONDS:
+            return
+        self._seen_pruned_at = now
+        settings = self.bot.settings
+        removed = sum(
+            prune_seen_items(provider, settings.seen_items_max_age_days * 86400, settings.seen_items_max_per_source)
+            for provider in ("youtube", _ABANDONED_PROVIDER)
+        )
+        _debug_youtube(f"pruned {removed} seen video ids")
+
+    @staticmethod
+    def _observe_upload(poll: dict, video_id: str, now: int) -> None:
+        """Track the gap between uploads as a moving average to size the poll interval."""
+        previous_id = poll.get("last_video_id") or ""
+        if video_id == previous_id:
+            return
+        poll["last_video_id"] = video_id
+        if not previous_id:
+            return
+        last_upload_at = int(poll.get("last_upload_at") or 0)
+        if last_upload_at:
+            gap = max(0, now - last_upload_at)
+            average = int(poll.get("avg_upload_gap") or 0)
+            poll["avg_upload_gap"] = gap if not average else (average * 3 + gap) // 4
+        poll["last_upload_at"] = now
+
+    async def _youtube_sources(self) -> dict[str, float]:
+        """List followed channels with their planned poll intervals."""
+        if not self.bot.settings.youtube_api_key:
+            _debug_youtube("not polling: missing YOUTUBE_API_KEY")
+            return {}
+
+        subscriptions = self.bot.subscriptions
+        subscriptions.sync()
+        # channel id -> subscribing guilds the bot is still in, so shared channels are fetched once.
+        followers: dict[str, list[dict]] = {}
+        for channel_id in subscriptions.sources("youtube"):
+            joined = [
+                follower
+                for follower in subscriptions.followers("youtube", channel_id)
+                if self.bot.get_guild(follower["guild_id"]) is not None
+            ]
+            if joined:
+                followers[channel_id] = joined
+        self._followers = followers
+
+        settings = self.bot.settings
+        if settings.youtube_detection == "feed":
+            # Feed polls cost no quota, so every channel stays on the fastest cadence.
+            self._intervals = {channel_id: settings.youtube_min_poll_seconds for channel_id in followers}
+        else:
+            self._intervals = self._quota.plan_intervals(
+                {
+                    channel_id: (len(guilds), int(self._polls.get(channel_id, {}).get("avg_upload_gap") or 0))
+                    for channel_id, guilds in followers.items()
+                },
+                settings.youtube_min_poll_seconds,
+                settings.youtube_max_poll_seconds,
+                self._quota.cost("playlistItems"),
+            )
+        return {channel_id: self._intervals.get(channel_id, settings.youtube_min_poll_seconds) for channel_id in followers}
+
+    def _first_due(self, channel_id: str) -> float:
+        return float(self._polls.get(channel_id, {}).get("next_check_at") or 0)
+
+    async def _poll_channels(self, channel_ids: list[str]) -> dict[str, bool]:
+        """Look for new uploads on a due batch of channels and announce them."""
         api_key = self.bot.settings.youtube_api_key
         if not api_key:
-            _debug_youtube("skip check: missing YOUTUBE_API_KEY")
-            return
+            return {}
+        settings = self.bot.settings
+        use_feed = settings.youtube_detection == "feed"
+        blocked = self.bot.governor.deferral(FEED_PROVIDER if use_feed else "youtube", len(channel_ids))
+        if blocked:
+            self.bot.scheduler.pause("youtube", blocked)
+            return {}
 
-        for guild in self.bot.guilds:
-            guild_data = get_youtube_data(guild.id)
-            channel = self._resolve_notification_channel(guild_data.get("youtube_notification_channel"))
-            if channel is None:
-                _debug_youtube(
-                    f"guild={guild.id} has no valid notification channel ({guild_data.get('youtube_notification_channel')})"
-                )
+        now = int(time.time())
+        self._prune_seen(now)
+        followers = self._followers
+        # Most-followed channels first so a tight budget is spent where it reaches the most guilds.
+        due = sorted(channel_ids, key=lambda channel_id: -len(followers.get(channel_id, ())))
+
+        uploads_playlists: dict[str, str] = {}
+        if not use_feed:
+            try:
+                uploads_playlists = await self._get_uploads_playlist_ids(due, api_key)
+            except RateLimited:
+                self._quota.flush()
+                return {}
+            except Exception as exc:
+                _debug_youtube(f"uploads playlist lookup failed error={exc}")
+                self._quota.flush()
+                return dict.fromkeys(due, False)
+
+            affordable = self._quota.remaining // max(1, self._quota.cost("playlistItems"))
+            if affordable < len(due):
+                _debug_youtube(f"quota exhausted spent={self._quota.spent}; {len(due) - affordable} channels deferred")
+                due = due[:affordable]
+            if not due:
+                self.bot.scheduler.pause("youtube", seconds_until_reset())
+                return {}
+
+        async def fetch_latest(channel_id: str) -> str | None:
+            if use_feed:
+                return await self._get_latest_feed_video_id(channel_id, self._polls.get(channel_id, {}))
+            uploads_playlist_id = uploads_playlists.get(channel_id)
+            if not uploads_playlist_id:
+                raise LookupError("uploads playlist not found")
+            return await self._get_latest_upload_video_id(uploads_playlist_id, api_key)
+
+        results: dict[str, bool] = {}
+        latest_videos: dict[str, str] = {}
+        touched_polls: dict[str, dict] = {}
+        async for channel_id, latest_video_id, error in poll_concurrently(
+            due,
+            fetch_latest,
+            concurrency=settings.youtube_concurrency,
+            deadline=_CYCLE_DEADLINE_SECONDS,
+        ):
+            if isinstance(error, RateLimited):
+                continue  # not sent; left due like a channel the deadline cut off
+            poll = self._polls.setdefault(channel_id, {})
+            poll["last_checked_at"] = now
+            poll["next_check_at"] = now + self._intervals.get(channel_id, settings.youtube_min_poll_seconds)
+            touched_polls[channel_id] = poll
+            results[channel_id] = error is None
+            if error is not None:
+                _debug_youtube(f"latest video lookup failed channel={channel_id} error={error}")
+                continue
+            if not latest_video_id:
+                _debug_youtube(f"channel={channel_id}: latest video not found")
+                continue
+            latest_videos[channel_id] = latest_video_id
+            self._observe_upload(poll, latest_video_id, now)
+        if len(touched_polls) < len(due):
+            _debug_youtube(f"batch cut short; polled {len(touched_polls)}/{len(due)} channels")
+
+        if touched_polls:
+            save_youtube_channel_polls(touched_polls)
+
+        unseen = filter_unseen(
+            "youtube",
+            {
+                channel_id: [video_id]
+                for channel_id, video_id in latest_videos.items()
+                if video_id not in self._upcoming
+            },
+        )
+        unknown_ids = sorted({video_ids[0] for video_ids in unseen.values()})
+        if not unknown_ids:
+            self._quota.flush()
+            return results
 
-            for channel_id in list(guild_data["yt_youtuber"].keys()):
+        try:
+            metas = await self._get_video_metas(unknown_ids, api_key)
+        except RateLimited:
+            # Deferred rather than failed: those channels are retried shortly without backoff.
+            return {channel_id: ok for channel_id, ok in results.items() if channel_id not in unseen}
+        except Exception as exc:
+            _debug_youtube(f"video metadata lookup failed error={exc}")
+            # The new ids are still unseen, so the retry after backoff picks them up again.
+            return {**results, **dict.fromkeys(unseen, False)}
+        finally:
+            self._quota.flush()
+
+        # Upcoming streams given up on stay abandoned until they start; they are still looked up
+        # with the batch so a late start is announced, but they are not tracked again.
+        trackable = filter_unseen(
+            _ABANDONED_PROVIDER,
+            {
+                channel_id: video_ids[:1]
+                for channel_id, video_ids in unseen.items()
+                if video_ids[0] in metas and metas[video_ids[0]][0] == "upcoming"
+            },
+        )
+        fresh: list[tuple[str, str, str, str]] = []
+        for channel_id, video_ids in unseen.items():
+            latest_video_id = video_ids[0]
+            meta = metas.get(latest_video_id)
+            if meta is None:
+                continue
+            video_kind, api_channel_name, scheduled_start = meta
+            if video_kind == "upcoming":
+                if channel_id in trackable:
+                    self._track_upcoming(latest_video_id, channel_id, scheduled_start)
+                continue
+            fresh.append((channel_id, latest_video_id, video_kind, api_channel_name))
+        mark_seen("youtube", [(channel_id, video_id) for channel_id, video_id, _, _ in fresh])
+
+        for channel_id, latest_video_id, video_kind, api_channel_name in fresh:
+            record_youtube_video(channel_id, video_kind, latest_video_id, api_channel_name)
+            for follower in followers.get(channel_id, []):
+                await self._announce(follower, channel_id, latest_video_id, video_kind, api_channel_name)
+        return results
+
+    async def _announce(
+        self,
+        follower: dict,
+        channel_id: str,
+        video_id: str,
+        video_kind: str,
+        api_channel_name: str,
+    ) -> None:
+        """Post a newly seen ``video_id`` to one subscribing guild."""
+        guild_id = follower["guild_id"]
+        try:
+            channel = self._resolve_notification_channel(follower["channel"])
+            if channel is None:
+                _debug_youtube(f"guild={guild_id} channel={channel_id} new {video_kind}={video_id} but no notify channel")
+                return
+
+            channel_name = api_channel_name or channel_id
+            yt_link = (
+                f"https://www.youtube.com/shorts/{video_id}" if video_kind == "short" else f"https://youtu.be/{video_id}"
+            )
+            text = follower["text"].replace("{ytber}", channel_name).replace("{url}", yt_link)
+            await channel.send(text)
+            _debug_youtube(f"sent guild={guild_id} channel={channel_id} kind={video_kind} id={video_id}")
+        except Exception as exc:
+            _debug_youtube(f"check failed guild={guild_id} channel={channel_id} error={exc}")
+
+    def _schedule_upcoming(self, video_id: str, check_at: float) -> None:
+        self._upcoming[video_id]["next_check_at"] = check_at
+        heapq.heappush(self._upcoming_heap, (check_at, video_id))
+        self._upcoming_wakeup.set()
+
+    def _track_upcoming(self, video_id: str, channel_id: str, scheduled_start: int) -> None:
+        upcoming = self._upcoming.get(video_id)
+        if upcoming is not None and upcoming["scheduled_start"] == scheduled_start:
+            return
+        if not scheduled_start:
+            # No start time to aim for; let the regular cadence keep looking at it.
+            scheduled_start = int(time.time()) + _UPCOMING_RETRY_SECONDS
+        self._upcoming[video_id] = {"channel_id": channel_id, "scheduled_start": scheduled_start}
+        save_youtube_upcoming_stream(video_id, channel_id, scheduled_start)
+        self._schedule_upcoming(video_id, _next_upcoming_check(scheduled_start, time.time()))
+        _debug_youtube(f"upcoming channel={channel_id} id={video_id} start={scheduled_start}")
+
+    def _forget_upcoming(self, video_id: str) -> None:
+        self._upcoming.pop(video_id, None)
+        delete_youtube_upcoming_stream(video_id)
+
+    async def _run_upcoming_timers(self) -> None:
+        """Sleep until the earliest upcoming-stream check is due, run it, repeat."""
+        while True:
+            self._upcoming_wakeup.clear()
+            if not self._upcoming_heap:
+                await self._upcoming_wakeup.wait()
+                continue
+            check_at, video_id = self._upcoming_heap[0]
+            delay = check_at - time.time()
+            if delay > 0:
                 try:
-                    uploads_playlist_id = self._get_uploads_playlist_id(channel_id, api_key)
-                    if not uploads_playlist_id:
-                        _debug_youtube(f"guild={guild.id} channel={channel_id}: uploads playlist not found")
-                        continue
-
-                    latest_video_id = self._get_latest_upload_video_id(uploads_playlist_id, api_key)
-                    if not latest_video_id:
-                        _debug_youtube(f"guild={guild.id} channel={channel_id}: latest video not found")
-                        continue
-
-                    target = guild_data["yt_youtuber"][channel_id]
-                    video_kind, api_channel_name = self._get_video_meta(latest_video_id, api_key)
-                    channel_name = api_channel_name or target.get("name") or channel_id
-                    target["name"] = channel_name
-
-                    if not self._record_video_id(target, video_kind, latest_video_id):
-                        continue
-
-                    if channel is None:
-                        _debug_youtube(
-                            f"guild={guild.id} channel={channel_id} new {video_kind}={latest_video_id} but no notify channel"
-                        )
-                        continue
-
-                    yt_link = (
-                        f"https://www.youtube.com/shorts/{latest_video_id}"
-                        if video_kind == "short"
-                        else f"https://youtu.be/{latest_video_id}"
-                    )
-                    text = guild_data["youtube_notification_text"].replace("{ytber}", channel_name).replace("{url}", yt_link)
-                    await channel.send(text)
-                    _debug_youtube(
-                        f"sent guild={guild.id} channel={channel_id} kind={video_kind} id={latest_video_id}"
-                    )
-                except Exception as exc:
-                    _debug_youtube(f"check failed guild={guild.id} channel={channel_id} error={exc}")
-
-            save_youtube_data(guild.id, guild_data)
+                    await asyncio.wait_for(self._upcoming_wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._upcoming_heap)
+            upcoming = self._upcoming.get(video_id)
+            if upcoming is None or upcoming.get("next_check_at") != check_at:
+                continue  # superseded by a reschedule or already live
+            try:
+                await self._check_upcoming(video_id, upcoming)
+            except Exception as exc:
+                _debug_youtube(f"upcoming check failed id={video_id} error={exc}")
+                self._schedule_upcoming(video_id, time.time() + _UPCOMING_RETRY_SECONDS)
+
+    async def _check_upcoming(self, video_id: str, upcoming: dict) -> None:
+        api_key = self.bot.settings.youtube_api_key
+        now = time.time()
+        if not api_key or not self._quota.can_afford("videos"):
+            self._schedule_upcoming(video_id, now + _UPCOMING_RETRY_SECONDS)
+            return
+
+        try:
+            meta = (await self._get_video_metas([video_id], api_key)).get(video_id)
+        finally:
+            self._quota.flush()
+        if meta is None:
+            _debug_youtube(f"upcoming id={video_id} no longer available")
+            self._forget_upcoming(video_id)
+            return
+
+        video_kind, api_channel_name, scheduled_start = meta
+        channel_id = upcoming["channel_id"]
+        if video_kind == "upcoming":
+            if now > max(scheduled_start, upcoming["scheduled_start"]) + _UPCOMING_GIVE_UP_SECONDS:
+                _debug_youtube(f"upcoming id={video_id} never started; giving up")
+                self._forget_upcoming(video_id)
+                mark_seen(_ABANDONED_PROVIDER, [(channel_id, video_id)])
+            elif scheduled_start and scheduled_start != upcoming["scheduled_start"]:
+                self._track_upcoming(video_id, channel_id, scheduled_start)
+            else:
+                self._schedule_upcoming(video_id, _next_upcoming_check(upcoming["scheduled_start"], now))
+            return
+
+        self._forget_upcoming(video_id)
+        if not filter_unseen("youtube", {channel_id: [video_id]}):
+            return
+        mark_seen("youtube", [(channel_id, video_id)])
+        record_youtube_video(channel_id, video_kind, video_id, api_channel_name)
+        self.bot.subscriptions.sync()
+        for follower in self.bot.subscriptions.followers("youtube", channel_id):
+            if self.bot.get_guild(follower["guild_id"]) is not None:
+                await self._announce(follower, channel_id, video_id, video_kind, api_channel_name)
+
+    @commands.is_owner()
+    @commands.hybrid_command(with_app_command=True, hidden=True)
+    async def ytquota(self, ctx: commands.Context):
+        quota = self._quota
+        exhaustion = quota.projected_exhaustion()
+        intervals = sorted(self._intervals.values())
+        lines = [
+            f"spent today: **{quota.spent}** / {quota.daily_limit} units ({quota.calls} calls)",
+            f"burn rate (last hour): {quota.burn_rate() * 3600:.0f} units/h",
+            f"projected exhaustion: {exhaustion.strftime('%Y-%m-%d %H:%M %Z') if exhaustion else 'not before reset'}",
+            f"quota resets in: {seconds_until_reset() / 3600:.1f}h",
+        ]
+        if intervals:
+            lines.append(
+                f"channels: {len(intervals)}, poll interval {intervals[0] // 60}-{intervals[-1] // 60} min"
+            )
+        for endpoint, stats in sorted(self._etag_stats.items()):
+            total = stats["hits"] + stats["misses"]
+            if total:
+                lines.append(f"{endpoint} not modified: {stats['hits']}/{total} ({stats['hits'] * 100 // total}%)")
+        await ctx.send("\n".join(lines))
+
 
 async def setup(bot: commands.Bot) -> None:
     await bot.add_cog(Youtube(bot))
@@ -12,6 +12,16 @@ DATA_DIR = BASE_DIR / "data"
 I18N_DIR = DATA_DIR / "i18n"
 SECRETS_DIR = BASE_DIR / "secrets"
 
+
+def _env_int(name: str, default: int, minimum: int = 0) -> int:
+    raw = (os.getenv(name) or "").strip()
+    try:
+        value = int(raw) if raw else default
+    except ValueError:
+        value = default
+    return max(minimum, value)
+
+
 @dataclass(frozen=True)
 class Settings:
     # Discord
@@ -30,7 +40,36 @@ class Settings:
     # External APIs
     twitch_client_id: str = ""
     twitch_client_secret: str = ""
+    twitch_profile_ttl_hours: int = 24
+    twitch_viewer_granularity: int = 100
+    twitch_min_edit_seconds: int = 300
+    twitch_thumbnail_refresh_seconds: int = 900
+    twitch_poll_seconds: int = 60
+    twitch_eventsub_enabled: bool = False
+    twitch_user_access_token: str = ""
+    twitch_eventsub_ws_url: str = "wss://eventsub.wss.twitch.tv/ws"
+    twitch_eventsub_api_url: str = "https://api.twitch.tv/helix/eventsub/subscriptions"
     youtube_api_key: str = ""
+    youtube_daily_quota: int = 10000
+    youtube_min_poll_seconds: int = 300
+    youtube_max_poll_seconds: int = 21600
+    youtube_detection: str = "api"
+    youtube_feed_url: str = "https://www.youtube.com/feeds/videos.xml"
+    twitter_poll_seconds: int = 600
+    twitter_max_posts_per_guild: int = 5
+    twitter_max_backfill_minutes: int = 60
+    seen_items_max_age_days: int = 90
+    seen_items_max_per_source: int = 200
+    http_timeout_seconds: int = 20
+    http_max_retries: int = 2
+    http_pool_per_host: int = 10
+    twitch_concurrency: int = 8
+    youtube_concurrency: int = 4
+    twitter_concurrency: int = 2
+    twitch_requests_per_minute: int = 800
+    youtube_requests_per_minute: int = 600
+    youtube_feed_requests_per_minute: int = 300
+    twitter_requests_per_minute: int = 30
 
     # Misc
     timezone_default: str = "Asia/Taipei"
@@ -57,7 +96,38 @@ def load_settings() -> Settings:
     local_db_path = Path(local_db_path_env) if local_db_path_env else (DATA_DIR / "local.db")
     twitch_client_id = os.getenv("TWITCH_CLIENT_ID") or ""
     twitch_client_secret = os.getenv("TWITCH_CLIENT_SECRET") or ""
+    twitch_profile_ttl_hours = _env_int("TWITCH_PROFILE_TTL_HOURS", 24, minimum=1)
+    twitch_viewer_granularity = _env_int("TWITCH_VIEWER_GRANULARITY", 100, minimum=1)
+    twitch_min_edit_seconds = _env_int("TWITCH_MIN_EDIT_SECONDS", 300)
+    twitch_thumbnail_refresh_seconds = _env_int("TWITCH_THUMBNAIL_REFRESH_SECONDS", 900, minimum=60)
+    twitch_poll_seconds = _env_int("TWITCH_POLL_SECONDS", 60, minimum=15)
+    twitch_eventsub_enabled = (os.getenv("TWITCH_EVENTSUB") or "").strip() in {"1", "true", "True", "yes", "YES"}
+    twitch_user_access_token = os.getenv("TWITCH_USER_ACCESS_TOKEN") or ""
+    twitch_eventsub_ws_url = os.getenv("TWITCH_EVENTSUB_WS_URL") or "wss://eventsub.wss.twitch.tv/ws"
+    twitch_eventsub_api_url = os.getenv("TWITCH_EVENTSUB_API_URL") or "https://api.twitch.tv/helix/eventsub/subscriptions"
     youtube_api_key = os.getenv("YOUTUBE_API_KEY") or ""
+    youtube_daily_quota = _env_int("YOUTUBE_DAILY_QUOTA", 10000, minimum=1)
+    youtube_min_poll_seconds = _env_int("YOUTUBE_MIN_POLL_SECONDS", 300, minimum=60)
+    youtube_max_poll_seconds = max(youtube_min_poll_seconds, _env_int("YOUTUBE_MAX_POLL_SECONDS", 21600, minimum=60))
+    youtube_detection = (os.getenv("YOUTUBE_DETECTION") or "api").strip().lower()
+    if youtube_detection not in {"api", "feed"}:
+        youtube_detection = "api"
+    youtube_feed_url = os.getenv("YOUTUBE_FEED_URL") or "https://www.youtube.com/feeds/videos.xml"
+    twitter_poll_seconds = _env_int("TWITTER_POLL_SECONDS", 600, minimum=60)
+    twitter_max_posts_per_guild = _env_int("TWITTER_MAX_POSTS_PER_GUILD", 5, minimum=1)
+    twitter_max_backfill_minutes = _env_int("TWITTER_MAX_BACKFILL_MINUTES", 60, minimum=1)
+    seen_items_max_age_days = _env_int("SEEN_ITEMS_MAX_AGE_DAYS", 90, minimum=1)
+    seen_items_max_per_source = _env_int("SEEN_ITEMS_MAX_PER_SOURCE", 200, minimum=10)
+    http_timeout_seconds = _env_int("HTTP_TIMEOUT_SECONDS", 20, minimum=1)
+    http_max_retries = _env_int("HTTP_MAX_RETRIES", 2)
+    http_pool_per_host = _env_int("HTTP_POOL_PER_HOST", 10, minimum=1)
+    twitch_concurrency = _env_int("TWITCH_CONCURRENCY", 8, minimum=1)
+    youtube_concurrency = _env_int("YOUTUBE_CONCURRENCY", 4, minimum=1)
+    twitter_concurrency = _env_int("TWITTER_CONCURRENCY", 2, minimum=1)
+    twitch_requests_per_minute = _env_int("TWITCH_REQUESTS_PER_MINUTE", 800, minimum=1)
+    youtube_requests_per_minute = _env_int("YOUTUBE_REQUESTS_PER_MINUTE", 600, minimum=1)
+    youtube_feed_requests_per_minute = _env_int("YOUTUBE_FEED_REQUESTS_PER_MINUTE", 300, minimum=1)
+    twitter_requests_per_minute = _env_int("TWITTER_REQUESTS_PER_MINUTE", 30, minimum=1)
 
     return Settings(
         token=token,
@@ -69,5 +139,34 @@ def load_settings() -> Settings:
         local_db_path=local_db_path,
         twitch_client_id=twitch_client_id,
         twitch_client_secret=twitch_client_secret,
+        twitch_profile_ttl_hours=twitch_profile_ttl_hours,
+        twitch_viewer_granularity=twitch_viewer_granularity,
+        twitch_min_edit_seconds=twitch_min_edit_seconds,
+        twitch_thumbnail_refresh_seconds=twitch_thumbnail_refresh_seconds,
+        twitch_poll_seconds=twitch_poll_seconds,
+        twitch_eventsub_enabled=twitch_eventsub_enabled,
+        twitch_user_access_token=twitch_user_access_token,
+        twitch_eventsub_ws_url=twitch_eventsub_ws_url,
+        twitch_eventsub_api_url=twitch_eventsub_api_url,
         youtube_api_key=youtube_api_key,
+        youtube_daily_quota=youtube_daily_quota,
+        youtube_min_poll_seconds=youtube_min_poll_seconds,
+        youtube_max_poll_seconds=youtube_max_poll_seconds,
+        youtube_detection=youtube_detection,
+        youtube_feed_url=youtube_feed_url,
+        twitter_poll_seconds=twitter_poll_seconds,
+        twitter_max_posts_per_guild=twitter_max_posts_per_guild,
+        twitter_max_backfill_minutes=twitter_max_backfill_minutes,
+        seen_items_max_age_days=seen_items_max_age_days,
+        seen_items_max_per_source=seen_items_max_per_source,
+        http_timeout_seconds=http_timeout_seconds,
+        http_max_retries=http_max_retries,
+        http_pool_per_host=http_pool_per_host,
+        twitch_concurrency=twitch_concurrency,
+        youtube_concurrency=youtube_concurrency,
+        twitter_concurrency=twitter_concurrency,
+        twitch_requests_per_minute=twitch_requests_per_minute,
+        youtube_requests_per_minute=youtube_requests_per_minute,
+        youtube_feed_requests_per_minute=youtube_feed_requests_per_minute,
+        twitter_requests_per_minute=twitter_requests_per_minute,
     )
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from discord.ext import commands
 
+if TYPE_CHECKING:
+    from bot.services.http_client import HttpClient
+
 
 class CogExtension(commands.Cog):
     """Base class for all cogs.
@@ -13,6 +18,11 @@ class CogExtension(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
+    @property
+    def http_client(self) -> HttpClient:
+        """The bot's shared pooled client for third-party APIs."""
+        return self.bot.http_client
+
 
 # Backward-compatible alias
 Cog_Extension = CogExtension
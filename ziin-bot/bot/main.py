@@ -9,7 +9,12 @@ from bot.config import BASE_DIR, load_settings
 from bot.core.errors import setup_error_handlers
 from bot.logging_conf import setup_logging
 from bot.services.guild_settings import get_guild_settings
+from bot.services.http_client import HttpClient
+from bot.services.rate_limit import RateGovernor
+from bot.services.scheduler import PollScheduler
 from bot.services.storage import init_storage
+from bot.services.subscription_index import SubscriptionIndex
+from bot.services.youtube_feed import FEED_PROVIDER
 from discord.ext import commands
 
 log = logging.getLogger(__name__)
@@ -34,6 +39,28 @@ class ZiinBot(commands.Bot):
         intents.presences = True
 
         self.settings = load_settings()
+        self.subscriptions = SubscriptionIndex()
+        self.governor = RateGovernor(
+            {
+                "twitch": self.settings.twitch_requests_per_minute,
+                "youtube": self.settings.youtube_requests_per_minute,
+                FEED_PROVIDER: self.settings.youtube_feed_requests_per_minute,
+                "twitter": self.settings.twitter_requests_per_minute,
+            }
+        )
+        self.http_client = HttpClient(
+            timeout=self.settings.http_timeout_seconds,
+            retries=self.settings.http_max_retries,
+            per_host=self.settings.http_pool_per_host,
+            limits={
+                "twitch": self.settings.twitch_concurrency,
+                "youtube": self.settings.youtube_concurrency,
+                FEED_PROVIDER: self.settings.youtube_concurrency,
+                "twitter": self.settings.twitter_concurrency,
+            },
+            governor=self.governor,
+        )
+        self.scheduler = PollScheduler()
 
         super().__init__(
             command_prefix=self._dynamic_prefix,
@@ -60,6 +87,8 @@ class ZiinBot(commands.Bot):
     async def setup_hook(self) -> None:
         # Local SQLite DB init
         init_storage(self.settings.local_db_path)
+        self.subscriptions.refresh()
+        self.scheduler.start()
 
         # Load cogs
         for ext in iter_cog_extensions():
@@ -77,6 +106,11 @@ class ZiinBot(commands.Bot):
             except Exception:
                 log.exception("App command sync failed.")
 
+    async def close(self) -> None:
+        await super().close()
+        await self.scheduler.close()
+        await self.http_client.close()
+
     async def on_ready(self) -> None:
         log.info("Logged in as %s (%s)", self.user, self.user.id if self.user else "unknown")
         await self.change_presence(
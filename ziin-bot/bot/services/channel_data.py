@@ -1,14 +1,18 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 
-from bot.services.storage import execute, fetchall, fetchone, now_ts
+from bot.services.seen_items import mark_seen
+from bot.services.storage import execute, executemany, fetchall, fetchone, now_ts, transaction
 
 DEFAULT_TWITCH_TEXT = "**{streamer}** is live now!!\n**{url}**"
 DEFAULT_YOUTUBE_TEXT = "**{ytber}** upload a video!!\n**{url}**"
 DEFAULT_TWITTER_TEXT = "**{xuser}** posted a new tweet!\n**{url}**"
 _SCHEMA_READY = False
+# Called as listener(provider, guild_id, sources, notification_channel, notification_text)
+# after a guild's subscriptions are saved through this module.
+_SUBSCRIPTION_LISTENERS: list[Callable[[str, int, list[str], Any, str], None]] = []
 
 
 def build_default_twitch_data(guild_id: int) -> Dict[str, Any]:
@@ -74,6 +78,22 @@ def _normalize_id_history(raw: Any) -> list[str]:
     return normalized
 
 
+def _normalize_twitch_logins(raw: Any) -> list[str]:
+    if not isinstance(raw, list):
+        return []
+    logins: list[str] = []
+    seen: set[str] = set()
+    for value in raw:
+        if not isinstance(value, str):
+            continue
+        login = value.strip().lower()
+        if not login or login in seen:
+            continue
+        logins.append(login)
+        seen.add(login)
+    return logins
+
+
 def _normalize_twitch_data(guild_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
     default = build_default_twitch_data(guild_id)
     normalized = dict(default)
@@ -109,16 +129,6 @@ def _normalize_youtube_subscriptions(raw: Any) -> Dict[str, Dict[str, Any]]:
         video_id = item.get("videoId") if isinstance(item.get("videoId"), str) else ""
         stream_id = item.get("streamId") if isinstance(item.get("streamId"), str) else ""
         short_id = item.get("shortId") if isinstance(item.get("shortId"), str) else ""
-        video_history = _normalize_id_history(item.get("videoHistory"))
-        stream_history = _normalize_id_history(item.get("streamHistory"))
-        short_history = _normalize_id_history(item.get("shortHistory"))
-
-        if video_id and video_id not in video_history:
-            video_history.append(video_id)
-        if stream_id and stream_id not in stream_history:
-            stream_history.append(stream_id)
-        if short_id and short_id not in short_history:
-            short_history.append(short_id)
 
         normalized[youtuber_id] = {
             "id": youtuber_id,
@@ -126,9 +136,6 @@ def _normalize_youtube_subscriptions(raw: Any) -> Dict[str, Dict[str, Any]]:
             "videoId": video_id,
             "streamId": stream_id,
             "shortId": short_id,
-            "videoHistory": video_history,
-            "streamHistory": stream_history,
-            "shortHistory": short_history,
         }
 
     return normalized
@@ -166,15 +173,11 @@ def _normalize_twitter_subscriptions(raw: Any) -> Dict[str, Dict[str, Any]]:
 
         name = item.get("name") if isinstance(item.get("name"), str) else account
         tweet_id = item.get("tweetId") if isinstance(item.get("tweetId"), str) else ""
-        tweet_history = _normalize_id_history(item.get("tweetHistory"))
-        if tweet_id and tweet_id not in tweet_history:
-            tweet_history.append(tweet_id)
 
         normalized[account] = {
             "id": account,
             "name": name,
             "tweetId": tweet_id,
-            "tweetHistory": tweet_history,
         }
 
     return normalized
@@ -196,10 +199,44 @@ def _normalize_twitter_data(guild_id: int, data: Dict[str, Any]) -> Dict[str, An
     return normalized
 
 
+def add_subscription_listener(listener: Callable[[str, int, list[str], Any, str], None]) -> None:
+    _SUBSCRIPTION_LISTENERS.append(listener)
+
+
+def subscription_watermark(provider: str) -> tuple[int, int]:
+    """Return ``(guild rows, newest updated_at)`` of ``provider``'s settings table.
+
+    Every settings save, from the bot or the web dashboard, stamps the
+    guild's row there in the same transaction as its subscription changes,
+    so a moved watermark means that provider's subscriptions may have changed.
+    """
+    _ensure_split_tables_schema()
+    row = fetchone(f"SELECT COUNT(*), IFNULL(MAX(updated_at), 0) FROM {provider}_data")
+    return (int(row[0]), int(row[1])) if row is not None else (0, 0)
+
+
+def _notify_subscription_listeners(
+    provider: str,
+    guild_id: int,
+    sources: list[str],
+    channel_id: Any,
+    text: Any,
+    default_text: str,
+) -> None:
+    text = text if isinstance(text, str) and text else default_text
+    for listener in _SUBSCRIPTION_LISTENERS:
+        listener(provider, guild_id, sources, _notification_channel(channel_id), text)
+
+
 def _table_columns(table: str) -> set[str]:
     return {str(row["name"]) for row in fetchall(f"PRAGMA table_info({table})")}
 
 
+def _import_seen_ids(provider: str, source_id: str, item_ids: list[Any], seen_at: Any) -> None:
+    stamp = int(seen_at) if isinstance(seen_at, int) and seen_at > 0 else now_ts()
+    mark_seen(provider, [(source_id, item_id) for item_id in _normalize_id_history(item_ids)], seen_at=stamp)
+
+
 def _ensure_youtube_subscriptions_schema() -> None:
     execute(
         """
@@ -226,6 +263,29 @@ def _ensure_youtube_subscriptions_schema() -> None:
     if "short_history" not in columns:
         execute("ALTER TABLE youtube_subscriptions ADD COLUMN short_history TEXT NOT NULL DEFAULT '[]'")
 
+    # Announced ids live in seen_items now; fold in whatever the JSON history columns still hold
+    # (rows from before seen_items, or written by an older dashboard) and empty them.
+    rows = fetchall(
+        """
+        SELECT youtuber_id, video_id, stream_id, short_id, video_history, stream_history, short_history, updated_at
+        FROM youtube_subscriptions
+        WHERE video_history != '[]' OR stream_history != '[]' OR short_history != '[]'
+        """
+    )
+    if rows:
+        for row in rows:
+            item_ids = [row["video_id"], row["stream_id"], row["short_id"]]
+            for column in ("video_history", "stream_history", "short_history"):
+                item_ids.extend(_normalize_id_history(_parse_json_value(row[column], [])))
+            _import_seen_ids("youtube", str(row["youtuber_id"]), item_ids, row["updated_at"])
+        execute(
+            """
+            UPDATE youtube_subscriptions
+            SET video_history = '[]', stream_history = '[]', short_history = '[]'
+            WHERE video_history != '[]' OR stream_history != '[]' OR short_history != '[]'
+            """
+        )
+
 
 def _ensure_twitter_subscriptions_schema() -> None:
     execute(
@@ -245,6 +305,15 @@ def _ensure_twitter_subscriptions_schema() -> None:
     if "tweet_history" not in columns:
         execute("ALTER TABLE twitter_subscriptions ADD COLUMN tweet_history TEXT NOT NULL DEFAULT '[]'")
 
+    rows = fetchall(
+        "SELECT account_id, tweet_id, tweet_history, updated_at FROM twitter_subscriptions WHERE tweet_history != '[]'"
+    )
+    if rows:
+        for row in rows:
+            item_ids = [row["tweet_id"], *_normalize_id_history(_parse_json_value(row["tweet_history"], []))]
+            _import_seen_ids("twitter", str(row["account_id"]).strip().lower().lstrip("@"), item_ids, row["updated_at"])
+        execute("UPDATE twitter_subscriptions SET tweet_history = '[]' WHERE tweet_history != '[]'")
+
 
 def _ensure_twitch_table_schema() -> None:
     required = {
@@ -338,66 +407,111 @@ def _ensure_twitch_table_schema() -> None:
         )
 
 
-def _replace_youtube_subscriptions(server_id: str, items: Dict[str, Dict[str, Any]], updated_at: int) -> None:
-    execute("DELETE FROM youtube_subscriptions WHERE server_id = ?", (server_id,))
-    for youtuber_id, item in items.items():
-        execute(
-            """
-            INSERT INTO youtube_subscriptions (
-              server_id,
-              youtuber_id,
-              channel_name,
-              video_id,
-              stream_id,
-              short_id,
-              video_history,
-              stream_history,
-              short_history,
-              updated_at
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                server_id,
-                youtuber_id,
-                item.get("name"),
-                item.get("videoId"),
-                item.get("streamId"),
-                item.get("shortId"),
-                json.dumps(_normalize_id_history(item.get("videoHistory")), ensure_ascii=False),
-                json.dumps(_normalize_id_history(item.get("streamHistory")), ensure_ascii=False),
-                json.dumps(_normalize_id_history(item.get("shortHistory")), ensure_ascii=False),
-                updated_at,
-            ),
+def _ensure_twitch_subscriptions_schema() -> None:
+    execute(
+        """
+        CREATE TABLE IF NOT EXISTS twitch_subscriptions (
+          server_id TEXT NOT NULL,
+          login TEXT NOT NULL,
+          is_live INTEGER NOT NULL DEFAULT 0 CHECK (is_live IN (0, 1)),
+          stream_id TEXT,
+          last_seen_live INTEGER,
+          updated_at INTEGER,
+          PRIMARY KEY (server_id, login)
         )
+        """
+    )
+    execute("CREATE INDEX IF NOT EXISTS idx_twitch_subscriptions_login ON twitch_subscriptions(login, is_live)")
 
+    # Import the legacy JSON streamer lists for guilds that have no subscription rows yet.
+    # Every writer keeps twitch_data.all_streamers in sync, so an empty guild here means
+    # it was never migrated rather than that its streamers were removed.
+    stamp = now_ts()
+    rows: list[tuple[str, str, int, int]] = []
+    for row in fetchall(
+        """
+        SELECT server_id, all_streamers, online_streamers
+        FROM twitch_data d
+        WHERE NOT EXISTS (SELECT 1 FROM twitch_subscriptions s WHERE s.server_id = d.server_id)
+        """
+    ):
+        online = set(_normalize_twitch_logins(_parse_json_value(row["online_streamers"], [])))
+        for login in _normalize_twitch_logins(_parse_json_value(row["all_streamers"], [])):
+            rows.append((str(row["server_id"]), login, 1 if login in online else 0, stamp))
+    if rows:
+        executemany(
+            "INSERT OR IGNORE INTO twitch_subscriptions (server_id, login, is_live, updated_at) VALUES (?, ?, ?, ?)",
+            rows,
+        )
 
-def _replace_twitter_subscriptions(server_id: str, items: Dict[str, Dict[str, Any]], updated_at: int) -> None:
-    execute("DELETE FROM twitter_subscriptions WHERE server_id = ?", (server_id,))
-    for account_id, item in items.items():
-        execute(
-            """
-            INSERT INTO twitter_subscriptions (
-              server_id,
-              account_id,
-              display_name,
-              tweet_id,
-              tweet_history,
-              updated_at
-            )
-            VALUES (?, ?, ?, ?, ?, ?)
+
+def _sync_twitch_subscriptions(server_id: str, logins: list[str], online: set[str], updated_at: int) -> None:
+    existing = {
+        str(row["login"]) for row in fetchall("SELECT login FROM twitch_subscriptions WHERE server_id = ?", (server_id,))
+    }
+    wanted = set(logins)
+    removed = existing - wanted
+    added = [login for login in logins if login not in existing]
+    if removed:
+        executemany(
+            "DELETE FROM twitch_subscriptions WHERE server_id = ? AND login = ?",
+            [(server_id, login) for login in removed],
+        )
+    if added:
+        executemany(
+            "INSERT INTO twitch_subscriptions (server_id, login, is_live, updated_at) VALUES (?, ?, ?, ?)",
+            [(server_id, login, 1 if login in online else 0, updated_at) for login in added],
+        )
+
+
+_YOUTUBE_SUBSCRIPTION_FIELDS = (("channel_name", "name"), ("video_id", "videoId"), ("stream_id", "streamId"), ("short_id", "shortId"))
+_TWITTER_SUBSCRIPTION_FIELDS = (("display_name", "name"), ("tweet_id", "tweetId"))
+
+
+def _diff_subscriptions(
+    table: str,
+    key_column: str,
+    fields: tuple[tuple[str, str], ...],
+    server_id: str,
+    items: Dict[str, Dict[str, Any]],
+    updated_at: int,
+) -> None:
+    """Bring ``table``'s rows for ``server_id`` in line with ``items``, touching only rows that differ."""
+    columns = [column for column, _ in fields]
+    stored = {
+        str(row[key_column]): tuple(row[column] for column in columns)
+        for row in fetchall(f"SELECT {key_column}, {', '.join(columns)} FROM {table} WHERE server_id = ?", (server_id,))
+    }
+    removed = [(server_id, key) for key in stored if key not in items]
+    changed = []
+    for key, item in items.items():
+        values = tuple(item.get(field) for _, field in fields)
+        if stored.get(key) != values:
+            changed.append((server_id, key, *values, updated_at))
+
+    if removed:
+        executemany(f"DELETE FROM {table} WHERE server_id = ? AND {key_column} = ?", removed)
+    if changed:
+        assignments = ", ".join(f"{column} = excluded.{column}" for column in [*columns, "updated_at"])
+        placeholders = ", ".join("?" for _ in range(len(columns) + 3))
+        executemany(
+            f"""
+            INSERT INTO {table} (server_id, {key_column}, {', '.join(columns)}, updated_at)
+            VALUES ({placeholders})
+            ON CONFLICT(server_id, {key_column}) DO UPDATE SET {assignments}
             """,
-            (
-                server_id,
-                account_id,
-                item.get("name"),
-                item.get("tweetId"),
-                json.dumps(_normalize_id_history(item.get("tweetHistory")), ensure_ascii=False),
-                updated_at,
-            ),
+            changed,
         )
 
 
+def _sync_youtube_subscriptions(server_id: str, items: Dict[str, Dict[str, Any]], updated_at: int) -> None:
+    _diff_subscriptions("youtube_subscriptions", "youtuber_id", _YOUTUBE_SUBSCRIPTION_FIELDS, server_id, items, updated_at)
+
+
+def _sync_twitter_subscriptions(server_id: str, items: Dict[str, Dict[str, Any]], updated_at: int) -> None:
+    _diff_subscriptions("twitter_subscriptions", "account_id", _TWITTER_SUBSCRIPTION_FIELDS, server_id, items, updated_at)
+
+
 def _ensure_youtube_table_schema() -> None:
     _ensure_youtube_subscriptions_schema()
 
@@ -482,7 +596,15 @@ def _ensure_youtube_table_schema() -> None:
                 stamp,
             ),
         )
-        _replace_youtube_subscriptions(server_id, normalized["yt_youtuber"], stamp)
+        _sync_youtube_subscriptions(server_id, normalized["yt_youtuber"], stamp)
+        legacy_subscriptions = old.get("yt_youtuber")
+        for youtuber_id, item in (legacy_subscriptions if isinstance(legacy_subscriptions, dict) else {}).items():
+            if not isinstance(item, dict) or youtuber_id not in normalized["yt_youtuber"]:
+                continue
+            item_ids = [item.get("videoId"), item.get("streamId"), item.get("shortId")]
+            for key in ("videoHistory", "streamHistory", "shortHistory"):
+                item_ids.extend(_normalize_id_history(item.get(key)))
+            _import_seen_ids("youtube", youtuber_id, item_ids, stamp)
 
 
 def _ensure_twitter_table_schema() -> None:
@@ -518,18 +640,26 @@ def _ensure_split_tables_schema() -> None:
         return
 
     _ensure_twitch_table_schema()
+    _ensure_twitch_subscriptions_schema()
     _ensure_youtube_table_schema()
     _ensure_twitter_table_schema()
     _SCHEMA_READY = True
 
 
-def _row_to_twitch_data(guild_id: int, row: Any) -> Dict[str, Any]:
+def _load_twitch_subscriptions(server_id: str) -> list[Any]:
+    return fetchall(
+        "SELECT login, is_live FROM twitch_subscriptions WHERE server_id = ? ORDER BY rowid",
+        (server_id,),
+    )
+
+
+def _row_to_twitch_data(guild_id: int, row: Any, subscriptions: list[Any]) -> Dict[str, Any]:
     raw = {
         "id": guild_id,
         "twitch_notification_channel": row["twitch_notification_channel"],
-        "all_streamers": _parse_json_value(row["all_streamers"], []),
-        "online_streamers": _parse_json_value(row["online_streamers"], []),
-        "offline_streamers": _parse_json_value(row["offline_streamers"], []),
+        "all_streamers": [str(item["login"]) for item in subscriptions],
+        "online_streamers": [str(item["login"]) for item in subscriptions if item["is_live"]],
+        "offline_streamers": [str(item["login"]) for item in subscriptions if not item["is_live"]],
         "twitch_notification_text": row["twitch_notification_text"],
     }
     return _normalize_twitch_data(guild_id, raw)
@@ -543,10 +673,7 @@ def _load_youtube_subscriptions(server_id: str) -> Dict[str, Dict[str, Any]]:
           channel_name,
           video_id,
           stream_id,
-          short_id,
-          video_history,
-          stream_history,
-          short_history
+          short_id
         FROM youtube_subscriptions
         WHERE server_id = ?
         """,
@@ -562,9 +689,6 @@ def _load_youtube_subscriptions(server_id: str) -> Dict[str, Dict[str, Any]]:
             "videoId": row["video_id"] if isinstance(row["video_id"], str) else "",
             "streamId": row["stream_id"] if isinstance(row["stream_id"], str) else "",
             "shortId": row["short_id"] if isinstance(row["short_id"], str) else "",
-            "videoHistory": _normalize_id_history(_parse_json_value(row["video_history"], [])),
-            "streamHistory": _normalize_id_history(_parse_json_value(row["stream_history"], [])),
-            "shortHistory": _normalize_id_history(_parse_json_value(row["short_history"], [])),
         }
 
     return items
@@ -586,8 +710,7 @@ def _load_twitter_subscriptions(server_id: str) -> Dict[str, Dict[str, Any]]:
         SELECT
           account_id,
           display_name,
-          tweet_id,
-          tweet_history
+          tweet_id
         FROM twitter_subscriptions
         WHERE server_id = ?
         """,
@@ -603,7 +726,6 @@ def _load_twitter_subscriptions(server_id: str) -> Dict[str, Dict[str, Any]]:
             "id": account_id,
             "name": row["display_name"] if isinstance(row["display_name"], str) else account_id,
             "tweetId": row["tweet_id"] if isinstance(row["tweet_id"], str) else "",
-            "tweetHistory": _normalize_id_history(_parse_json_value(row["tweet_history"], [])),
         }
     return items
 
@@ -620,24 +742,22 @@ def _row_to_twitter_data(guild_id: int, row: Any, subscriptions: Dict[str, Dict[
 
 def ensure_twitch_data(guild_id: int) -> Dict[str, Any]:
     _ensure_split_tables_schema()
+    server_id = str(guild_id)
     row = fetchone(
         """
         SELECT
           twitch_notification_channel,
-          all_streamers,
-          online_streamers,
-          offline_streamers,
           twitch_notification_text
         FROM twitch_data
         WHERE server_id = ?
         """,
-        (str(guild_id),),
+        (server_id,),
     )
     if row is None:
         payload = build_default_twitch_data(guild_id)
         return save_twitch_data(guild_id, payload)
 
-    return _row_to_twitch_data(guild_id, row)
+    return _row_to_twitch_data(guild_id, row, _load_twitch_subscriptions(server_id))
 
 
 def ensure_youtube_data(guild_id: int) -> Dict[str, Any]:
@@ -695,38 +815,144 @@ def get_twitter_data(guild_id: int) -> Dict[str, Any]:
 def save_twitch_data(guild_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
     _ensure_split_tables_schema()
     normalized = _normalize_twitch_data(guild_id, payload)
+    server_id = str(guild_id)
+    stamp = now_ts()
+    logins = _normalize_twitch_logins(normalized["all_streamers"])
+    online = set(_normalize_twitch_logins(normalized["online_streamers"]))
+
+    # all_streamers is still written so older readers of twitch_data keep working;
+    # live state is tracked per row in twitch_subscriptions.
+    with transaction():
+        execute(
+            """
+            INSERT INTO twitch_data (
+              server_id,
+              twitch_notification_channel,
+              all_streamers,
+              twitch_notification_text,
+              updated_at
+            )
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(server_id)
+            DO UPDATE SET
+              twitch_notification_channel = excluded.twitch_notification_channel,
+              all_streamers = excluded.all_streamers,
+              twitch_notification_text = excluded.twitch_notification_text,
+              updated_at = excluded.updated_at
+            """,
+            (
+                server_id,
+                normalized["twitch_notification_channel"],
+                json.dumps(logins, ensure_ascii=False),
+                normalized["twitch_notification_text"],
+                stamp,
+            ),
+        )
+        _sync_twitch_subscriptions(server_id, logins, online, stamp)
+    _notify_subscription_listeners(
+        "twitch",
+        guild_id,
+        logins,
+        normalized["twitch_notification_channel"],
+        normalized["twitch_notification_text"],
+        DEFAULT_TWITCH_TEXT,
+    )
+    return normalized
+
+
+def list_twitch_logins(live_only: bool = False) -> list[str]:
+    _ensure_split_tables_schema()
+    where = "WHERE is_live = 1" if live_only else ""
+    return [str(row["login"]) for row in fetchall(f"SELECT DISTINCT login FROM twitch_subscriptions {where} ORDER BY login")]
+
+
+def _group_followers(rows: list[Any], source_column: str, build) -> Dict[str, list[Dict[str, Any]]]:
+    grouped: Dict[str, list[Dict[str, Any]]] = {}
+    for row in rows:
+        try:
+            guild_id = int(row["server_id"])
+        except (TypeError, ValueError):
+            continue
+        grouped.setdefault(str(row[source_column]), []).append(build(guild_id, row))
+    return grouped
+
+
+def _notification_channel(channel_id: Any) -> Any:
+    return None if channel_id in (None, "", 0, "0") else channel_id
+
+
+def _twitch_follower(guild_id: int, row: Any) -> Dict[str, Any]:
+    text = row["twitch_notification_text"]
+    return {
+        "guild_id": guild_id,
+        "is_live": bool(row["is_live"]),
+        "stream_id": row["stream_id"] or "",
+        "twitch_notification_channel": _notification_channel(row["twitch_notification_channel"]),
+        "twitch_notification_text": text if isinstance(text, str) and text else DEFAULT_TWITCH_TEXT,
+    }
+
+
+_TWITCH_FOLLOWERS_SQL = """
+    SELECT
+      s.login,
+      s.server_id,
+      s.is_live,
+      s.stream_id,
+      d.twitch_notification_channel,
+      d.twitch_notification_text
+    FROM twitch_subscriptions s
+    LEFT JOIN twitch_data d ON d.server_id = s.server_id
+"""
+
+
+def get_twitch_followers(login: str) -> list[Dict[str, Any]]:
+    """Return every guild subscribed to ``login`` with its live flag and notification settings."""
+    _ensure_split_tables_schema()
+    rows = fetchall(_TWITCH_FOLLOWERS_SQL + " WHERE s.login = ?", (login.strip().lower(),))
+    return _group_followers(rows, "login", _twitch_follower).get(login.strip().lower(), [])
+
+
+def load_twitch_followers(logins: list[str] | None = None) -> Dict[str, list[Dict[str, Any]]]:
+    """Return ``get_twitch_followers`` for every subscribed login (or just ``logins``) at once, keyed by login."""
+    _ensure_split_tables_schema()
+    if logins is None:
+        return _group_followers(fetchall(_TWITCH_FOLLOWERS_SQL), "login", _twitch_follower)
+    if not logins:
+        return {}
+    wanted = [login.strip().lower() for login in logins]
+    rows = fetchall(_TWITCH_FOLLOWERS_SQL + f" WHERE s.login IN ({', '.join('?' for _ in wanted)})", wanted)
+    return _group_followers(rows, "login", _twitch_follower)
+
+
+def set_twitch_live_state(login: str, is_live: bool, stream_id: str = "") -> None:
+    """Record a live/offline transition for every subscription of ``login``.
+
+    Rows already in the requested state are left untouched, so steady-state
+    polling does not write. Rows live without a stream id (imported while the
+    stream was already announced) keep that state until the stream ends.
+    """
+    _ensure_split_tables_schema()
+    stamp = now_ts()
+    login = login.strip().lower()
+    if is_live:
+        execute(
+            """
+            UPDATE twitch_subscriptions
+            SET is_live = 1, stream_id = ?, last_seen_live = ?, updated_at = ?
+            WHERE login = ? AND (is_live = 0 OR (IFNULL(stream_id, '') != '' AND stream_id != ?))
+            """,
+            (stream_id, stamp, stamp, login, stream_id),
+        )
+        return
+
     execute(
         """
-        INSERT INTO twitch_data (
-          server_id,
-          twitch_notification_channel,
-          all_streamers,
-          online_streamers,
-          offline_streamers,
-          twitch_notification_text,
-          updated_at
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(server_id)
-        DO UPDATE SET
-          twitch_notification_channel = excluded.twitch_notification_channel,
-          all_streamers = excluded.all_streamers,
-          online_streamers = excluded.online_streamers,
-          offline_streamers = excluded.offline_streamers,
-          twitch_notification_text = excluded.twitch_notification_text,
-          updated_at = excluded.updated_at
+        UPDATE twitch_subscriptions
+        SET is_live = 0, last_seen_live = ?, updated_at = ?
+        WHERE login = ? AND is_live = 1
         """,
-        (
-            str(guild_id),
-            normalized["twitch_notification_channel"],
-            json.dumps(normalized["all_streamers"], ensure_ascii=False),
-            json.dumps(normalized["online_streamers"], ensure_ascii=False),
-            json.dumps(normalized["offline_streamers"], ensure_ascii=False),
-            normalized["twitch_notification_text"],
-            now_ts(),
-        ),
+        (stamp, stamp, login),
     )
-    return normalized
 
 
 def save_youtube_data(guild_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -735,30 +961,38 @@ def save_youtube_data(guild_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
     stamp = now_ts()
     server_id = str(guild_id)
 
-    execute(
-        """
-        INSERT INTO youtube_data (
-          server_id,
-          youtube_notification_text,
-          youtube_notification_channel,
-          updated_at
+    with transaction():
+        execute(
+            """
+            INSERT INTO youtube_data (
+              server_id,
+              youtube_notification_text,
+              youtube_notification_channel,
+              updated_at
+            )
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(server_id)
+            DO UPDATE SET
+              youtube_notification_text = excluded.youtube_notification_text,
+              youtube_notification_channel = excluded.youtube_notification_channel,
+              updated_at = excluded.updated_at
+            """,
+            (
+                server_id,
+                normalized["youtube_notification_text"],
+                normalized["youtube_notification_channel"],
+                stamp,
+            ),
         )
-        VALUES (?, ?, ?, ?)
-        ON CONFLICT(server_id)
-        DO UPDATE SET
-          youtube_notification_text = excluded.youtube_notification_text,
-          youtube_notification_channel = excluded.youtube_notification_channel,
-          updated_at = excluded.updated_at
-        """,
-        (
-            server_id,
-            normalized["youtube_notification_text"],
-            normalized["youtube_notification_channel"],
-            stamp,
-        ),
+        _sync_youtube_subscriptions(server_id, normalized["yt_youtuber"], stamp)
+    _notify_subscription_listeners(
+        "youtube",
+        guild_id,
+        list(normalized["yt_youtuber"]),
+        normalized["youtube_notification_channel"],
+        normalized["youtube_notification_text"],
+        DEFAULT_YOUTUBE_TEXT,
     )
-
-    _replace_youtube_subscriptions(server_id, normalized["yt_youtuber"], stamp)
     return normalized
 
 
@@ -768,28 +1002,137 @@ def save_twitter_data(guild_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
     stamp = now_ts()
     server_id = str(guild_id)
 
-    execute(
-        """
-        INSERT INTO twitter_data (
-          server_id,
-          twitter_notification_text,
-          twitter_notification_channel,
-          updated_at
+    with transaction():
+        execute(
+            """
+            INSERT INTO twitter_data (
+              server_id,
+              twitter_notification_text,
+              twitter_notification_channel,
+              updated_at
+            )
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(server_id)
+            DO UPDATE SET
+              twitter_notification_text = excluded.twitter_notification_text,
+              twitter_notification_channel = excluded.twitter_notification_channel,
+              updated_at = excluded.updated_at
+            """,
+            (
+                server_id,
+                normalized["twitter_notification_text"],
+                normalized["twitter_notification_channel"],
+                stamp,
+            ),
         )
-        VALUES (?, ?, ?, ?)
-        ON CONFLICT(server_id)
-        DO UPDATE SET
-          twitter_notification_text = excluded.twitter_notification_text,
-          twitter_notification_channel = excluded.twitter_notification_channel,
-          updated_at = excluded.updated_at
+        _sync_twitter_subscriptions(server_id, normalized["twitter_accounts"], stamp)
+    _notify_subscription_listeners(
+        "twitter",
+        guild_id,
+        list(normalized["twitter_accounts"]),
+        normalized["twitter_notification_channel"],
+        normalized["twitter_notification_text"],
+        DEFAULT_TWITTER_TEXT,
+    )
+    return normalized
+
+
+def _youtube_follower(guild_id: int, row: Any) -> Dict[str, Any]:
+    text = row["youtube_notification_text"]
+    youtuber_id = str(row["youtuber_id"])
+    return {
+        "guild_id": guild_id,
+        "name": row["channel_name"] if isinstance(row["channel_name"], str) else youtuber_id,
+        "videoId": row["video_id"] if isinstance(row["video_id"], str) else "",
+        "streamId": row["stream_id"] if isinstance(row["stream_id"], str) else "",
+        "shortId": row["short_id"] if isinstance(row["short_id"], str) else "",
+        "youtube_notification_channel": _notification_channel(row["youtube_notification_channel"]),
+        "youtube_notification_text": text if isinstance(text, str) and text else DEFAULT_YOUTUBE_TEXT,
+    }
+
+
+def load_youtube_followers(channel_ids: list[str] | None = None) -> Dict[str, list[Dict[str, Any]]]:
+    """Return the subscribing guilds of every YouTube channel (or just ``channel_ids``) in one query.
+
+    Each follower carries the guild id, its stored latest ids for the channel
+    and the guild's notification channel and text.
+    """
+    _ensure_split_tables_schema()
+    sql = """
+        SELECT
+          s.youtuber_id,
+          s.server_id,
+          s.channel_name,
+          s.video_id,
+          s.stream_id,
+          s.short_id,
+          d.youtube_notification_channel,
+          d.youtube_notification_text
+        FROM youtube_subscriptions s
+        LEFT JOIN youtube_data d ON d.server_id = s.server_id
+    """
+    params: list[str] = []
+    if channel_ids is not None:
+        if not channel_ids:
+            return {}
+        sql += f" WHERE s.youtuber_id IN ({', '.join('?' for _ in channel_ids)})"
+        params = list(channel_ids)
+    return _group_followers(fetchall(sql, params), "youtuber_id", _youtube_follower)
+
+
+def record_youtube_video(channel_id: str, video_kind: str, video_id: str, channel_name: str = "") -> None:
+    """Store ``video_id`` as the latest video/short/stream of ``channel_id`` for every subscribing guild."""
+    _ensure_split_tables_schema()
+    column = {"short": "short_id", "stream": "stream_id"}.get(video_kind, "video_id")
+    execute(
+        f"""
+        UPDATE youtube_subscriptions
+        SET {column} = ?, channel_name = COALESCE(NULLIF(?, ''), channel_name), updated_at = ?
+        WHERE youtuber_id = ?
         """,
-        (
-            server_id,
-            normalized["twitter_notification_text"],
-            normalized["twitter_notification_channel"],
-            stamp,
-        ),
+        (video_id, channel_name, now_ts(), channel_id),
     )
 
-    _replace_twitter_subscriptions(server_id, normalized["twitter_accounts"], stamp)
-    return normalized
+
+def _twitter_follower(guild_id: int, row: Any) -> Dict[str, Any]:
+    text = row["twitter_notification_text"]
+    account_id = str(row["account_id"])
+    return {
+        "guild_id": guild_id,
+        "name": row["display_name"] if isinstance(row["display_name"], str) else account_id,
+        "tweetId": row["tweet_id"] if isinstance(row["tweet_id"], str) else "",
+        "twitter_notification_channel": _notification_channel(row["twitter_notification_channel"]),
+        "twitter_notification_text": text if isinstance(text, str) and text else DEFAULT_TWITTER_TEXT,
+    }
+
+
+def load_twitter_followers() -> Dict[str, list[Dict[str, Any]]]:
+    """Return the subscribing guilds of every Twitter handle in one query, keyed by handle."""
+    _ensure_split_tables_schema()
+    rows = fetchall(
+        """
+        SELECT
+          s.account_id,
+          s.server_id,
+          s.display_name,
+          s.tweet_id,
+          d.twitter_notification_channel,
+          d.twitter_notification_text
+        FROM twitter_subscriptions s
+        LEFT JOIN twitter_data d ON d.server_id = s.server_id
+        """
+    )
+    return _group_followers(rows, "account_id", _twitter_follower)
+
+
+def record_twitter_post(handle: str, tweet_id: str, display_name: str = "") -> None:
+    """Store ``tweet_id`` as the latest post of ``handle`` for every subscribing guild."""
+    _ensure_split_tables_schema()
+    execute(
+        """
+        UPDATE twitter_subscriptions
+        SET tweet_id = ?, display_name = COALESCE(NULLIF(?, ''), display_name), updated_at = ?
+        WHERE account_id = ?
+        """,
+        (tweet_id, display_name, now_ts(), handle),
+    )
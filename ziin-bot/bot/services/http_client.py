@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import random
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Mapping
+
+import aiohttp
+
+from bot.services.rate_limit import RateGovernor
+
+logger = logging.getLogger("__main__")
+_DEBUG_HTTP = os.getenv("DEBUG_HTTP", "0") == "1"
+
+# Statuses worth another attempt; anything else (including 304 and 403 quota errors) goes back to the caller.
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_RETRY_ERRORS = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError)
+# A Retry-After longer than this is not waited out inline; the response is returned instead.
+_MAX_RETRY_AFTER_SECONDS = 30.0
+_BACKOFF_BASE_SECONDS = 0.5
+_BACKOFF_CAP_SECONDS = 8.0
+
+
+def _debug_http(message: str) -> None:
+    if _DEBUG_HTTP:
+        logger.info("[http] %s", message)
+
+
+class HttpStatusError(Exception):
+    """Raised by ``HttpResponse.raise_for_status`` for 4xx/5xx responses."""
+
+    def __init__(self, response: HttpResponse) -> None:
+        super().__init__(f"HTTP {response.status} for {response.url}")
+        self.response = response
+        self.status = response.status
+
+
+@dataclass
+class HttpResponse:
+    """A fully read response; the connection is already back in the pool."""
+
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+    url: str
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    def json(self) -> Any:
+        return json.loads(self.body) if self.body else None
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise HttpStatusError(self)
+
+
+def _retry_after(headers: Mapping[str, str]) -> float:
+    try:
+        return max(0.0, float(headers.get("Retry-After") or 0))
+    except ValueError:
+        return 0.0
+
+
+class HttpClient:
+    """One pooled aiohttp session shared by every cog that calls a third-party API.
+
+    Connections are kept alive and pooled per host. Each request names a
+    ``provider`` ("twitch", "youtube", ...) and waits for one of that
+    provider's concurrency slots. Connection errors, timeouts, 429s and 5xx
+    responses are retried with jittered exponential backoff, honouring a short
+    Retry-After. With a ``governor``, every attempt first takes a token from
+    the provider's bucket (raising ``RateLimited`` when it would wait too
+    long) and every response is reported back to it. The session is created
+    on first use and closed with the bot.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float = 20.0,
+        retries: int = 2,
+        limits: Mapping[str, int] | None = None,
+        default_limit: int = 4,
+        pool_size: int = 100,
+        per_host: int = 10,
+        keepalive_seconds: float = 30.0,
+        governor: RateGovernor | None = None,
+    ) -> None:
+        self.timeout = timeout
+        self.retries = retries
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self.pool_size = pool_size
+        self.per_host = per_host
+        self.keepalive_seconds = keepalive_seconds
+        self.governor = governor
+        self._session: aiohttp.ClientSession | None = None
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size,
+                limit_per_host=self.per_host,
+                ttl_dns_cache=300,
+                keepalive_timeout=self.keepalive_seconds,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout, connect=min(10.0, self.timeout)),
+            )
+        return self._session
+
+    def _slot(self, provider: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(provider)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max(1, self.limits.get(provider, self.default_limit)))
+            self._semaphores[provider] = semaphore
+        return semaphore
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _backoff(self, attempt: int) -> float:
+        return min(_BACKOFF_CAP_SECONDS, _BACKOFF_BASE_SECONDS * 2**attempt) * random.uniform(0.5, 1.0)
+
+    def _status_delay(
+        self, provider: str, status: int, headers: Mapping[str, str], attempt: int, retries: int
+    ) -> float | None:
+        """Return how long to wait before retrying a response with ``status``, or None to hand it back."""
+        if status not in _RETRY_STATUSES or attempt >= retries:
+            return None
+        retry_after = _retry_after(headers)
+        if retry_after > _MAX_RETRY_AFTER_SECONDS:
+            return None
+        if self.governor is not None and self.governor.governs(provider):
+            retry_after = 0.0  # the governor holds the next attempt back, or defers it
+        return max(retry_after, self._backoff(attempt))
+
+    def _options(self, timeout: float | None, kwargs: dict[str, Any]) -> dict[str, Any]:
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout, connect=min(10.0, timeout))
+        return kwargs
+
+    async def _acquire(self, provider: str) -> None:
+        if self.governor is not None:
+            await self.governor.acquire(provider)
+
+    def _observe(self, provider: str, status: int, headers: Mapping[str, str]) -> None:
+        if self.governor is not None:
+            self.governor.observe(provider, status, headers)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        provider: str = "default",
+        timeout: float | None = None,
+        retries: int | None = None,
+        **kwargs: Any,
+    ) -> HttpResponse:
+        """Send a request and read the whole body; ``kwargs`` go to ``aiohttp.ClientSession.request``.
+
+        Raises the last connection error once retries run out, or
+        ``RateLimited`` when the governor defers the request; error statuses
+        are returned, not raised.
+        """
+        retries = self.retries if retries is None else retries
+        options = self._options(timeout, kwargs)
+        attempt = 0
+        while True:
+            await self._acquire(provider)
+            try:
+                async with self._slot(provider):
+                    async with self._get_session().request(method, url, **options) as raw:
+                        response = HttpResponse(raw.status, raw.headers, await raw.read(), str(raw.url))
+            except _RETRY_ERRORS as exc:
+                if attempt >= retries:
+                    raise
+                delay = self._backoff(attempt)
+                _debug_http(f"{provider} {method} {url} failed error={exc!r}; retry in {delay:.1f}s")
+            else:
+                self._observe(provider, response.status, response.headers)
+                delay = self._status_delay(provider, response.status, response.headers, attempt, retries)
+                if delay is None:
+                    return response
+                _debug_http(f"{provider} {method} {url} status={response.status}; retry in {delay:.1f}s")
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def get(self, url: str, **kwargs: Any) -> HttpResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> HttpResponse:
+        return await self.request("POST", url, **kwargs)
+
+    def ws_connect(self, url: str, **kwargs: Any) -> Any:
+        """Open a WebSocket on the pooled session; use as ``async with``. No slots or retries apply."""
+        return self._get_session().ws_connect(url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        url: str,
+        *,
+        provider: str = "default",
+        timeout: float | None = None,
+        retries: int | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """GET ``url`` and yield the open response so the body can be read incrementally.
+
+        Retries cover connecting and the status line only; the provider slot
+        is held until the block exits.
+        """
+        retries = self.retries if retries is None else retries
+        options = self._options(timeout, kwargs)
+        attempt = 0
+        while True:
+            await self._acquire(provider)
+            async with self._slot(provider):
+                try:
+                    raw = await self._get_session().get(url, **options)
+                except _RETRY_ERRORS as exc:
+                    if attempt >= retries:
+                        raise
+                    delay = self._backoff(attempt)
+                    _debug_http(f"{provider} GET {url} failed error={exc!r}; retry in {delay:.1f}s")
+                else:
+                    self._observe(provider, raw.status, raw.headers)
+                    delay = self._status_delay(provider, raw.status, raw.headers, attempt, retries)
+                    if delay is None:
+                        try:
+                            yield raw
+                        finally:
+                            raw.release()
+                        return
+                    raw.release()
+                    _debug_http(f"{provider} GET {url} status={raw.status}; retry in {delay:.1f}s")
+            attempt += 1
+            await asyncio.sleep(delay)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import AsyncIterator, Awaitable, Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def poll_concurrently(
+    items: Iterable[T],
+    fetch: Callable[[T], Awaitable[R]],
+    *,
+    concurrency: int,
+    deadline: float,
+) -> AsyncIterator[tuple[T, R | None, Exception | None]]:
+    """Run ``fetch`` over ``items`` with at most ``concurrency`` in flight.
+
+    Yields ``(item, result, error)`` as each fetch finishes, so the caller can
+    announce early results while slower ones are still running. Items start
+    in order. ``deadline`` bounds the fetch work only: time the caller spends
+    handling a yielded result does not count against it. Once it runs out
+    nothing new starts and fetches still in flight are cancelled; their items
+    are not yielded, and callers leave them due for the next cycle. Fetches
+    that already finished are still yielded.
+    """
+    pending = iter(items)
+    results: asyncio.Queue[tuple[T, R | None, Exception | None] | None] = asyncio.Queue()
+    stop_at = time.monotonic() + deadline
+
+    async def worker() -> None:
+        for item in pending:
+            if time.monotonic() >= stop_at:
+                break
+            try:
+                value = await fetch(item)
+            except Exception as exc:
+                results.put_nowait((item, None, exc))
+            else:
+                results.put_nowait((item, value, None))
+        results.put_nowait(None)
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+    running = len(workers)
+    try:
+        while running:
+            remaining = stop_at - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                entry = await asyncio.wait_for(results.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            if entry is None:
+                running -= 1
+                continue
+            handed_at = time.monotonic()
+            yield entry
+            stop_at += time.monotonic() - handed_at
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+    while not results.empty():
+        entry = results.get_nowait()
+        if entry is not None:
+            yield entry
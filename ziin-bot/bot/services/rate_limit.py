@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Mapping
+
+logger = logging.getLogger("__main__")
+_DEBUG_RATE_LIMIT = os.getenv("DEBUG_RATE_LIMIT", "0") == "1"
+
+# A 429 without Retry-After or Ratelimit-Reset blocks the provider this long.
+_DEFAULT_PENALTY_SECONDS = 60.0
+
+
+def _debug_rate_limit(message: str) -> None:
+    if _DEBUG_RATE_LIMIT:
+        logger.info("[rate-limit] %s", message)
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> float | None:
+    try:
+        return float(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class RateLimited(Exception):
+    """A request was not sent because the provider's budget would not allow it soon enough."""
+
+    def __init__(self, provider: str, wait: float) -> None:
+        super().__init__(f"{provider} rate limited for {wait:.1f}s")
+        self.provider = provider
+        self.wait = wait
+
+
+class TokenBucket:
+    """Refills ``rate`` tokens per second up to ``capacity``.
+
+    Tokens may go negative: each reservation queues behind the ones before it
+    and waits ``-tokens / rate`` seconds. ``blocked_until`` holds every
+    request back after the provider said stop.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, now: float | None = None) -> float:
+        """Seconds until a new reservation could be sent."""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        shortfall = max(0.0, 1 - self.tokens) / self.rate
+        return max(shortfall, self.blocked_until - now)
+
+    def reserve(self, max_wait: float) -> float | None:
+        """Take a token and return how long to wait before using it, or None if that exceeds ``max_wait``."""
+        now = time.monotonic()
+        wait = self.wait_time(now)
+        if wait > max_wait:
+            return None
+        self.tokens -= 1
+        return wait
+
+    def sync(self, remaining: float, reset_in: float | None) -> None:
+        """Trust the provider's count of remaining requests when it is lower than ours."""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = min(self.tokens, remaining)
+        if remaining <= 0 and reset_in:
+            self.block(reset_in)
+
+    def block(self, seconds: float) -> None:
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+
+class RateGovernor:
+    """Per-provider token buckets fed by what the APIs report back.
+
+    ``HttpClient`` calls ``acquire`` before every attempt and ``observe``
+    after every response. Twitch ``Ratelimit-Remaining``/``Ratelimit-Reset``
+    headers pull the bucket down to the server's count, and a 429 blocks
+    the provider for its Retry-After. Quota errors that only show up in the
+    body (YouTube) are reported through ``penalize``. Pollers ask
+    ``deferral`` before a batch and leave the work for later instead of
+    sending requests that would fail.
+
+    Counters per provider: ``throttled`` requests waited for a token,
+    ``deferred`` requests or sources were put off, ``rejected`` responses
+    were the provider refusing us.
+    """
+
+    def __init__(self, limits: Mapping[str, float], *, burst_seconds: float = 10.0, max_wait: float = 10.0) -> None:
+        """``limits`` maps provider -> requests per minute; buckets hold ``burst_seconds`` worth of requests."""
+        self.max_wait = max_wait
+        self._buckets = {
+            provider: TokenBucket(per_minute / 60, max(1.0, per_minute / 60 * burst_seconds))
+            for provider, per_minute in limits.items()
+        }
+        self._counters: dict[str, dict[str, int]] = {}
+
+    def _count(self, provider: str, counter: str, amount: int = 1) -> None:
+        counters = self._counters.setdefault(provider, {"throttled": 0, "deferred": 0, "rejected": 0})
+        counters[counter] += amount
+
+    def governs(self, provider: str) -> bool:
+        return provider in self._buckets
+
+    async def acquire(self, provider: str) -> None:
+        """Wait for a token; raise ``RateLimited`` instead when that would take longer than ``max_wait``."""
+        bucket = self._buckets.get(provider)
+        if bucket is None:
+            return
+        wait = bucket.reserve(self.max_wait)
+        if wait is None:
+            self._count(provider, "deferred")
+            raise RateLimited(provider, bucket.wait_time())
+        if wait > 0:
+            self._count(provider, "throttled")
+            await asyncio.sleep(wait)
+
+    def observe(self, provider: str, status: int, headers: Mapping[str, str]) -> None:
+        bucket = self._buckets.get(provider)
+        if bucket is None:
+            return
+        reset_at = _header_float(headers, "Ratelimit-Reset")
+        reset_in = max(0.0, reset_at - time.time()) if reset_at else None
+        remaining = _header_float(headers, "Ratelimit-Remaining")
+        if remaining is not None:
+            bucket.sync(remaining, reset_in)
+        if status != 429:
+            return
+        if remaining:
+            # Budget left, so the 429 is some other cap (e.g. EventSub subscriptions), not our rate.
+            self._count(provider, "rejected")
+            return
+        retry_after = _header_float(headers, "Retry-After")
+        self.penalize(provider, retry_after or reset_in or _DEFAULT_PENALTY_SECONDS)
+
+    def penalize(self, provider: str, seconds: float) -> None:
+        """Record a rejection and hold ``provider`` back for ``seconds``."""
+        self._count(provider, "rejected")
+        bucket = self._buckets.get(provider)
+        if bucket is not None:
+            bucket.block(seconds)
+        _debug_rate_limit(f"{provider} rejected; holding off {seconds:.0f}s")
+
+    def deferral(self, provider: str, sources: int) -> float:
+        """Return how long ``provider`` is blocked, counting ``sources`` as deferred when it is."""
+        bucket = self._buckets.get(provider)
+        if bucket is None:
+            return 0.0
+        blocked = max(0.0, bucket.blocked_until - time.monotonic())
+        if blocked:
+            self._count(provider, "deferred", sources)
+        return blocked
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        now = time.monotonic()
+        report: Dict[str, Dict[str, Any]] = {}
+        for provider, bucket in self._buckets.items():
+            bucket._refill(now)
+            report[provider] = {
+                **self._counters.get(provider, {"throttled": 0, "deferred": 0, "rejected": 0}),
+                "tokens": max(0.0, bucket.tokens),
+                "blocked_for": max(0.0, bucket.blocked_until - now),
+            }
+        return report
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import math
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Mapping
+
+logger = logging.getLogger("__main__")
+_DEBUG_SCHEDULER = os.getenv("DEBUG_SCHEDULER", "0") == "1"
+
+# ``run(sources)`` returns source -> True (checked) / False (failed); sources left out were not reached.
+BatchRunner = Callable[[list[str]], Awaitable[Mapping[str, bool]]]
+# ``sources()`` returns every source the provider should poll, mapped to its interval in seconds.
+SourceLister = Callable[[], Awaitable[Mapping[str, float]]]
+
+# Sources a batch did not reach (deadline, quota) are retried this soon, without counting a failure.
+_RETRY_SECONDS = 30.0
+_MAX_IDLE_SECONDS = 30.0
+
+
+def _debug_scheduler(message: str) -> None:
+    if _DEBUG_SCHEDULER:
+        logger.info("[scheduler] %s", message)
+
+
+@dataclass
+class _Job:
+    interval: float
+    due_at: float | None = None  # None while waiting in ``ready`` or running
+    last_run_at: float = 0.0
+    failures: int = 0
+
+
+@dataclass
+class _Provider:
+    run: BatchRunner
+    sources: SourceLister
+    jitter: float
+    coalesce: float
+    max_batch: int
+    max_backoff: float
+    first_due: Callable[[str], float] | None
+    jobs: dict[str, _Job] = field(default_factory=dict)
+    # Due sources waiting for the provider's next batch, in the order they came due.
+    ready: dict[str, None] = field(default_factory=dict)
+    task: asyncio.Task | None = None
+    paused_until: float | None = None
+    refreshed_at: float = 0.0
+
+
+class PollScheduler:
+    """One timer for every notifier cog.
+
+    Each cog registers a provider with a ``sources()`` lister and a batch
+    ``run(sources)`` callback. The scheduler keeps a heap of
+    ``(next_due, provider, source)``. Due sources are handed to their
+    provider in batches, one batch in flight per provider, and each source
+    is rescheduled at its own interval with jitter, so work spreads out
+    instead of starting together every cycle. ``coalesce`` pulls a
+    provider's sources that are due within that many seconds into the same
+    batch, for APIs that bill per request. Failed sources back off
+    exponentially up to ``max_backoff``. Providers can be paused, for a
+    while or until resumed, and sources are re-listed every
+    ``refresh_seconds``.
+    """
+
+    def __init__(self, *, refresh_seconds: float = 30.0) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._providers: dict[str, _Provider] = {}
+        self._heap: list[tuple[float, str, str]] = []
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        tasks = [entry.task for entry in self._providers.values() if entry.task is not None]
+        if self._task is not None:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def register(
+        self,
+        provider: str,
+        run: BatchRunner,
+        sources: SourceLister,
+        *,
+        jitter: float = 0.2,
+        coalesce: float = 0.0,
+        max_batch: int = 500,
+        max_backoff: float = 1800.0,
+        first_due: Callable[[str], float] | None = None,
+    ) -> None:
+        """Add or replace ``provider``; re-registering keeps its schedule, pause state and running batch.
+
+        ``first_due(source)`` may return a timestamp for sources seen for the
+        first time, e.g. a next check persisted before a restart.
+        """
+        entry = _Provider(run, sources, jitter, coalesce, max_batch, max_backoff, first_due)
+        existing = self._providers.get(provider)
+        if existing is not None:
+            entry.jobs, entry.ready, entry.task, entry.paused_until = (
+                existing.jobs,
+                existing.ready,
+                existing.task,
+                existing.paused_until,
+            )
+        self._providers[provider] = entry
+        self._wakeup.set()
+
+    def unregister(self, provider: str) -> None:
+        entry = self._providers.pop(provider, None)
+        if entry is not None and entry.task is not None:
+            entry.task.cancel()
+
+    def pause(self, provider: str, seconds: float | None = None) -> bool:
+        """Stop starting batches for ``provider`` for ``seconds``, or until ``resume`` when None."""
+        entry = self._providers.get(provider)
+        if entry is None:
+            return False
+        entry.paused_until = math.inf if seconds is None else time.time() + seconds
+        _debug_scheduler(f"paused {provider} for {'ever' if seconds is None else f'{seconds:.0f}s'}")
+        return True
+
+    def resume(self, provider: str) -> bool:
+        entry = self._providers.get(provider)
+        if entry is None:
+            return False
+        entry.paused_until = None
+        self._wakeup.set()
+        return True
+
+    def wake(self, provider: str) -> None:
+        """Make every scheduled source of ``provider`` due now."""
+        entry = self._providers.get(provider)
+        if entry is None:
+            return
+        now = time.time()
+        for source, job in entry.jobs.items():
+            if job.due_at is not None:
+                self._schedule(provider, source, job, now)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        now = time.time()
+        report: Dict[str, Dict[str, Any]] = {}
+        for provider, entry in self._providers.items():
+            upcoming = [job.due_at for job in entry.jobs.values() if job.due_at is not None]
+            paused = entry.paused_until is not None and entry.paused_until > now
+            report[provider] = {
+                "sources": len(entry.jobs),
+                "ready": len(entry.ready),
+                "running": entry.task is not None,
+                "failing": sum(1 for job in entry.jobs.values() if job.failures),
+                "paused_for": (entry.paused_until - now) if paused else 0.0,
+                "next_due_in": max(0.0, min(upcoming) - now) if upcoming else None,
+            }
+        return report
+
+    def _schedule(self, provider: str, source: str, job: _Job, due_at: float) -> None:
+        job.due_at = due_at
+        heapq.heappush(self._heap, (due_at, provider, source))
+        self._wakeup.set()
+
+    @staticmethod
+    def _jittered(entry: _Provider, seconds: float) -> float:
+        return seconds * random.uniform(1 - entry.jitter / 2, 1 + entry.jitter / 2)
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                await self._refresh_sources()
+                now = time.time()
+                self._collect_due(now)
+                self._dispatch(now)
+                delay = self._next_wakeup(now)
+            except Exception:
+                logger.exception("poll scheduler tick failed")
+                delay = 1.0
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _refresh_sources(self) -> None:
+        for provider, entry in list(self._providers.items()):
+            now = time.time()
+            if now - entry.refreshed_at < self.refresh_seconds:
+                continue
+            entry.refreshed_at = now
+            try:
+                wanted = dict(await entry.sources())
+            except Exception as exc:
+                _debug_scheduler(f"listing {provider} sources failed error={exc!r}")
+                continue
+
+            for source in set(entry.jobs) - set(wanted):
+                del entry.jobs[source]
+                entry.ready.pop(source, None)
+            for source, interval in wanted.items():
+                job = entry.jobs.get(source)
+                if job is None:
+                    job = entry.jobs[source] = _Job(interval)
+                    first_due = max(now, entry.first_due(source) if entry.first_due else 0.0)
+                    # New sources are spread over the jitter band instead of all starting at once.
+                    self._schedule(provider, source, job, first_due + random.uniform(0, entry.jitter * interval))
+                elif job.interval != interval:
+                    job.interval = interval
+                    if job.due_at is not None and job.last_run_at and job.last_run_at + interval < job.due_at:
+                        self._schedule(provider, source, job, max(now, job.last_run_at + interval))
+
+    def _collect_due(self, now: float) -> None:
+        horizon = max((entry.coalesce for entry in self._providers.values()), default=0.0)
+        candidates: list[tuple[float, str, str]] = []
+        while self._heap and self._heap[0][0] <= now + horizon:
+            item = heapq.heappop(self._heap)
+            entry = self._providers.get(item[1])
+            job = entry.jobs.get(item[2]) if entry is not None else None
+            if job is not None and job.due_at == item[0]:
+                candidates.append(item)
+
+        # Coalescing only rides along with a provider that already has something due.
+        due_providers = {provider for due_at, provider, _ in candidates if due_at <= now}
+        for due_at, provider, source in candidates:
+            entry = self._providers[provider]
+            if due_at <= now or (provider in due_providers and due_at <= now + entry.coalesce):
+                entry.jobs[source].due_at = None
+                entry.ready[source] = None
+            else:
+                heapq.heappush(self._heap, (due_at, provider, source))
+
+    def _dispatch(self, now: float) -> None:
+        for provider, entry in self._providers.items():
+            if entry.paused_until is not None:
+                if now < entry.paused_until:
+                    continue
+                entry.paused_until = None
+                _debug_scheduler(f"resumed {provider}")
+            if entry.task is not None or not entry.ready:
+                continue
+            batch = list(entry.ready)[: entry.max_batch]
+            for source in batch:
+                del entry.ready[source]
+            entry.task = asyncio.create_task(self._run_batch(provider, entry, batch))
+
+    def _next_wakeup(self, now: float) -> float:
+        wake_at = now + _MAX_IDLE_SECONDS
+        if self._heap:
+            wake_at = min(wake_at, self._heap[0][0])
+        for entry in self._providers.values():
+            wake_at = min(wake_at, entry.refreshed_at + self.refresh_seconds)
+            if entry.ready and entry.paused_until is not None:
+                wake_at = min(wake_at, entry.paused_until)
+        return max(0.0, wake_at - now)
+
+    async def _run_batch(self, provider: str, entry: _Provider, batch: list[str]) -> None:
+        _debug_scheduler(f"{provider} batch of {len(batch)}")
+        try:
+            try:
+                results = await entry.run(batch)
+            except Exception as exc:
+                _debug_scheduler(f"{provider} batch failed error={exc!r}")
+                results = dict.fromkeys(batch, False)
+
+            now = time.time()
+            for source in batch:
+                job = entry.jobs.get(source)
+                if job is None:
+                    continue  # unsubscribed while the batch ran
+                outcome = results.get(source)
+                if outcome is None:
+                    delay = min(job.interval, _RETRY_SECONDS)
+                elif outcome:
+                    job.failures = 0
+                    job.last_run_at = now
+                    delay = job.interval
+                else:
+                    job.failures += 1
+                    job.last_run_at = now
+                    delay = max(job.interval, min(entry.max_backoff, job.interval * 2 ** min(job.failures, 10)))
+                self._schedule(provider, source, job, now + self._jittered(entry, delay))
+        finally:
+            for owner in (entry, self._providers.get(provider)):
+                if owner is not None and owner.task is asyncio.current_task():
+                    owner.task = None
+            self._wakeup.set()
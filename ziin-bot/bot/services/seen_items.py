@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from bot.services.storage import execute, executemany, fetchall, now_ts
+
+_SCHEMA_READY = False
+
+# Row-value IN lists are chunked to stay well under SQLite's bound-parameter limit.
+_LOOKUP_CHUNK = 400
+
+
+def _ensure_seen_items_schema() -> None:
+    global _SCHEMA_READY
+    if _SCHEMA_READY:
+        return
+
+    execute(
+        """
+        CREATE TABLE IF NOT EXISTS seen_items (
+          provider TEXT NOT NULL,
+          source_id TEXT NOT NULL,
+          item_id TEXT NOT NULL,
+          seen_at INTEGER NOT NULL
+        )
+        """
+    )
+    execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_seen_items_item ON seen_items(provider, source_id, item_id)")
+    execute("CREATE INDEX IF NOT EXISTS idx_seen_items_age ON seen_items(provider, source_id, seen_at)")
+    _SCHEMA_READY = True
+
+
+def filter_unseen(provider: str, candidates: dict[str, list[str]]) -> dict[str, list[str]]:
+    """Return ``candidates`` (source id -> item ids) without the items already seen, keeping order.
+
+    Sources left with nothing new are dropped from the result.
+    """
+    _ensure_seen_items_schema()
+    pairs = [(source_id, item_id) for source_id, item_ids in candidates.items() for item_id in item_ids if item_id]
+    seen: set[tuple[str, str]] = set()
+    for start in range(0, len(pairs), _LOOKUP_CHUNK):
+        chunk = pairs[start : start + _LOOKUP_CHUNK]
+        placeholders = ", ".join("(?, ?)" for _ in chunk)
+        params: list[str] = [provider]
+        for source_id, item_id in chunk:
+            params.extend((source_id, item_id))
+        rows = fetchall(
+            f"SELECT source_id, item_id FROM seen_items WHERE provider = ? AND (source_id, item_id) IN (VALUES {placeholders})",
+            params,
+        )
+        seen.update((str(row["source_id"]), str(row["item_id"])) for row in rows)
+
+    unseen: dict[str, list[str]] = {}
+    for source_id, item_ids in candidates.items():
+        fresh = [item_id for item_id in dict.fromkeys(item_ids) if item_id and (source_id, item_id) not in seen]
+        if fresh:
+            unseen[source_id] = fresh
+    return unseen
+
+
+def mark_seen(provider: str, items: Iterable[tuple[str, str]], seen_at: int | None = None) -> None:
+    """Record ``(source_id, item_id)`` pairs as seen; pairs already recorded keep their first timestamp."""
+    _ensure_seen_items_schema()
+    stamp = now_ts() if seen_at is None else seen_at
+    rows = [(provider, source_id, item_id, stamp) for source_id, item_id in items if source_id and item_id]
+    if rows:
+        executemany(
+            "INSERT OR IGNORE INTO seen_items (provider, source_id, item_id, seen_at) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+
+
+def prune_seen_items(provider: str, max_age_seconds: int, max_per_source: int, keep_per_source: int = 5) -> int:
+    """Drop old entries for ``provider`` and return how many rows were removed.
+
+    Each source keeps at most ``max_per_source`` entries, and entries older than
+    ``max_age_seconds`` go too, except the newest ``keep_per_source``: a channel
+    that has not posted in months still has to recognise its latest item.
+    """
+    _ensure_seen_items_schema()
+    cutoff = now_ts() - max_age_seconds
+    keep_per_source = min(keep_per_source, max_per_source)
+    doomed = fetchall(
+        """
+        SELECT rowid
+        FROM (
+          SELECT
+            rowid,
+            seen_at,
+            ROW_NUMBER() OVER (PARTITION BY source_id ORDER BY seen_at DESC, rowid DESC) AS position
+          FROM seen_items
+          WHERE provider = ?
+        )
+        WHERE position > ? OR (position > ? AND seen_at < ?)
+        """,
+        (provider, max_per_source, keep_per_source, cutoff),
+    )
+    if doomed:
+        executemany("DELETE FROM seen_items WHERE rowid = ?", [(row["rowid"],) for row in doomed])
+    return len(doomed)
@@ -4,12 +4,15 @@ import logging
 import os
 import sqlite3
 import time
+from contextlib import contextmanager
 from pathlib import Path
 from threading import RLock
-from typing import Any, Iterable, Optional
+from typing import Any, Iterable, Iterator, Optional
 
 _conn: Optional[sqlite3.Connection] = None
 _lock = RLock()
+# Nesting depth of transaction(); writes inside one are committed together when the outermost exits.
+_tx_depth = 0
 logger = logging.getLogger("__main__")
 _DEBUG_SQL = os.getenv("DEBUG_SQL", "0") == "1"
 
@@ -159,6 +162,12 @@ def is_storage_ready() -> bool:
     return _conn is not None
 
 
+def data_version() -> int:
+    """SQLite's PRAGMA data_version: changes whenever another connection commits to the database."""
+    row = fetchone("PRAGMA data_version")
+    return int(row[0]) if row is not None else 0
+
+
 def now_ts() -> int:
     return int(time.time())
 
@@ -177,9 +186,40 @@ def fetchall(sql: str, params: Iterable[Any] = ()) -> list[sqlite3.Row]:
         return cur.fetchall()
 
 
+@contextmanager
+def transaction() -> Iterator[None]:
+    """Group the execute/executemany calls in the block into one commit, rolled back on error.
+
+    Nested blocks join the outermost one. Do not await inside the block: the
+    lock is held for its whole duration.
+    """
+    global _tx_depth
+    conn = get_db()
+    with _lock:
+        _tx_depth += 1
+        try:
+            yield
+        except BaseException:
+            _tx_depth -= 1
+            if _tx_depth == 0:
+                conn.rollback()
+            raise
+        _tx_depth -= 1
+        if _tx_depth == 0:
+            conn.commit()
+
+
 def execute(sql: str, params: Iterable[Any] = ()) -> None:
     conn = get_db()
     with _lock:
         conn.execute(sql, tuple(params))
-        conn.commit()
+        if not _tx_depth:
+            conn.commit()
 
+
+def executemany(sql: str, rows: Iterable[Iterable[Any]]) -> None:
+    conn = get_db()
+    with _lock:
+        conn.executemany(sql, [tuple(row) for row in rows])
+        if not _tx_depth:
+            conn.commit()
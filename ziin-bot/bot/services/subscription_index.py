@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import logging
+import os
+from typing import Any, Callable, Dict
+
+from bot.services.channel_data import (
+    add_subscription_listener,
+    load_twitch_followers,
+    load_twitter_followers,
+    load_youtube_followers,
+    subscription_watermark,
+)
+from bot.services.storage import data_version, now_ts
+
+logger = logging.getLogger("__main__")
+_DEBUG_SUBSCRIPTIONS = os.getenv("DEBUG_SUBSCRIPTIONS", "0") == "1"
+
+# provider -> (bulk follower loader, notification channel key, notification text key)
+_PROVIDERS: dict[str, tuple[Callable[[], Dict[str, list[Dict[str, Any]]]], str, str]] = {
+    "twitch": (load_twitch_followers, "twitch_notification_channel", "twitch_notification_text"),
+    "youtube": (load_youtube_followers, "youtube_notification_channel", "youtube_notification_text"),
+    "twitter": (load_twitter_followers, "twitter_notification_channel", "twitter_notification_text"),
+}
+
+
+def _debug_subscriptions(message: str) -> None:
+    if _DEBUG_SUBSCRIPTIONS:
+        logger.info("[subscriptions] %s", message)
+
+
+class SubscriptionIndex:
+    """In-memory reverse index from an external source to the guilds following it.
+
+    Sources are Twitch logins, YouTube channel ids and Twitter handles; each
+    maps to the subscribing guild ids, and each guild to its notification
+    channel and text per provider. It is loaded with one query per provider.
+    Saves made through channel_data update it in place. Writes from other
+    connections (the web dashboard) are picked up by ``sync()``: once SQLite's
+    data_version moves, it reloads only the providers whose settings
+    watermark moved too.
+    """
+
+    def __init__(self) -> None:
+        self._sources: dict[str, dict[str, set[int]]] = {provider: {} for provider in _PROVIDERS}
+        self._guild_sources: dict[str, dict[int, set[str]]] = {provider: {} for provider in _PROVIDERS}
+        self._targets: dict[str, dict[int, dict[str, Any]]] = {provider: {} for provider in _PROVIDERS}
+        self._data_version: int | None = None
+        # provider -> (watermark, when it was read)
+        self._watermarks: dict[str, tuple[tuple[int, int], int]] = {}
+        add_subscription_listener(self._on_guild_saved)
+
+    def refresh(self, providers: list[str] | None = None) -> None:
+        # Read the versions first so a commit landing mid-load triggers another reload.
+        self._data_version = data_version()
+        for provider in providers or list(_PROVIDERS):
+            loader, channel_key, text_key = _PROVIDERS[provider]
+            self._watermarks[provider] = (subscription_watermark(provider), now_ts())
+            sources: dict[str, set[int]] = {}
+            guild_sources: dict[int, set[str]] = {}
+            targets: dict[int, dict[str, Any]] = {}
+            for source, followers in loader().items():
+                for follower in followers:
+                    guild_id = follower["guild_id"]
+                    sources.setdefault(source, set()).add(guild_id)
+                    guild_sources.setdefault(guild_id, set()).add(source)
+                    targets[guild_id] = {"channel": follower[channel_key], "text": follower[text_key]}
+            self._sources[provider] = sources
+            self._guild_sources[provider] = guild_sources
+            self._targets[provider] = targets
+            _debug_subscriptions(f"loaded {provider}: sources={len(sources)} guilds={len(guild_sources)}")
+
+    def sync(self) -> bool:
+        """Reload the providers another connection changed since the last load; return True if any was."""
+        if self._data_version is None:
+            self.refresh()
+            return True
+        version = data_version()
+        if version == self._data_version:
+            return False
+        changed = [provider for provider in _PROVIDERS if self._moved(provider)]
+        if not changed:
+            self._data_version = version
+            return False
+        self.refresh(changed)
+        return True
+
+    def _moved(self, provider: str) -> bool:
+        last = self._watermarks.get(provider)
+        if last is None:
+            return True
+        watermark, read_at = last
+        # updated_at has one-second resolution: a save later in the second the watermark was
+        # read leaves it unchanged, so a watermark that recent is never trusted.
+        return subscription_watermark(provider) != watermark or watermark[1] >= read_at
+
+    def _on_guild_saved(self, provider: str, guild_id: int, sources: list[str], channel_id: Any, text: str) -> None:
+        if provider not in _PROVIDERS:
+            return
+        wanted = set(sources)
+        index = self._sources[provider]
+        for source in self._guild_sources[provider].pop(guild_id, set()) - wanted:
+            guilds = index.get(source)
+            if guilds is not None:
+                guilds.discard(guild_id)
+                if not guilds:
+                    del index[source]
+        for source in wanted:
+            index.setdefault(source, set()).add(guild_id)
+
+        if wanted:
+            self._guild_sources[provider][guild_id] = wanted
+            self._targets[provider][guild_id] = {"channel": channel_id, "text": text}
+        else:
+            self._targets[provider].pop(guild_id, None)
+
+    def sources(self, provider: str) -> list[str]:
+        return sorted(self._sources[provider])
+
+    def guild_ids(self, provider: str, source: str) -> set[int]:
+        return set(self._sources[provider].get(source, ()))
+
+    def followers(self, provider: str, source: str) -> list[Dict[str, Any]]:
+        """Return ``{guild_id, channel, text}`` for every guild following ``source``."""
+        targets = self._targets[provider]
+        return [
+            {"guild_id": guild_id, **targets[guild_id]}
+            for guild_id in sorted(self._sources[provider].get(source, ()))
+            if guild_id in targets
+        ]
+
+    def subscriptions(self, provider: str, guild_id: int) -> list[str]:
+        return sorted(self._guild_sources[provider].get(guild_id, ()))
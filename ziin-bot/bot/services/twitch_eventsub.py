@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Iterable
+
+import aiohttp
+
+from bot.services.http_client import HttpClient, HttpStatusError
+from bot.services.rate_limit import RateLimited
+
+logger = logging.getLogger("__main__")
+_DEBUG_TWITCH = os.getenv("DEBUG_TWITCH", "0") == "1"
+
+DEFAULT_EVENTSUB_WS_URL = "wss://eventsub.wss.twitch.tv/ws"
+DEFAULT_EVENTSUB_API_URL = "https://api.twitch.tv/helix/eventsub/subscriptions"
+
+# (type, version) pairs subscribed for every followed broadcaster.
+EVENTSUB_TYPES: tuple[tuple[str, str], ...] = (
+    ("stream.online", "1"),
+    ("stream.offline", "1"),
+    ("channel.update", "2"),
+)
+
+EventHandler = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+def _debug_eventsub(message: str) -> None:
+    if _DEBUG_TWITCH:
+        logger.info("[twitch-eventsub] %s", message)
+
+
+class EventSubClient:
+    """Twitch EventSub over the WebSocket transport.
+
+    Keeps one session open, subscribes every broadcaster handed to
+    ``sync_broadcasters`` to ``EVENTSUB_TYPES`` and forwards notifications to
+    ``on_event(subscription_type, event)``. Subscriptions are created in a
+    background task through the shared ``HttpClient``, so they count against
+    the "twitch" rate budget. ``covered`` holds the broadcasters with every
+    type enabled; Twitch caps subscriptions per session, so callers keep
+    polling everyone else, and everyone while ``connected`` is False.
+    """
+
+    def __init__(
+        self,
+        *,
+        http: HttpClient,
+        client_id: str,
+        access_token: str,
+        on_event: EventHandler,
+        ws_url: str = DEFAULT_EVENTSUB_WS_URL,
+        api_url: str = DEFAULT_EVENTSUB_API_URL,
+    ) -> None:
+        self.http = http
+        self.client_id = client_id
+        self.access_token = access_token
+        self.ws_url = ws_url
+        self.api_url = api_url
+        self._on_event = on_event
+        self._session_id: str | None = None
+        self._connected = asyncio.Event()
+        self._broadcasters: set[str] = set()
+        # broadcaster id -> subscription type -> id ("" when Twitch reported it already exists).
+        self._subscription_ids: dict[str, dict[str, str]] = {}
+        self._sync_task: asyncio.Task | None = None
+        self._sync_again = False
+        # Session on which Twitch refused further subscriptions (cost or count cap).
+        self._capped_session: str | None = None
+        self._seen_messages: deque[str] = deque(maxlen=512)
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    @property
+    def session_id(self) -> str | None:
+        return self._session_id
+
+    @property
+    def covered(self) -> set[str]:
+        """Broadcaster ids whose every ``EVENTSUB_TYPES`` subscription is enabled on the current session."""
+        if not self.connected:
+            return set()
+        return {
+            broadcaster_id
+            for broadcaster_id, subscriptions in self._subscription_ids.items()
+            if len(subscriptions) == len(EVENTSUB_TYPES)
+        }
+
+    def _headers(self) -> dict[str, str]:
+        return {
+            "Client-ID": self.client_id,
+            "Authorization": f"Bearer {self.access_token}",
+        }
+
+    async def run(self) -> None:
+        """Connect and stay connected until cancelled, reconnecting with backoff."""
+        url = self.ws_url
+        failures = 0
+        try:
+            while True:
+                try:
+                    url = await self._run_session(url)
+                    failures = 0
+                    continue
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    _debug_eventsub(f"session ended error={exc!r}")
+                self._mark_disconnected()
+                url = self.ws_url
+                failures += 1
+                delay = min(300.0, 2.0 ** min(failures, 8)) * random.uniform(0.5, 1.0)
+                _debug_eventsub(f"reconnecting in {delay:.1f}s")
+                await asyncio.sleep(delay)
+        finally:
+            self._mark_disconnected()
+            if self._sync_task is not None:
+                self._sync_task.cancel()
+
+    def _mark_disconnected(self) -> None:
+        self._connected.clear()
+        self._session_id = None
+        self._subscription_ids.clear()
+
+    async def _run_session(self, url: str) -> str:
+        """Run one WebSocket session; return the URL to reconnect to when Twitch asks to migrate."""
+        keepalive = 30.0
+        is_migration = url != self.ws_url
+        async with self.http.ws_connect(url, heartbeat=None) as ws:
+            while True:
+                message = await ws.receive(timeout=keepalive + 10)
+                if message.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    raise ConnectionError(f"websocket closed code={ws.close_code}")
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    continue
+
+                data = message.json()
+                metadata = data.get("metadata") if isinstance(data.get("metadata"), dict) else {}
+                payload = data.get("payload") if isinstance(data.get("payload"), dict) else {}
+                message_type = metadata.get("message_type")
+                message_id = metadata.get("message_id")
+                if message_id:
+                    if message_id in self._seen_messages:
+                        continue
+                    self._seen_messages.append(message_id)
+
+                if message_type == "session_welcome":
+                    session = payload.get("session") if isinstance(payload.get("session"), dict) else {}
+                    keepalive = float(session.get("keepalive_timeout_seconds") or keepalive)
+                    self._session_id = str(session.get("id") or "")
+                    self._connected.set()
+                    _debug_eventsub(f"welcome session={self._session_id} keepalive={keepalive}")
+                    if not is_migration:
+                        # Subscriptions follow the session across a migration; only a fresh one needs them.
+                        self.sync_broadcasters(self._broadcasters)
+                elif message_type == "session_reconnect":
+                    session = payload.get("session") if isinstance(payload.get("session"), dict) else {}
+                    reconnect_url = session.get("reconnect_url")
+                    if isinstance(reconnect_url, str) and reconnect_url:
+                        _debug_eventsub("server requested reconnect")
+                        return reconnect_url
+                elif message_type == "notification":
+                    subscription = payload.get("subscription") if isinstance(payload.get("subscription"), dict) else {}
+                    event = payload.get("event") if isinstance(payload.get("event"), dict) else {}
+                    subscription_type = str(subscription.get("type") or metadata.get("subscription_type") or "")
+                    try:
+                        await self._on_event(subscription_type, event)
+                    except Exception as exc:
+                        _debug_eventsub(f"handler failed type={subscription_type} error={exc!r}")
+                elif message_type == "revocation":
+                    subscription = payload.get("subscription") if isinstance(payload.get("subscription"), dict) else {}
+                    _debug_eventsub(f"subscription revoked {subscription.get('type')} status={subscription.get('status')}")
+
+    def sync_broadcasters(self, broadcaster_ids: Iterable[str]) -> None:
+        """Subscribe new broadcaster ids and drop ones no longer followed, in the background."""
+        self._broadcasters = {str(item) for item in broadcaster_ids if item}
+        if self._sync_task is not None and not self._sync_task.done():
+            self._sync_again = True
+            return
+        self._sync_task = asyncio.create_task(self._sync())
+
+    async def _sync(self) -> None:
+        while True:
+            self._sync_again = False
+            try:
+                await self._sync_once()
+            except Exception as exc:
+                _debug_eventsub(f"sync failed error={exc!r}")
+            if not self._sync_again:
+                return
+
+    async def _sync_once(self) -> None:
+        wanted = set(self._broadcasters)
+        session_id = self._session_id
+        if not self.connected or not session_id:
+            return
+
+        for broadcaster_id in sorted(set(self._subscription_ids) - wanted):
+            for subscription_id in self._subscription_ids.pop(broadcaster_id, {}).values():
+                if subscription_id:
+                    await self._delete_subscription(subscription_id)
+                    self._capped_session = None  # room freed up; try the uncovered ones again
+
+        if self._capped_session == session_id:
+            return
+        for broadcaster_id in sorted(wanted):
+            subscriptions = self._subscription_ids.setdefault(broadcaster_id, {})
+            for subscription_type, version in EVENTSUB_TYPES:
+                if subscription_type in subscriptions:
+                    continue
+                try:
+                    subscription_id = await self._create_subscription(subscription_type, version, broadcaster_id, session_id)
+                except HttpStatusError as exc:
+                    if exc.status in (403, 429):
+                        # Subscription cap: the rest stay uncovered and keep being polled.
+                        _debug_eventsub(f"subscribe limit reached at broadcaster={broadcaster_id} status={exc.status}")
+                        self._capped_session = session_id
+                        return
+                    _debug_eventsub(f"subscribe failed type={subscription_type} broadcaster={broadcaster_id} error={exc!r}")
+                    continue
+                except RateLimited:
+                    return
+                except Exception as exc:
+                    _debug_eventsub(f"subscribe failed type={subscription_type} broadcaster={broadcaster_id} error={exc!r}")
+                    continue
+                if session_id != self._session_id:
+                    return  # the session dropped; its subscriptions went with it
+                if subscription_id is not None:
+                    subscriptions[subscription_type] = subscription_id
+
+    async def _create_subscription(
+        self, subscription_type: str, version: str, broadcaster_id: str, session_id: str
+    ) -> str | None:
+        """Return the new subscription id, "" when it already exists, or None when Twitch did not say."""
+        body = {
+            "type": subscription_type,
+            "version": version,
+            "condition": {"broadcaster_user_id": broadcaster_id},
+            "transport": {"method": "websocket", "session_id": session_id},
+        }
+        # No inline retries: a refused subscription is retried by the next sync.
+        response = await self.http.post(self.api_url, provider="twitch", json=body, headers=self._headers(), retries=0)
+        if response.status == 409:
+            return ""
+        response.raise_for_status()
+        data = response.json()
+        rows = data.get("data") if isinstance(data, dict) else None
+        if isinstance(rows, list) and rows and isinstance(rows[0], dict):
+            return str(rows[0].get("id") or "") or None
+        return None
+
+    async def _delete_subscription(self, subscription_id: str) -> None:
+        try:
+            response = await self.http.request(
+                "DELETE", self.api_url, provider="twitch", params={"id": subscription_id}, headers=self._headers()
+            )
+            response.raise_for_status()
+        except Exception as exc:
+            _debug_eventsub(f"unsubscribe failed id={subscription_id} error={exc!r}")
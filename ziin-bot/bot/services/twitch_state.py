@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterable
+
+from bot.services.storage import execute, executemany, fetchall, now_ts
+
+_SCHEMA_READY = False
+_profiles: Dict[str, Dict[str, Any]] = {}
+
+
+def _normalize_login(login: str) -> str:
+    return login.strip().lower() if isinstance(login, str) else ""
+
+
+def _ensure_twitch_state_schema() -> None:
+    global _SCHEMA_READY
+    if _SCHEMA_READY:
+        return
+
+    execute(
+        """
+        CREATE TABLE IF NOT EXISTS twitch_profiles (
+          login TEXT PRIMARY KEY,
+          user_id TEXT,
+          display_name TEXT,
+          profile_image_url TEXT,
+          fetched_at INTEGER NOT NULL
+        )
+        """
+    )
+    execute(
+        """
+        CREATE TABLE IF NOT EXISTS twitch_live_messages (
+          server_id TEXT NOT NULL,
+          streamer TEXT NOT NULL,
+          stream_id TEXT,
+          message_id TEXT NOT NULL,
+          channel_id TEXT NOT NULL,
+          fingerprint TEXT,
+          edited_at INTEGER,
+          updated_at INTEGER,
+          PRIMARY KEY (server_id, streamer)
+        )
+        """
+    )
+    columns = {str(row["name"]) for row in fetchall("PRAGMA table_info(twitch_live_messages)")}
+    if "fingerprint" not in columns:
+        execute("ALTER TABLE twitch_live_messages ADD COLUMN fingerprint TEXT")
+    if "edited_at" not in columns:
+        execute("ALTER TABLE twitch_live_messages ADD COLUMN edited_at INTEGER")
+    for row in fetchall("SELECT login, user_id, display_name, profile_image_url, fetched_at FROM twitch_profiles"):
+        login = _normalize_login(row["login"])
+        if not login:
+            continue
+        _profiles[login] = {
+            "login": login,
+            "id": row["user_id"] or "",
+            "display_name": row["display_name"] or login,
+            "profile_image_url": row["profile_image_url"] or "",
+            "fetched_at": int(row["fetched_at"] or 0),
+        }
+    _SCHEMA_READY = True
+
+
+def get_twitch_profile(login: str) -> Dict[str, Any] | None:
+    """Return the cached helix user profile for ``login`` regardless of age."""
+    _ensure_twitch_state_schema()
+    return _profiles.get(_normalize_login(login))
+
+
+def get_twitch_profile_image(login: str) -> str:
+    profile = get_twitch_profile(login)
+    return profile["profile_image_url"] if profile else ""
+
+
+def stale_twitch_logins(logins: Iterable[str], ttl_seconds: int) -> list[str]:
+    """Return the logins whose cached profile is missing or older than ``ttl_seconds``."""
+    _ensure_twitch_state_schema()
+    cutoff = now_ts() - max(0, int(ttl_seconds))
+    stale: list[str] = []
+    seen: set[str] = set()
+    for raw in logins:
+        login = _normalize_login(raw)
+        if not login or login in seen:
+            continue
+        seen.add(login)
+        profile = _profiles.get(login)
+        if profile is None or profile["fetched_at"] < cutoff:
+            stale.append(login)
+    return stale
+
+
+def save_twitch_profiles(users: Iterable[Dict[str, Any]]) -> None:
+    """Store helix ``users`` rows in the shared profile cache."""
+    _ensure_twitch_state_schema()
+    stamp = now_ts()
+    rows: list[tuple[str, str, str, str, int]] = []
+    for user in users:
+        if not isinstance(user, dict):
+            continue
+        login = _normalize_login(user.get("login", ""))
+        if not login:
+            continue
+        profile = {
+            "login": login,
+            "id": str(user.get("id") or ""),
+            "display_name": str(user.get("display_name") or login),
+            "profile_image_url": str(user.get("profile_image_url") or ""),
+            "fetched_at": stamp,
+        }
+        _profiles[login] = profile
+        rows.append((login, profile["id"], profile["display_name"], profile["profile_image_url"], stamp))
+
+    if not rows:
+        return
+    executemany(
+        """
+        INSERT INTO twitch_profiles (login, user_id, display_name, profile_image_url, fetched_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(login)
+        DO UPDATE SET
+          user_id = excluded.user_id,
+          display_name = excluded.display_name,
+          profile_image_url = excluded.profile_image_url,
+          fetched_at = excluded.fetched_at
+        """,
+        rows,
+    )
+
+
+def touch_twitch_profiles(logins: Iterable[str]) -> None:
+    """Refresh ``fetched_at`` for logins helix returned no user for.
+
+    Keeps renamed or banned accounts from being re-requested every cycle.
+    """
+    _ensure_twitch_state_schema()
+    users: list[Dict[str, Any]] = []
+    for raw in logins:
+        login = _normalize_login(raw)
+        if not login:
+            continue
+        profile = _profiles.get(login, {})
+        users.append(
+            {
+                "login": login,
+                "id": profile.get("id", ""),
+                "display_name": profile.get("display_name", login),
+                "profile_image_url": profile.get("profile_image_url", ""),
+            }
+        )
+    save_twitch_profiles(users)
+
+
+def load_twitch_live_messages() -> Dict[tuple[int, str], Dict[str, Any]]:
+    """Return every persisted live announcement keyed by ``(guild_id, streamer)``."""
+    _ensure_twitch_state_schema()
+    messages: Dict[tuple[int, str], Dict[str, Any]] = {}
+    for row in fetchall(
+        "SELECT server_id, streamer, stream_id, message_id, channel_id, fingerprint, edited_at FROM twitch_live_messages"
+    ):
+        try:
+            key = (int(row["server_id"]), _normalize_login(row["streamer"]))
+            fingerprint = json.loads(row["fingerprint"]) if row["fingerprint"] else None
+            messages[key] = {
+                "stream_id": row["stream_id"] or "",
+                "message_id": int(row["message_id"]),
+                "channel_id": int(row["channel_id"]),
+                "fingerprint": fingerprint if isinstance(fingerprint, list) else None,
+                "edited_at": int(row["edited_at"] or 0),
+            }
+        except (TypeError, ValueError):
+            continue
+    return messages
+
+
+def save_twitch_live_message(
+    guild_id: int,
+    streamer: str,
+    stream_id: str,
+    message_id: int,
+    channel_id: int,
+    fingerprint: list[Any] | None = None,
+) -> None:
+    _ensure_twitch_state_schema()
+    stamp = now_ts()
+    execute(
+        """
+        INSERT INTO twitch_live_messages (
+          server_id, streamer, stream_id, message_id, channel_id, fingerprint, edited_at, updated_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(server_id, streamer)
+        DO UPDATE SET
+          stream_id = excluded.stream_id,
+          message_id = excluded.message_id,
+          channel_id = excluded.channel_id,
+          fingerprint = excluded.fingerprint,
+          edited_at = excluded.edited_at,
+          updated_at = excluded.updated_at
+        """,
+        (
+            str(guild_id),
+            _normalize_login(streamer),
+            stream_id,
+            str(message_id),
+            str(channel_id),
+            json.dumps(fingerprint, ensure_ascii=False) if fingerprint is not None else None,
+            stamp,
+            stamp,
+        ),
+    )
+
+
+def update_twitch_live_fingerprint(guild_id: int, streamer: str, fingerprint: list[Any], edited_at: int) -> None:
+    _ensure_twitch_state_schema()
+    execute(
+        """
+        UPDATE twitch_live_messages
+        SET fingerprint = ?, edited_at = ?, updated_at = ?
+        WHERE server_id = ? AND streamer = ?
+        """,
+        (json.dumps(fingerprint, ensure_ascii=False), edited_at, now_ts(), str(guild_id), _normalize_login(streamer)),
+    )
+
+
+def delete_twitch_live_message(guild_id: int, streamer: str) -> None:
+    _ensure_twitch_state_schema()
+    execute(
+        "DELETE FROM twitch_live_messages WHERE server_id = ? AND streamer = ?",
+        (str(guild_id), _normalize_login(streamer)),
+    )
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from bot.services.storage import execute, executemany, fetchall, now_ts
+
+_SCHEMA_READY = False
+
+
+def _ensure_twitter_state_schema() -> None:
+    global _SCHEMA_READY
+    if _SCHEMA_READY:
+        return
+
+    execute(
+        """
+        CREATE TABLE IF NOT EXISTS twitter_cursors (
+          handle TEXT PRIMARY KEY,
+          last_tweet_id TEXT,
+          last_checked_at INTEGER,
+          updated_at INTEGER
+        )
+        """
+    )
+    _SCHEMA_READY = True
+
+
+def load_twitter_cursors() -> Dict[str, Dict[str, Any]]:
+    """Return the per-handle high-water marks: newest tweet id seen and end of the last searched window."""
+    _ensure_twitter_state_schema()
+    return {
+        str(row["handle"]): {
+            "last_tweet_id": row["last_tweet_id"] or "",
+            "last_checked_at": int(row["last_checked_at"] or 0),
+        }
+        for row in fetchall("SELECT handle, last_tweet_id, last_checked_at FROM twitter_cursors")
+    }
+
+
+def save_twitter_cursors(cursors: Dict[str, Dict[str, Any]]) -> None:
+    _ensure_twitter_state_schema()
+    stamp = now_ts()
+    rows = [
+        (handle, cursor.get("last_tweet_id") or "", int(cursor.get("last_checked_at") or 0), stamp)
+        for handle, cursor in cursors.items()
+        if handle
+    ]
+    if not rows:
+        return
+    executemany(
+        """
+        INSERT INTO twitter_cursors (handle, last_tweet_id, last_checked_at, updated_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(handle)
+        DO UPDATE SET
+          last_tweet_id = excluded.last_tweet_id,
+          last_checked_at = excluded.last_checked_at,
+          updated_at = excluded.updated_at
+        """,
+        rows,
+    )
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import IO, Any, Dict
+
+from bot.services.http_client import HttpClient
+
+DEFAULT_FEED_URL = "https://www.youtube.com/feeds/videos.xml"
+# Feeds are served by www.youtube.com, not the Data API, so they are limited separately.
+FEED_PROVIDER = "youtube_feed"
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_YT = "{http://www.youtube.com/xml/schemas/2015}"
+_CHUNK_SIZE = 8192
+
+
+@dataclass
+class FeedResult:
+    """Outcome of one conditional feed request; ``not_modified`` means a 304."""
+
+    not_modified: bool = False
+    entries: list[Dict[str, str]] = field(default_factory=list)
+    etag: str = ""
+    last_modified: str = ""
+
+
+class FeedParser:
+    """Incremental Atom feed parser fed raw bytes as they arrive.
+
+    Each entry is ``{video_id, channel_id, title, published}``, newest first.
+    Elements are cleared as soon as they are read and ``feed`` reports when
+    ``limit`` entries have been collected so the caller can stop reading.
+    """
+
+    def __init__(self, limit: int = 0) -> None:
+        self.limit = limit
+        self.entries: list[Dict[str, str]] = []
+        self._parser = ET.XMLPullParser(events=("end",))
+
+    @property
+    def done(self) -> bool:
+        return bool(self.limit) and len(self.entries) >= self.limit
+
+    def feed(self, data: bytes) -> bool:
+        """Consume ``data``; return True once ``limit`` entries have been read."""
+        self._parser.feed(data)
+        self._drain()
+        return self.done
+
+    def close(self) -> list[Dict[str, str]]:
+        if not self.done:
+            self._parser.close()
+            self._drain()
+        return self.entries
+
+    def _drain(self) -> None:
+        for _, element in self._parser.read_events():
+            if self.done:
+                return
+            if element.tag != f"{_ATOM}entry":
+                continue
+            video_id = element.findtext(f"{_YT}videoId") or ""
+            if video_id:
+                self.entries.append(
+                    {
+                        "video_id": video_id,
+                        "channel_id": element.findtext(f"{_YT}channelId") or "",
+                        "title": element.findtext(f"{_ATOM}title") or "",
+                        "published": element.findtext(f"{_ATOM}published") or "",
+                    }
+                )
+            element.clear()
+
+
+def parse_feed(source: IO[bytes], limit: int = 0) -> list[Dict[str, str]]:
+    """Parse a channel Atom feed from a file-like ``source``, stopping after ``limit`` entries when set."""
+    parser = FeedParser(limit)
+    for chunk in iter(lambda: source.read(_CHUNK_SIZE), b""):
+        if parser.feed(chunk):
+            break
+    return parser.close()
+
+
+async def fetch_feed(
+    http: HttpClient,
+    channel_id: str,
+    validators: Dict[str, Any] | None = None,
+    base_url: str = DEFAULT_FEED_URL,
+    limit: int = 0,
+) -> FeedResult:
+    """Fetch a channel's uploads feed, sending ``validators`` as If-None-Match / If-Modified-Since.
+
+    The body is parsed while it downloads; once ``limit`` entries are in, the
+    rest is not read.
+    """
+    headers: dict[str, str] = {}
+    validators = validators or {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    async with http.stream(base_url, provider=FEED_PROVIDER, params={"channel_id": channel_id}, headers=headers) as response:
+        if response.status == 304:
+            return FeedResult(
+                not_modified=True,
+                etag=validators.get("etag", ""),
+                last_modified=validators.get("last_modified", ""),
+            )
+        response.raise_for_status()
+        parser = FeedParser(limit)
+        async for chunk in response.content.iter_chunked(_CHUNK_SIZE):
+            if parser.feed(chunk):
+                break
+        return FeedResult(
+            entries=parser.close(),
+            etag=response.headers.get("ETag", ""),
+            last_modified=response.headers.get("Last-Modified", ""),
+        )
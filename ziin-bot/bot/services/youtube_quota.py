@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from bot.services.youtube_state import load_youtube_quota_usage, save_youtube_quota_usage
+
+# Data API v3 unit cost per call; list endpoints are 1, search is the expensive one.
+YOUTUBE_UNIT_COSTS: dict[str, int] = {
+    "channels": 1,
+    "playlistItems": 1,
+    "videos": 1,
+    "search": 100,
+}
+
+try:
+    _QUOTA_TZ = ZoneInfo("America/Los_Angeles")
+except ZoneInfoNotFoundError:
+    _QUOTA_TZ = timezone(timedelta(hours=-8))
+
+# Burn rate used for projections is measured over this window.
+_RATE_WINDOW_SECONDS = 3600
+
+
+def quota_day(now: float | None = None) -> str:
+    """Return the quota day for ``now``; YouTube resets quota at midnight Pacific time."""
+    moment = datetime.fromtimestamp(time.time() if now is None else now, tz=_QUOTA_TZ)
+    return moment.strftime("%Y-%m-%d")
+
+
+def seconds_until_reset(now: float | None = None) -> float:
+    current = time.time() if now is None else now
+    moment = datetime.fromtimestamp(current, tz=_QUOTA_TZ)
+    midnight = datetime.combine(moment.date() + timedelta(days=1), datetime.min.time(), tzinfo=_QUOTA_TZ)
+    return max(1.0, midnight.timestamp() - current)
+
+
+class YouTubeQuota:
+    """Tracks YouTube Data API spend against the daily quota.
+
+    Spend is kept per quota day in ``youtube_quota_usage`` so restarts do not
+    forget what was already used. ``reserve_ratio`` of the quota is held back
+    from polling so manual commands keep working near the limit.
+    """
+
+    def __init__(self, daily_limit: int, reserve_ratio: float = 0.1) -> None:
+        self.daily_limit = max(1, int(daily_limit))
+        self.reserve_ratio = reserve_ratio
+        self._day = quota_day()
+        self._units, self._calls = load_youtube_quota_usage(self._day)
+        self._recent: deque[tuple[float, int]] = deque()
+        self._dirty = False
+
+    def _roll_day(self) -> None:
+        day = quota_day()
+        if day != self._day:
+            self.flush()
+            self._day = day
+            self._units, self._calls = load_youtube_quota_usage(day)
+            self._recent.clear()
+
+    @property
+    def spent(self) -> int:
+        self._roll_day()
+        return self._units
+
+    @property
+    def calls(self) -> int:
+        self._roll_day()
+        return self._calls
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.daily_limit - self.spent)
+
+    def cost(self, endpoint: str, calls: int = 1) -> int:
+        return YOUTUBE_UNIT_COSTS.get(endpoint, 1) * calls
+
+    def can_afford(self, endpoint: str, calls: int = 1) -> bool:
+        return self.cost(endpoint, calls) <= self.remaining
+
+    def charge(self, endpoint: str, calls: int = 1) -> None:
+        self._roll_day()
+        units = self.cost(endpoint, calls)
+        self._units += units
+        self._calls += calls
+        self._recent.append((time.time(), units))
+        self._dirty = True
+
+    def mark_exhausted(self) -> None:
+        """Record that the API rejected a call with ``quotaExceeded``."""
+        self._roll_day()
+        if self._units < self.daily_limit:
+            self._units = self.daily_limit
+            self._dirty = True
+
+    def flush(self) -> None:
+        if self._dirty:
+            save_youtube_quota_usage(self._day, self._units, self._calls)
+            self._dirty = False
+
+    def burn_rate(self) -> float:
+        """Units per second spent over the last hour."""
+        cutoff = time.time() - _RATE_WINDOW_SECONDS
+        while self._recent and self._recent[0][0] < cutoff:
+            self._recent.popleft()
+        if not self._recent:
+            return 0.0
+        return sum(units for _, units in self._recent) / _RATE_WINDOW_SECONDS
+
+    def polling_rate(self) -> float:
+        """Units per second polling may spend for the rest of the day, after the reserve."""
+        budget = self.daily_limit * (1 - self.reserve_ratio) - self.spent
+        return max(0.0, budget) / seconds_until_reset()
+
+    def projected_exhaustion(self, rate: float | None = None) -> datetime | None:
+        """When the quota runs out at ``rate`` (default: the recent burn rate), or None if it outlasts the day."""
+        rate = self.burn_rate() if rate is None else rate
+        if self.remaining <= 0:
+            return datetime.now(tz=_QUOTA_TZ)
+        if rate <= 0:
+            return None
+        seconds = self.remaining / rate
+        if seconds >= seconds_until_reset():
+            return None
+        return datetime.now(tz=_QUOTA_TZ) + timedelta(seconds=seconds)
+
+    def plan_intervals(
+        self,
+        channels: dict[str, tuple[int, int]],
+        min_seconds: int,
+        max_seconds: int,
+        poll_cost: int,
+    ) -> dict[str, int]:
+        """Return a poll interval per channel.
+
+        ``channels`` maps channel id to ``(followers, avg_upload_gap)``. A channel
+        is checked about ten times per typical upload gap, sooner the more guilds
+        follow it; if the result would outspend ``polling_rate`` every interval is
+        stretched by the same factor.
+        """
+        intervals: dict[str, float] = {}
+        for channel_id, (followers, avg_upload_gap) in channels.items():
+            base = avg_upload_gap / 10 if avg_upload_gap > 0 else min_seconds
+            base /= 1 + math.log2(max(1, followers))
+            intervals[channel_id] = min(max_seconds, max(min_seconds, base))
+
+        if not intervals:
+            return {}
+        projected = sum(poll_cost / interval for interval in intervals.values())
+        allowed = self.polling_rate()
+        if allowed <= 0:
+            scale = seconds_until_reset() / min(intervals.values())
+        else:
+            scale = max(1.0, projected / allowed)
+        return {channel_id: int(math.ceil(interval * scale)) for channel_id, interval in intervals.items()}
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Dict
+
+from bot.services.storage import execute, executemany, fetchall, fetchone, now_ts
+
+_SCHEMA_READY = False
+# Channel ids are "UC" + 22 base64url chars; the uploads playlist is the same id with "UU".
+_CHANNEL_ID_RE = re.compile(r"UC[0-9A-Za-z_-]{22}")
+
+
+def _ensure_youtube_state_schema() -> None:
+    global _SCHEMA_READY
+    if _SCHEMA_READY:
+        return
+
+    execute(
+        """
+        CREATE TABLE IF NOT EXISTS youtube_uploads_playlists (
+          channel_id TEXT PRIMARY KEY,
+          uploads_playlist_id TEXT NOT NULL,
+          resolved_at INTEGER NOT NULL
+        )
+        """
+    )
+    execute(
+        """
+        CREATE TABLE IF NOT EXISTS youtube_quota_usage (
+          day TEXT PRIMARY KEY,
+          units INTEGER NOT NULL DEFAULT 0,
+          calls INTEGER NOT NULL DEFAULT 0,
+          updated_at INTEGER
+        )
+        """
+    )
+    execute(
+        """
+        CREATE TABLE IF NOT EXISTS youtube_channel_polls (
+          channel_id TEXT PRIMARY KEY,
+          last_checked_at INTEGER,
+          next_check_at INTEGER,
+          last_video_id TEXT,
+          last_upload_at INTEGER,
+          avg_upload_gap INTEGER
+        )
+        """
+    )
+    execute(
+        """
+        CREATE TABLE IF NOT EXISTS youtube_upcoming_streams (
+          video_id TEXT PRIMARY KEY,
+          channel_id TEXT NOT NULL,
+          scheduled_start INTEGER NOT NULL,
+          updated_at INTEGER
+        )
+        """
+    )
+    _SCHEMA_READY = True
+
+
+def derive_uploads_playlist_id(channel_id: str) -> str | None:
+    """Return the uploads playlist for a ``UC...`` channel id without an API call."""
+    if isinstance(channel_id, str) and _CHANNEL_ID_RE.fullmatch(channel_id):
+        return "UU" + channel_id[2:]
+    return None
+
+
+def load_youtube_uploads_playlists() -> Dict[str, str]:
+    _ensure_youtube_state_schema()
+    return {
+        str(row["channel_id"]): str(row["uploads_playlist_id"])
+        for row in fetchall("SELECT channel_id, uploads_playlist_id FROM youtube_uploads_playlists")
+        if row["channel_id"] and row["uploads_playlist_id"]
+    }
+
+
+def save_youtube_uploads_playlists(playlists: Dict[str, str]) -> None:
+    """Persist ``{channel_id: uploads_playlist_id}`` resolved through channels.list."""
+    _ensure_youtube_state_schema()
+    stamp = now_ts()
+    rows = [(channel_id, uploads, stamp) for channel_id, uploads in playlists.items() if channel_id and uploads]
+    if not rows:
+        return
+    executemany(
+        """
+        INSERT INTO youtube_uploads_playlists (channel_id, uploads_playlist_id, resolved_at)
+        VALUES (?, ?, ?)
+        ON CONFLICT(channel_id)
+        DO UPDATE SET
+          uploads_playlist_id = excluded.uploads_playlist_id,
+          resolved_at = excluded.resolved_at
+        """,
+        rows,
+    )
+
+
+def load_youtube_quota_usage(day: str) -> tuple[int, int]:
+    """Return ``(units, calls)`` spent on the quota ``day`` (YYYY-MM-DD, Pacific time)."""
+    _ensure_youtube_state_schema()
+    row = fetchone("SELECT units, calls FROM youtube_quota_usage WHERE day = ?", (day,))
+    if row is None:
+        return 0, 0
+    return int(row["units"] or 0), int(row["calls"] or 0)
+
+
+def save_youtube_quota_usage(day: str, units: int, calls: int) -> None:
+    _ensure_youtube_state_schema()
+    execute(
+        """
+        INSERT INTO youtube_quota_usage (day, units, calls, updated_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(day)
+        DO UPDATE SET
+          units = excluded.units,
+          calls = excluded.calls,
+          updated_at = excluded.updated_at
+        """,
+        (day, int(units), int(calls), now_ts()),
+    )
+
+
+def load_youtube_channel_polls() -> Dict[str, Dict[str, Any]]:
+    """Return per-channel polling state keyed by channel id."""
+    _ensure_youtube_state_schema()
+    polls: Dict[str, Dict[str, Any]] = {}
+    for row in fetchall(
+        """
+        SELECT channel_id, last_checked_at, next_check_at, last_video_id, last_upload_at, avg_upload_gap
+        FROM youtube_channel_polls
+        """
+    ):
+        polls[str(row["channel_id"])] = {
+            "last_checked_at": int(row["last_checked_at"] or 0),
+            "next_check_at": int(row["next_check_at"] or 0),
+            "last_video_id": row["last_video_id"] or "",
+            "last_upload_at": int(row["last_upload_at"] or 0),
+            "avg_upload_gap": int(row["avg_upload_gap"] or 0),
+        }
+    return polls
+
+
+def save_youtube_channel_polls(polls: Dict[str, Dict[str, Any]]) -> None:
+    _ensure_youtube_state_schema()
+    rows = [
+        (
+            channel_id,
+            int(poll.get("last_checked_at") or 0),
+            int(poll.get("next_check_at") or 0),
+            poll.get("last_video_id") or "",
+            int(poll.get("last_upload_at") or 0),
+            int(poll.get("avg_upload_gap") or 0),
+        )
+        for channel_id, poll in polls.items()
+    ]
+    if not rows:
+        return
+    executemany(
+        """
+        INSERT INTO youtube_channel_polls (
+          channel_id, last_checked_at, next_check_at, last_video_id, last_upload_at, avg_upload_gap
+        )
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(channel_id)
+        DO UPDATE SET
+          last_checked_at = excluded.last_checked_at,
+          next_check_at = excluded.next_check_at,
+          last_video_id = excluded.last_video_id,
+          last_upload_at = excluded.last_upload_at,
+          avg_upload_gap = excluded.avg_upload_gap
+        """,
+        rows,
+    )
+
+
+def load_youtube_upcoming_streams() -> Dict[str, Dict[str, Any]]:
+    """Return scheduled streams/premieres not yet live, keyed by video id."""
+    _ensure_youtube_state_schema()
+    return {
+        str(row["video_id"]): {
+            "channel_id": str(row["channel_id"]),
+            "scheduled_start": int(row["scheduled_start"] or 0),
+        }
+        for row in fetchall("SELECT video_id, channel_id, scheduled_start FROM youtube_upcoming_streams")
+    }
+
+
+def save_youtube_upcoming_stream(video_id: str, channel_id: str, scheduled_start: int) -> None:
+    _ensure_youtube_state_schema()
+    execute(
+        """
+        INSERT INTO youtube_upcoming_streams (video_id, channel_id, scheduled_start, updated_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(video_id)
+        DO UPDATE SET
+          channel_id = excluded.channel_id,
+          scheduled_start = excluded.scheduled_start,
+          updated_at = excluded.updated_at
+        """,
+        (video_id, channel_id, int(scheduled_start), now_ts()),
+    )
+
+
+def delete_youtube_upcoming_stream(video_id: str) -> None:
+    _ensure_youtube_state_schema()
+    execute("DELETE FROM youtube_upcoming_streams WHERE video_id = ?", (video_id,))
@@ -70,6 +70,17 @@ CREATE TABLE IF NOT EXISTS twitch_data (
   updated_at INTEGER
 );
 
+-- Per-guild Twitch subscriptions (one row per streamer login).
+CREATE TABLE IF NOT EXISTS twitch_subscriptions (
+  server_id TEXT NOT NULL,
+  login TEXT NOT NULL,
+  is_live INTEGER NOT NULL DEFAULT 0 CHECK (is_live IN (0, 1)),
+  stream_id TEXT,
+  last_seen_live INTEGER,
+  updated_at INTEGER,
+  PRIMARY KEY (server_id, login)
+);
+
 -- Per-guild YouTube notification state.
 CREATE TABLE IF NOT EXISTS youtube_data (
   server_id TEXT PRIMARY KEY,
@@ -112,10 +123,84 @@ CREATE TABLE IF NOT EXISTS twitter_subscriptions (
   PRIMARY KEY (server_id, account_id)
 );
 
+-- Shared Twitch user profile cache (one row per login, refreshed by TTL).
+CREATE TABLE IF NOT EXISTS twitch_profiles (
+  login TEXT PRIMARY KEY,
+  user_id TEXT,
+  display_name TEXT,
+  profile_image_url TEXT,
+  fetched_at INTEGER NOT NULL
+);
+
+-- Live announcement message per guild/streamer, edited in place while live.
+CREATE TABLE IF NOT EXISTS twitch_live_messages (
+  server_id TEXT NOT NULL,
+  streamer TEXT NOT NULL,
+  stream_id TEXT,
+  message_id TEXT NOT NULL,
+  channel_id TEXT NOT NULL,
+  fingerprint TEXT,
+  edited_at INTEGER,
+  updated_at INTEGER,
+  PRIMARY KEY (server_id, streamer)
+);
+
+-- Channel -> uploads playlist for channel ids that cannot be derived from a UC... id.
+CREATE TABLE IF NOT EXISTS youtube_uploads_playlists (
+  channel_id TEXT PRIMARY KEY,
+  uploads_playlist_id TEXT NOT NULL,
+  resolved_at INTEGER NOT NULL
+);
+
+-- YouTube Data API units spent per quota day (Pacific time).
+CREATE TABLE IF NOT EXISTS youtube_quota_usage (
+  day TEXT PRIMARY KEY,
+  units INTEGER NOT NULL DEFAULT 0,
+  calls INTEGER NOT NULL DEFAULT 0,
+  updated_at INTEGER
+);
+
+-- Adaptive polling state per followed YouTube channel.
+CREATE TABLE IF NOT EXISTS youtube_channel_polls (
+  channel_id TEXT PRIMARY KEY,
+  last_checked_at INTEGER,
+  next_check_at INTEGER,
+  last_video_id TEXT,
+  last_upload_at INTEGER,
+  avg_upload_gap INTEGER
+);
+
+-- Scheduled YouTube streams/premieres waiting to go live, checked around their start time.
+CREATE TABLE IF NOT EXISTS youtube_upcoming_streams (
+  video_id TEXT PRIMARY KEY,
+  channel_id TEXT NOT NULL,
+  scheduled_start INTEGER NOT NULL,
+  updated_at INTEGER
+);
+
+-- Per-handle Twitter high-water mark: newest tweet id seen and end of the last searched window.
+CREATE TABLE IF NOT EXISTS twitter_cursors (
+  handle TEXT PRIMARY KEY,
+  last_tweet_id TEXT,
+  last_checked_at INTEGER,
+  updated_at INTEGER
+);
+
+-- Item ids already announced per provider source (YouTube channel, Twitter handle), pruned by age and count.
+CREATE TABLE IF NOT EXISTS seen_items (
+  provider TEXT NOT NULL,
+  source_id TEXT NOT NULL,
+  item_id TEXT NOT NULL,
+  seen_at INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_seen_items_item ON seen_items(provider, source_id, item_id);
+CREATE INDEX IF NOT EXISTS idx_seen_items_age ON seen_items(provider, source_id, seen_at);
+
 CREATE INDEX IF NOT EXISTS idx_log_settings_server_id ON log_settings(server_id);
 CREATE INDEX IF NOT EXISTS idx_user_guild_stats_server_id ON user_guild_stats(server_id);
 CREATE INDEX IF NOT EXISTS idx_user_voice_channel_stats_server_id ON user_voice_channel_stats(server_id);
 CREATE INDEX IF NOT EXISTS idx_twitch_data_server_id ON twitch_data(server_id);
+CREATE INDEX IF NOT EXISTS idx_twitch_subscriptions_login ON twitch_subscriptions(login, is_live);
 CREATE INDEX IF NOT EXISTS idx_youtube_data_server_id ON youtube_data(server_id);
 CREATE INDEX IF NOT EXISTS idx_youtube_subscriptions_server_id ON youtube_subscriptions(server_id);
 CREATE INDEX IF NOT EXISTS idx_twitter_data_server_id ON twitter_data(server_id);
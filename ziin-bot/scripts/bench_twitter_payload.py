@@ -0,0 +1,68 @@
+"""Micro-benchmark for Twitter search payload parsing over recorded payloads.
+
+Compares parsing with a cold payload-shape detector (reset before every page,
+i.e. full probing) against the learned fast path, per fixture in
+scripts/fixtures/twitter:
+
+    python scripts/bench_twitter_payload.py --rounds 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURES_DIR = ROOT / "scripts" / "fixtures" / "twitter"
+sys.path.insert(0, str(ROOT))
+
+from bot.cogs import twitter  # noqa: E402
+
+
+def parse_page(payload: object) -> int:
+    parsed = 0
+    for row in twitter._extract_tweets(payload):
+        candidate = row.get("tweet") if isinstance(row.get("tweet"), dict) else row
+        if isinstance(candidate, dict) and twitter._tweet_to_latest(candidate, "bench") is not None:
+            parsed += 1
+    return parsed
+
+
+def bench(payload: object, rounds: int, cold: bool) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        if cold:
+            twitter._reset_payload_shape()
+        parse_page(payload)
+    return (time.perf_counter() - start) / rounds * 1_000_000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=1000)
+    args = parser.parse_args()
+
+    paths = sorted(FIXTURES_DIR.glob("*.json"))
+    if not paths:
+        print(f"no fixtures in {FIXTURES_DIR}")
+        return 1
+
+    print(f"{'fixture':<28} {'tweets':>6} {'cold us/page':>13} {'learned us/page':>16} {'speedup':>8}")
+    for path in paths:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        twitter._reset_payload_shape()
+        tweets = parse_page(payload)
+        cold = bench(payload, args.rounds, cold=True)
+        twitter._reset_payload_shape()
+        parse_page(payload)
+        warm = bench(payload, args.rounds, cold=False)
+        speedup = cold / warm if warm else 0.0
+        print(f"{path.stem:<28} {tweets:>6} {cold:>13.1f} {warm:>16.1f} {speedup:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""Local stand-in for Twitch EventSub (WebSocket transport + subscriptions API).
+
+Run it, point TWITCH_EVENTSUB_WS_URL / TWITCH_EVENTSUB_API_URL at it and fire
+events without going live on Twitch:
+
+    python scripts/mock_eventsub.py --port 8081
+    curl -X POST localhost:8081/trigger -d '{"type": "stream.online", "login": "somestreamer"}'
+    curl -X POST localhost:8081/reconnect
+
+``--max-subscriptions`` caps subscriptions per session, answering 429 past it
+like Twitch does, to exercise partial EventSub coverage.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import uuid
+from datetime import datetime, timezone
+
+from aiohttp import WSMsgType, web
+
+KEEPALIVE_SECONDS = 10
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _message(message_type: str, payload: dict, subscription_type: str | None = None) -> dict:
+    metadata = {"message_id": uuid.uuid4().hex, "message_type": message_type, "message_timestamp": _now()}
+    if subscription_type:
+        metadata["subscription_type"] = subscription_type
+    return {"metadata": metadata, "payload": payload}
+
+
+class MockEventSub:
+    def __init__(self, port: int, max_subscriptions: int = 300) -> None:
+        self.port = port
+        self.max_subscriptions = max_subscriptions
+        self.sockets: dict[str, web.WebSocketResponse] = {}
+        self.subscriptions: dict[str, dict] = {}
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/ws", self.handle_ws)
+        app.router.add_post("/eventsub/subscriptions", self.create_subscription)
+        app.router.add_delete("/eventsub/subscriptions", self.delete_subscription)
+        app.router.add_get("/eventsub/subscriptions", self.list_subscriptions)
+        app.router.add_post("/trigger", self.trigger)
+        app.router.add_post("/reconnect", self.reconnect)
+        return app
+
+    async def handle_ws(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        session_id = request.query.get("session") or uuid.uuid4().hex
+        self.sockets[session_id] = ws
+        print(f"session connected id={session_id}")
+        await ws.send_json(
+            _message(
+                "session_welcome",
+                {
+                    "session": {
+                        "id": session_id,
+                        "status": "connected",
+                        "keepalive_timeout_seconds": KEEPALIVE_SECONDS,
+                        "reconnect_url": None,
+                        "connected_at": _now(),
+                    }
+                },
+            )
+        )
+
+        async def keepalive() -> None:
+            while not ws.closed:
+                await asyncio.sleep(KEEPALIVE_SECONDS)
+                if not ws.closed:
+                    await ws.send_json(_message("session_keepalive", {}))
+
+        task = asyncio.create_task(keepalive())
+        try:
+            async for message in ws:
+                if message.type == WSMsgType.ERROR:
+                    break
+        finally:
+            task.cancel()
+            if self.sockets.get(session_id) is ws:
+                self.sockets.pop(session_id, None)
+            print(f"session closed id={session_id}")
+        return ws
+
+    async def create_subscription(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        transport = body.get("transport") or {}
+        session_id = transport.get("session_id")
+        if session_id not in self.sockets:
+            return web.json_response({"error": "Bad Request", "message": "unknown session"}, status=400)
+        for subscription in self.subscriptions.values():
+            if subscription["type"] == body.get("type") and subscription["condition"] == body.get("condition"):
+                return web.json_response({"error": "Conflict"}, status=409)
+        in_session = sum(1 for item in self.subscriptions.values() if item["transport"]["session_id"] == session_id)
+        if in_session >= self.max_subscriptions:
+            return web.json_response(
+                {"error": "Too Many Requests", "message": "number of websocket transport subscriptions exceeded"},
+                status=429,
+                headers={"Ratelimit-Limit": "800", "Ratelimit-Remaining": "799"},
+            )
+
+        subscription = {
+            "id": uuid.uuid4().hex,
+            "status": "enabled",
+            "type": body.get("type"),
+            "version": body.get("version"),
+            "condition": body.get("condition") or {},
+            "transport": {"method": "websocket", "session_id": session_id},
+            "created_at": _now(),
+            "cost": 0,
+        }
+        self.subscriptions[subscription["id"]] = subscription
+        print(f"subscribed {subscription['type']} {subscription['condition']}")
+        return web.json_response({"data": [subscription], "total": len(self.subscriptions)}, status=202)
+
+    async def delete_subscription(self, request: web.Request) -> web.Response:
+        if self.subscriptions.pop(request.query.get("id", ""), None) is None:
+            return web.json_response({"error": "Not Found"}, status=404)
+        return web.Response(status=204)
+
+    async def list_subscriptions(self, request: web.Request) -> web.Response:
+        return web.json_response({"data": list(self.subscriptions.values()), "total": len(self.subscriptions)})
+
+    async def trigger(self, request: web.Request) -> web.Response:
+        """Send a notification: ``{"type": "stream.online", "login": "...", "user_id": "..."}``."""
+        body = await request.json()
+        subscription_type = str(body.get("type") or "stream.online")
+        login = str(body.get("login") or "").lower()
+        user_id = str(body.get("user_id") or "")
+
+        targets = [
+            subscription
+            for subscription in self.subscriptions.values()
+            if subscription["type"] == subscription_type
+            and (not user_id or subscription["condition"].get("broadcaster_user_id") == user_id)
+        ]
+        event = {
+            "broadcaster_user_id": user_id,
+            "broadcaster_user_login": login,
+            "broadcaster_user_name": login,
+        }
+        if subscription_type == "stream.online":
+            event.update({"id": str(body.get("stream_id") or uuid.uuid4().int % 10**11), "type": "live", "started_at": _now()})
+        elif subscription_type == "channel.update":
+            event.update({"title": body.get("title", ""), "category_name": body.get("category_name", "")})
+
+        sent = 0
+        for subscription in targets or [None]:
+            session_id = subscription["transport"]["session_id"] if subscription else next(iter(self.sockets), None)
+            ws = self.sockets.get(session_id) if session_id else None
+            if ws is None or ws.closed:
+                continue
+            await ws.send_json(
+                _message(
+                    "notification",
+                    {"subscription": subscription or {"type": subscription_type}, "event": event},
+                    subscription_type,
+                )
+            )
+            sent += 1
+        return web.json_response({"sent": sent})
+
+    async def reconnect(self, request: web.Request) -> web.Response:
+        """Ask every connected client to migrate, like Twitch does before maintenance."""
+        for session_id, ws in list(self.sockets.items()):
+            await ws.send_json(
+                _message(
+                    "session_reconnect",
+                    {
+                        "session": {
+                            "id": session_id,
+                            "status": "reconnecting",
+                            "reconnect_url": f"ws://127.0.0.1:{self.port}/ws?session={session_id}",
+                        }
+                    },
+                )
+            )
+        return web.json_response({"sessions": len(self.sockets)})
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--max-subscriptions", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"ws:  ws://{args.host}:{args.port}/ws")
+    print(f"api: http://{args.host}:{args.port}/eventsub/subscriptions")
+    web.run_app(MockEventSub(args.port, args.max_subscriptions).app(), host=args.host, port=args.port, print=None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""Local stand-in for YouTube channel Atom feeds, served from recorded fixtures.
+
+Serves scripts/fixtures/youtube_feeds/<channel_id>.xml at
+/feeds/videos.xml?channel_id=<channel_id> with ETag and Last-Modified
+validators, answering 304 to matching conditional requests like YouTube does:
+
+    python scripts/mock_youtube_feed.py --port 8082
+    YOUTUBE_DETECTION=feed YOUTUBE_FEED_URL=http://127.0.0.1:8082/feeds/videos.xml
+
+Edit or replace a fixture while it runs to simulate a new upload.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import sys
+from email.utils import formatdate
+from pathlib import Path
+
+from aiohttp import web
+
+ROOT = Path(__file__).resolve().parent
+FIXTURES_DIR = ROOT / "fixtures" / "youtube_feeds"
+
+
+class MockYoutubeFeed:
+    def __init__(self, fixtures_dir: Path) -> None:
+        self.fixtures_dir = fixtures_dir
+        self.requests = 0
+        self.not_modified = 0
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/feeds/videos.xml", self.handle_feed)
+        app.router.add_get("/stats", self.handle_stats)
+        return app
+
+    async def handle_feed(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        channel_id = request.query.get("channel_id", "")
+        path = self.fixtures_dir / f"{channel_id}.xml"
+        if not channel_id or "/" in channel_id or not path.is_file():
+            return web.Response(status=404, text="Not Found")
+
+        body = path.read_bytes()
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        last_modified = formatdate(path.stat().st_mtime, usegmt=True)
+        headers = {"ETag": etag, "Last-Modified": last_modified, "Cache-Control": "public, max-age=900"}
+
+        if request.headers.get("If-None-Match") == etag or (
+            "If-None-Match" not in request.headers and request.headers.get("If-Modified-Since") == last_modified
+        ):
+            self.not_modified += 1
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=body, content_type="application/atom+xml", charset="utf-8", headers=headers)
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response({"requests": self.requests, "not_modified": self.not_modified})
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8082)
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR)
+    args = parser.parse_args()
+
+    print(f"feed: http://{args.host}:{args.port}/feeds/videos.xml?channel_id=<id>")
+    for path in sorted(args.fixtures.glob("*.xml")):
+        print(f"  - {path.stem}")
+    web.run_app(MockYoutubeFeed(args.fixtures).app(), host=args.host, port=args.port, print=None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+import pytest
+
+from bot.services import channel_data, seen_items, storage, twitch_state, twitter_state, youtube_state
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A fresh SQLite database behind the shared storage connection."""
+    monkeypatch.setattr(storage, "_conn", None)
+    for module in (channel_data, seen_items, twitch_state, twitter_state, youtube_state):
+        monkeypatch.setattr(module, "_SCHEMA_READY", False)
+    conn = storage.init_storage(tmp_path / "local.db")
+    yield conn
+    conn.close()
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from bot.services import rate_limit
+from bot.services.rate_limit import RateGovernor, RateLimited, TokenBucket
+
+
+class Clock:
+    def __init__(self, now: float = 1_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    monkeypatch.setattr(rate_limit.time, "time", clock)
+    return clock
+
+
+def test_bucket_refills_at_its_rate_up_to_capacity(clock):
+    bucket = TokenBucket(rate=2.0, capacity=4.0)
+    for _ in range(4):
+        assert bucket.reserve(max_wait=0) == 0
+    assert bucket.wait_time() == pytest.approx(0.5)
+
+    clock.now += 1
+    assert bucket.wait_time() == 0
+    assert bucket.tokens == pytest.approx(2.0)
+
+    clock.now += 60
+    bucket.wait_time()
+    assert bucket.tokens == 4.0
+
+
+def test_bucket_queues_reservations_behind_each_other(clock):
+    bucket = TokenBucket(rate=1.0, capacity=1.0)
+    assert bucket.reserve(max_wait=5) == 0
+    assert bucket.reserve(max_wait=5) == pytest.approx(1.0)
+    assert bucket.reserve(max_wait=5) == pytest.approx(2.0)
+    assert bucket.reserve(max_wait=1) is None
+
+
+def test_bucket_sync_only_lowers_tokens(clock):
+    bucket = TokenBucket(rate=1.0, capacity=10.0)
+    bucket.sync(remaining=20, reset_in=None)
+    assert bucket.tokens == 10.0
+    bucket.sync(remaining=3, reset_in=None)
+    assert bucket.tokens == 3.0
+    bucket.sync(remaining=0, reset_in=30)
+    assert bucket.wait_time() == pytest.approx(30.0)
+
+
+def test_acquire_rejects_when_wait_exceeds_max_wait(clock):
+    governor = RateGovernor({"twitch": 60}, burst_seconds=1, max_wait=0.5)
+
+    async def scenario():
+        await governor.acquire("twitch")
+        with pytest.raises(RateLimited) as excinfo:
+            await governor.acquire("twitch")
+        return excinfo.value
+
+    error = asyncio.run(scenario())
+    assert error.provider == "twitch"
+    assert error.wait == pytest.approx(1.0)
+    assert governor.stats()["twitch"]["deferred"] == 1
+
+
+def test_ungoverned_providers_pass_through(clock):
+    governor = RateGovernor({"twitch": 60})
+    asyncio.run(governor.acquire("other"))
+    governor.observe("other", 429, {})
+    assert not governor.governs("other")
+    assert governor.deferral("other", 5) == 0.0
+
+
+def test_429_blocks_for_retry_after(clock):
+    governor = RateGovernor({"youtube": 600})
+    governor.observe("youtube", 429, {"Retry-After": "45"})
+    assert governor.deferral("youtube", 3) == pytest.approx(45.0)
+    stats = governor.stats()["youtube"]
+    assert stats["rejected"] == 1
+    assert stats["deferred"] == 3
+
+    clock.now += 46
+    assert governor.deferral("youtube", 3) == 0.0
+
+
+def test_429_without_hints_uses_default_penalty(clock):
+    governor = RateGovernor({"twitter": 30})
+    governor.observe("twitter", 429, {})
+    assert governor.deferral("twitter", 1) == pytest.approx(rate_limit._DEFAULT_PENALTY_SECONDS)
+
+
+def test_twitch_headers_drain_the_bucket_until_reset(clock):
+    governor = RateGovernor({"twitch": 800})
+    headers = {"Ratelimit-Remaining": "0", "Ratelimit-Reset": str(clock.now + 20)}
+    governor.observe("twitch", 200, headers)
+    assert governor.deferral("twitch", 1) == pytest.approx(20.0)
+    assert governor.stats()["twitch"]["rejected"] == 0
+
+
+def test_429_with_budget_left_is_counted_but_not_blocked(clock):
+    governor = RateGovernor({"twitch": 800})
+    governor.observe("twitch", 429, {"Ratelimit-Remaining": "799"})
+    assert governor.deferral("twitch", 1) == 0.0
+    assert governor.stats()["twitch"]["rejected"] == 1
@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+
+from bot.services import scheduler as scheduler_module
+from bot.services.scheduler import PollScheduler
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(scheduler_module.time, "time", clock)
+    return clock
+
+
+def _register(scheduler, intervals, *, results=None, first_due=None, **options):
+    calls = []
+
+    async def run(batch):
+        calls.append(list(batch))
+        return dict(results or dict.fromkeys(batch, True))
+
+    async def sources():
+        return intervals
+
+    options.setdefault("jitter", 0.0)
+    scheduler.register("test", run, sources, first_due=first_due, **options)
+    return calls
+
+
+def _entry(scheduler):
+    return scheduler._providers["test"]
+
+
+def test_due_sources_are_batched_in_due_order(clock):
+    async def scenario():
+        scheduler = PollScheduler()
+        offsets = {"a": 20, "b": 30, "c": 10, "d": 500}
+        calls = _register(scheduler, dict.fromkeys(offsets, 60.0), first_due=lambda source: clock.now + offsets[source])
+        await scheduler._refresh_sources()
+
+        clock.now += 30
+        scheduler._collect_due(clock.now)
+        scheduler._dispatch(clock.now)
+        await _entry(scheduler).task
+        return calls
+
+    assert asyncio.run(scenario()) == [["c", "a", "b"]]
+
+
+def test_coalesce_pulls_in_sources_due_soon(clock):
+    async def scenario():
+        scheduler = PollScheduler()
+        offsets = {"a": 0, "b": 40, "c": 120}
+        _register(
+            scheduler,
+            dict.fromkeys(offsets, 300.0),
+            first_due=lambda source: clock.now + offsets[source],
+            coalesce=60.0,
+        )
+        await scheduler._refresh_sources()
+        scheduler._collect_due(clock.now)
+        return list(_entry(scheduler).ready)
+
+    assert asyncio.run(scenario()) == ["a", "b"]
+
+
+def test_coalesce_does_not_start_a_batch_on_its_own(clock):
+    async def scenario():
+        scheduler = PollScheduler()
+        _register(scheduler, {"a": 300.0}, first_due=lambda source: clock.now + 30, coalesce=60.0)
+        await scheduler._refresh_sources()
+        scheduler._collect_due(clock.now)
+        return list(_entry(scheduler).ready)
+
+    assert asyncio.run(scenario()) == []
+
+
+def test_failures_back_off_exponentially_up_to_the_cap(clock):
+    async def scenario():
+        scheduler = PollScheduler()
+        _register(scheduler, {"a": 60.0}, results={"a": False}, max_backoff=300.0)
+        await scheduler._refresh_sources()
+        entry = _entry(scheduler)
+        job = entry.jobs["a"]
+        delays = []
+        for _ in range(4):
+            await scheduler._run_batch("test", entry, ["a"])
+            delays.append(job.due_at - clock.now)
+        return job.failures, delays
+
+    failures, delays = asyncio.run(scenario())
+    assert failures == 4
+    assert delays == [120.0, 240.0, 300.0, 300.0]
+
+
+def test_success_resets_backoff(clock):
+    async def scenario():
+        scheduler = PollScheduler()
+        outcome = {"a": False}
+        _register(scheduler, {"a": 60.0}, results=outcome)
+        await scheduler._refresh_sources()
+        entry = _entry(scheduler)
+        await scheduler._run_batch("test", entry, ["a"])
+        outcome["a"] = True
+        await scheduler._run_batch("test", entry, ["a"])
+        job = entry.jobs["a"]
+        return job.failures, job.due_at - clock.now
+
+    assert asyncio.run(scenario()) == (0, 60.0)
+
+
+def test_unreached_sources_retry_soon_without_counting_a_failure(clock):
+    async def scenario():
+        scheduler = PollScheduler()
+        _register(scheduler, {"a": 600.0, "b": 600.0}, results={"a": True})
+        await scheduler._refresh_sources()
+        entry = _entry(scheduler)
+        await scheduler._run_batch("test", entry, ["a", "b"])
+        return entry.jobs["b"].failures, entry.jobs["b"].due_at - clock.now
+
+    assert asyncio.run(scenario()) == (0, scheduler_module._RETRY_SECONDS)
+
+
+def test_paused_provider_keeps_its_sources_ready(clock):
+    async def scenario():
+        scheduler = PollScheduler()
+        calls = _register(scheduler, {"a": 60.0})
+        await scheduler._refresh_sources()
+        scheduler.pause("test", 120)
+        scheduler._collect_due(clock.now)
+        scheduler._dispatch(clock.now)
+        paused_ready = list(_entry(scheduler).ready)
+
+        clock.now += 121
+        scheduler._dispatch(clock.now)
+        await _entry(scheduler).task
+        return paused_ready, calls
+
+    assert asyncio.run(scenario()) == (["a"], [["a"]])
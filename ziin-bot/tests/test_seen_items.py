@@ -0,0 +1,48 @@
+from bot.services.seen_items import filter_unseen, mark_seen, prune_seen_items
+from bot.services.storage import fetchall, now_ts
+
+
+def test_everything_is_unseen_at_first(db):
+    candidates = {"alice": ["3", "2", "3", "", "1"], "bob": []}
+    assert filter_unseen("twitter", candidates) == {"alice": ["3", "2", "1"]}
+
+
+def test_seen_items_are_filtered_out(db):
+    mark_seen("twitter", [("alice", "2"), ("bob", "9")])
+    assert filter_unseen("twitter", {"alice": ["3", "2", "1"], "bob": ["9"]}) == {"alice": ["3", "1"]}
+
+
+def test_items_are_tracked_per_provider_and_source(db):
+    mark_seen("youtube", [("UC1", "v1")])
+    assert filter_unseen("youtube_abandoned", {"UC1": ["v1"]}) == {"UC1": ["v1"]}
+    assert filter_unseen("youtube", {"UC2": ["v1"]}) == {"UC2": ["v1"]}
+
+
+def test_mark_seen_keeps_the_first_timestamp_and_skips_blank_pairs(db):
+    mark_seen("twitter", [("alice", "1")], seen_at=100)
+    mark_seen("twitter", [("alice", "1"), ("", "2"), ("alice", "")], seen_at=200)
+    rows = fetchall("SELECT source_id, item_id, seen_at FROM seen_items")
+    assert [tuple(row) for row in rows] == [("alice", "1", 100)]
+
+
+def test_lookups_larger_than_one_chunk(db):
+    ids = [str(index) for index in range(1000)]
+    mark_seen("twitter", [("alice", item_id) for item_id in ids[::2]])
+    assert filter_unseen("twitter", {"alice": ids}) == {"alice": ids[1::2]}
+
+
+def test_prune_caps_each_source_and_drops_old_items_but_keeps_the_newest(db):
+    now = now_ts()
+    mark_seen("youtube", [("UC1", f"new{index}") for index in range(5)], seen_at=now)
+    mark_seen("youtube", [("UC2", f"old{index}") for index in range(4)], seen_at=now - 10_000)
+    mark_seen("twitter", [("alice", "1")], seen_at=now - 10_000)
+
+    removed = prune_seen_items("youtube", max_age_seconds=1_000, max_per_source=3, keep_per_source=2)
+
+    assert removed == 4
+    remaining = fetchall("SELECT provider, source_id, COUNT(*) AS count FROM seen_items GROUP BY provider, source_id")
+    assert {(row["provider"], row["source_id"]): row["count"] for row in remaining} == {
+        ("youtube", "UC1"): 3,
+        ("youtube", "UC2"): 2,
+        ("twitter", "alice"): 1,
+    }
@@ -0,0 +1,101 @@
+import sqlite3
+
+import pytest
+
+from bot.services import channel_data, subscription_index
+from bot.services.subscription_index import SubscriptionIndex
+
+CHANNEL_ID = "UC" + "a" * 22
+
+
+@pytest.fixture
+def loads(db, monkeypatch):
+    """Count follower loads per provider."""
+    counts = {provider: 0 for provider in subscription_index._PROVIDERS}
+    for provider, (loader, channel_key, text_key) in list(subscription_index._PROVIDERS.items()):
+
+        def counted(loader=loader, provider=provider):
+            counts[provider] += 1
+            return loader()
+
+        monkeypatch.setitem(subscription_index._PROVIDERS, provider, (counted, channel_key, text_key))
+    return counts
+
+
+@pytest.fixture
+def dashboard(db, tmp_path):
+    """A second connection writing like the web dashboard does."""
+    conn = sqlite3.connect(tmp_path / "local.db")
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_700_000_000]
+    monkeypatch.setattr(subscription_index, "now_ts", lambda: now[0])
+    return now
+
+
+def _follow_on_dashboard(conn, guild_id, stamp):
+    with conn:
+        conn.execute(
+            "INSERT INTO twitter_data (server_id, twitter_notification_channel, updated_at) VALUES (?, '5', ?) "
+            "ON CONFLICT(server_id) DO UPDATE SET updated_at = excluded.updated_at",
+            (str(guild_id), stamp),
+        )
+        conn.execute(
+            "INSERT INTO twitter_subscriptions (server_id, account_id, updated_at) VALUES (?, 'alice', ?)",
+            (str(guild_id), stamp),
+        )
+
+
+def test_own_saves_update_the_index_without_reloading(loads):
+    index = SubscriptionIndex()
+    index.refresh()
+    data = channel_data.get_youtube_data(1)
+    data["youtube_notification_channel"] = "12"
+    data["yt_youtuber"] = {CHANNEL_ID: {}}
+    channel_data.save_youtube_data(1, data)
+
+    assert index.guild_ids("youtube", CHANNEL_ID) == {1}
+    assert index.sync() is False
+    assert loads == {"twitch": 1, "youtube": 1, "twitter": 1}
+
+
+def test_dashboard_write_reloads_only_that_provider(loads, dashboard, clock):
+    index = SubscriptionIndex()
+    index.refresh()
+    clock[0] += 10
+
+    _follow_on_dashboard(dashboard, 7, clock[0])
+    assert index.sync() is True
+    assert index.guild_ids("twitter", "alice") == {7}
+    assert loads == {"twitch": 1, "youtube": 1, "twitter": 2}
+
+
+def test_unrelated_dashboard_write_reloads_nothing(loads, dashboard, clock):
+    index = SubscriptionIndex()
+    index.refresh()
+    clock[0] += 10
+
+    with dashboard:
+        dashboard.execute("INSERT INTO guild_settings (server_id, updated_at) VALUES ('7', ?)", (clock[0],))
+    assert index.sync() is False
+    assert index.sync() is False
+    assert loads == {"twitch": 1, "youtube": 1, "twitter": 1}
+
+
+def test_write_in_the_same_second_as_the_last_load_is_not_missed(loads, dashboard, clock):
+    _follow_on_dashboard(dashboard, 7, clock[0])
+    index = SubscriptionIndex()
+    index.refresh()
+
+    with dashboard:
+        dashboard.execute(
+            "INSERT INTO twitter_subscriptions (server_id, account_id, updated_at) VALUES ('7', 'bob', ?)", (clock[0],)
+        )
+        dashboard.execute("UPDATE twitter_data SET updated_at = ? WHERE server_id = '7'", (clock[0],))
+    clock[0] += 1
+    assert index.sync() is True
+    assert index.guild_ids("twitter", "bob") == {7}
@@ -0,0 +1,95 @@
+import sqlite3
+
+import pytest
+
+from bot.services import channel_data
+from bot.services.channel_data import _TWITTER_SUBSCRIPTION_FIELDS, _diff_subscriptions
+from bot.services.storage import execute, fetchall, transaction
+
+
+def _rows():
+    rows = fetchall("SELECT account_id, display_name, tweet_id, updated_at FROM twitter_subscriptions WHERE server_id = '1'")
+    return {row["account_id"]: (row["display_name"], row["tweet_id"], row["updated_at"]) for row in rows}
+
+
+def _diff(items, updated_at, server_id="1"):
+    channel_data._ensure_split_tables_schema()
+    _diff_subscriptions("twitter_subscriptions", "account_id", _TWITTER_SUBSCRIPTION_FIELDS, server_id, items, updated_at)
+
+
+def test_diff_inserts_new_rows(db):
+    _diff({"alice": {"name": "Alice", "tweetId": "10"}, "bob": {}}, 100)
+    assert _rows() == {"alice": ("Alice", "10", 100), "bob": (None, None, 100)}
+
+
+def test_diff_touches_only_changed_rows(db):
+    _diff({"alice": {"name": "Alice", "tweetId": "10"}, "bob": {"name": "Bob"}, "carol": {}}, 100)
+    _diff({"alice": {"name": "Alice", "tweetId": "11"}, "bob": {"name": "Bob"}, "dave": {}}, 200)
+    assert _rows() == {
+        "alice": ("Alice", "11", 200),
+        "bob": ("Bob", None, 100),
+        "dave": (None, None, 200),
+    }
+
+
+def test_diff_leaves_other_guilds_alone(db):
+    _diff({"alice": {}}, 100)
+    _diff({}, 200, server_id="2")
+    assert set(_rows()) == {"alice"}
+
+
+def test_save_keeps_unchanged_subscriptions_untouched(db, monkeypatch):
+    data = channel_data.get_twitter_data(1)
+    data["twitter_accounts"] = {"alice": {"name": "Alice"}, "bob": {}}
+    monkeypatch.setattr(channel_data, "now_ts", lambda: 100)
+    channel_data.save_twitter_data(1, data)
+
+    data = channel_data.get_twitter_data(1)
+    data["twitter_accounts"].pop("bob")
+    data["twitter_accounts"]["carol"] = {}
+    monkeypatch.setattr(channel_data, "now_ts", lambda: 200)
+    channel_data.save_twitter_data(1, data)
+
+    assert {account: stamp for account, (_, _, stamp) in _rows().items()} == {"alice": 100, "carol": 200}
+
+
+def test_transaction_commits_once_at_the_end(db, tmp_path):
+    other = sqlite3.connect(tmp_path / "local.db")
+    try:
+        with transaction():
+            execute("INSERT INTO guild_settings (server_id) VALUES ('1')")
+            with transaction():
+                execute("INSERT INTO guild_settings (server_id) VALUES ('2')")
+            assert other.execute("SELECT COUNT(*) FROM guild_settings").fetchone()[0] == 0
+        assert other.execute("SELECT COUNT(*) FROM guild_settings").fetchone()[0] == 2
+    finally:
+        other.close()
+
+
+def test_transaction_rolls_back_everything_on_error(db):
+    with pytest.raises(RuntimeError):
+        with transaction():
+            execute("INSERT INTO guild_settings (server_id) VALUES ('1')")
+            with transaction():
+                execute("INSERT INTO guild_settings (server_id) VALUES ('2')")
+            raise RuntimeError("boom")
+    assert fetchall("SELECT server_id FROM guild_settings") == []
+
+    execute("INSERT INTO guild_settings (server_id) VALUES ('3')")
+    assert [row["server_id"] for row in fetchall("SELECT server_id FROM guild_settings")] == ["3"]
+
+
+def test_failed_save_leaves_the_previous_subscriptions(db, monkeypatch):
+    data = channel_data.get_twitter_data(1)
+    data["twitter_accounts"] = {"alice": {}}
+    channel_data.save_twitter_data(1, data)
+
+    def failing_diff(*args, **kwargs):
+        execute("DELETE FROM twitter_subscriptions WHERE server_id = '1'")
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(channel_data, "_diff_subscriptions", failing_diff)
+    data["twitter_accounts"] = {"bob": {}}
+    with pytest.raises(sqlite3.OperationalError):
+        channel_data.save_twitter_data(1, data)
+    assert set(_rows()) == {"alice"}
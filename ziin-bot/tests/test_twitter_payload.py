@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from bot.cogs import twitter
+from bot.cogs.twitter import _extract_first_image_url, _extract_first_video_url, _extract_profile_image_url
+
+MEDIA = {"media": [{"media_url_https": "m.jpg"}]}
+PHOTOS = {"photos": [{"url": "p.jpg"}]}
+EXTENDED = {"extendedEntities": {"media": [{"media_url_https": "ee.jpg"}]}}
+
+TWEETS = [
+    {"id": "1", **EXTENDED},
+    {"id": "2", **MEDIA, **EXTENDED},
+    {"id": "3", **PHOTOS, **EXTENDED},
+    {"id": "4", "media": [], **PHOTOS},
+    {"id": "5", **MEDIA, **PHOTOS, **EXTENDED},
+    {"id": "6"},
+    {"id": "7", "user": {"profile_image_url_https": "u.png"}},
+    {"id": "8", "author": {"profilePicture": "a.png"}, "user": {"profile_image_url_https": "u.png"}},
+    {"id": "9", "author": {}, "user": {"avatar": "u2.png"}},
+    {"id": "10", "video": {"url": "v.mp4"}, "extendedEntities": {"media": [{"type": "video", "url": "ee.mp4"}]}},
+    {"id": "11", "extendedEntities": {"media": [{"type": "video", "url": "ee.mp4"}]}},
+]
+
+EXPECTED = {
+    "1": ("ee.jpg", "", ""),
+    "2": ("m.jpg", "", ""),
+    "3": ("p.jpg", "", ""),
+    "4": ("p.jpg", "", ""),
+    "5": ("m.jpg", "", ""),
+    "6": ("", "", ""),
+    "7": ("", "", "u.png"),
+    "8": ("", "", "a.png"),
+    "9": ("", "", "u2.png"),
+    "10": ("ee.mp4", "v.mp4", ""),
+    "11": ("ee.mp4", "ee.mp4", ""),
+}
+
+
+@pytest.fixture(autouse=True)
+def cold_shape():
+    twitter._reset_payload_shape()
+    yield
+    twitter._reset_payload_shape()
+
+
+def _read(tweet):
+    return _extract_first_image_url(tweet), _extract_first_video_url(tweet), _extract_profile_image_url(tweet)
+
+
+def test_fields_follow_the_fixed_container_priority():
+    assert {tweet["id"]: _read(tweet) for tweet in TWEETS} == EXPECTED
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_fields_do_not_depend_on_earlier_tweets(seed):
+    tweets = TWEETS * 2
+    random.Random(seed).shuffle(tweets)
+    assert {tweet["id"]: _read(tweet) for tweet in tweets} == EXPECTED
+
+
+def test_extended_entities_only_tweet_does_not_change_the_next_answer():
+    _extract_first_image_url({"id": "1", **EXTENDED})
+    assert _extract_first_image_url({"id": "2", **MEDIA, **EXTENDED}) == "m.jpg"
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta, timezone
+
+from bot.cogs.twitter import _MAX_QUERY_LENGTH, _build_search_queries, _plan_searches
+
+UNTIL = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+SINCE = UNTIL - timedelta(minutes=10)
+
+
+def test_queries_pack_handles_under_the_length_limit():
+    handles = [f"handle_{index:03d}" for index in range(120)]
+    queries = _build_search_queries(handles, SINCE, UNTIL)
+
+    assert len(queries) > 1
+    assert all(len(query) <= _MAX_QUERY_LENGTH for query, _ in queries)
+    assert [handle for _, group in queries for handle in group] == handles
+    for query, group in queries:
+        assert query.startswith("(" + " OR ".join(f"from:{handle}" for handle in group) + ")")
+        assert "since:2026-01-01_11:50:00_UTC until:2026-01-01_12:00:00_UTC -is:retweet" in query
+
+
+def test_single_handle_gets_one_query():
+    assert _build_search_queries(["alice"], SINCE, UNTIL) == [
+        ("(from:alice) since:2026-01-01_11:50:00_UTC until:2026-01-01_12:00:00_UTC -is:retweet", ["alice"])
+    ]
+
+
+def test_since_id_is_the_smallest_id_in_the_group():
+    since_ids = {"alice": "1900000000000000000", "bob": "950", "carol": "1000"}
+    [(query, _)] = _build_search_queries(["alice", "bob", "carol"], SINCE, UNTIL, since_ids)
+    assert query.endswith(" since_id:950")
+
+
+def test_since_id_is_left_out_when_any_handle_has_no_cursor():
+    since_ids = {"alice": "1000", "bob": ""}
+    [(query, _)] = _build_search_queries(["alice", "bob", "carol"], SINCE, UNTIL, since_ids)
+    assert "since_id:" not in query
+
+
+def test_since_id_counts_towards_the_length_limit():
+    handles = [f"handle_{index:03d}" for index in range(120)]
+    since_ids = dict.fromkeys(handles, "1900000000000000000")
+    queries = _build_search_queries(handles, SINCE, UNTIL, since_ids)
+    assert all(len(query) <= _MAX_QUERY_LENGTH for query, _ in queries)
+    assert all(query.endswith(" since_id:1900000000000000000") for query, _ in queries)
+
+
+def test_plan_searches_normalizes_handles_and_keeps_their_cursors():
+    since_ids = {"@Alice": "12", "https://x.com/Bob": "7"}
+    [(query, monitored)] = _plan_searches(["@Alice", "https://x.com/Bob"], SINCE, UNTIL, since_ids)
+    assert monitored == {"alice": "@Alice", "bob": "https://x.com/Bob"}
+    assert query.startswith("(from:alice OR from:bob)")
+    assert query.endswith(" since_id:7")
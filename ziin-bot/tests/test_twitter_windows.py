@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import types
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from bot.cogs import twitter
+from bot.cogs.twitter import _WINDOW_OVERLAP, _plan_windows
+from bot.services.rate_limit import RateGovernor
+from bot.services.scheduler import PollScheduler
+from bot.services.twitter_state import load_twitter_cursors
+
+UNTIL = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+EARLIEST = UNTIL - timedelta(minutes=60)
+
+
+def _cursor(at: datetime, tweet_id: str = "") -> dict:
+    return {"last_tweet_id": tweet_id, "last_checked_at": int(at.timestamp())}
+
+
+def test_new_handles_start_at_the_backfill_limit():
+    windows, clamped = _plan_windows(["alice", "bob"], {}, UNTIL, EARLIEST)
+    assert windows == {EARLIEST: ["alice", "bob"]}
+    assert clamped == {}
+
+
+def test_resumed_handles_share_one_window_from_the_oldest_cursor_minus_overlap():
+    cursors = {"alice": _cursor(UNTIL - timedelta(minutes=5)), "bob": _cursor(UNTIL - timedelta(minutes=10))}
+    windows, clamped = _plan_windows(["alice", "bob", "carol"], cursors, UNTIL, EARLIEST)
+    assert windows == {
+        EARLIEST: ["carol"],
+        UNTIL - timedelta(minutes=10) - _WINDOW_OVERLAP: ["alice", "bob"],
+    }
+    assert clamped == {}
+
+
+def test_cursors_older_than_the_backfill_limit_are_clamped_and_reported():
+    stale = UNTIL - timedelta(hours=3)
+    cursors = {"alice": _cursor(stale), "bob": _cursor(UNTIL - timedelta(minutes=5))}
+    windows, clamped = _plan_windows(["alice", "bob"], cursors, UNTIL, EARLIEST)
+    assert windows == {EARLIEST: ["alice", "bob"]}
+    assert clamped == {"alice": stale - _WINDOW_OVERLAP}
+
+
+def test_cursor_ahead_of_now_still_gets_a_window():
+    cursors = {"alice": _cursor(UNTIL + timedelta(minutes=5))}
+    windows, _ = _plan_windows(["alice"], cursors, UNTIL, EARLIEST)
+    assert windows == {UNTIL - timedelta(seconds=5): ["alice"]}
+
+
+def _tweet(tweet_id: str, handle: str, at: datetime) -> dict:
+    return {
+        "id": tweet_id,
+        "text": f"tweet {tweet_id}",
+        "author": {"userName": handle},
+        "createdAt": at.strftime("%a %b %d %H:%M:%S +0000 %Y"),
+    }
+
+
+@pytest.fixture
+def cog(db, monkeypatch):
+    settings = types.SimpleNamespace(
+        twitter_poll_seconds=600,
+        twitter_concurrency=2,
+        twitter_max_posts_per_guild=5,
+        twitter_max_backfill_minutes=60,
+        seen_items_max_age_days=90,
+        seen_items_max_per_source=200,
+    )
+    bot = types.SimpleNamespace(
+        settings=settings,
+        governor=RateGovernor({"twitter": 600}),
+        scheduler=PollScheduler(),
+        http_client=None,
+        get_channel=lambda channel_id: None,
+    )
+    return twitter.Twitter(bot)
+
+
+def _search_returning(monkeypatch, rows, truncated):
+    queries = []
+
+    async def search_window(http, query):
+        queries.append(query)
+        return rows, truncated
+
+    monkeypatch.setattr(twitter, "_search_window", search_window)
+    return queries
+
+
+def test_complete_search_advances_cursors(cog, monkeypatch):
+    now = datetime.now(timezone.utc)
+    _search_returning(monkeypatch, [_tweet("12", "alice", now), _tweet("11", "alice", now)], truncated=False)
+
+    results = asyncio.run(cog._poll_handles(["alice", "bob"]))
+
+    assert results == {"alice": True, "bob": True}
+    cursors = load_twitter_cursors()
+    assert cursors["alice"]["last_tweet_id"] == "12"
+    assert cursors["alice"]["last_checked_at"] >= int(now.timestamp())
+    assert cursors["bob"]["last_tweet_id"] == ""
+
+
+def test_truncated_search_keeps_cursors(cog, monkeypatch):
+    before = _cursor(datetime.now(timezone.utc) - timedelta(minutes=30), "5")
+    cog._cursors = {"alice": dict(before)}
+    now = datetime.now(timezone.utc)
+    queries = _search_returning(monkeypatch, [_tweet("12", "alice", now)], truncated=True)
+
+    results = asyncio.run(cog._poll_handles(["alice"]))
+
+    assert results == {"alice": True}
+    assert cog._cursors["alice"] == before
+    assert "alice" not in load_twitter_cursors()
+    assert queries[0].endswith(" since_id:5")
+
+
+def test_clamped_cursor_logs_a_warning(cog, monkeypatch, caplog):
+    cog._cursors = {"alice": _cursor(datetime.now(timezone.utc) - timedelta(hours=3), "5")}
+    _search_returning(monkeypatch, [], truncated=False)
+
+    with caplog.at_level(logging.WARNING, logger="__main__"):
+        asyncio.run(cog._poll_handles(["alice", "bob"]))
+
+    warnings = [record.getMessage() for record in caplog.records if record.levelno == logging.WARNING]
+    assert len(warnings) == 1
+    assert "TWITTER_MAX_BACKFILL_MINUTES=60" in warnings[0]
+    assert warnings[0].endswith(": alice")
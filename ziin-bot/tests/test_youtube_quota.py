@@ -0,0 +1,118 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from bot.services import youtube_quota
+from bot.services.youtube_quota import YouTubeQuota, quota_day, seconds_until_reset
+from bot.services.youtube_state import load_youtube_quota_usage
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(youtube_quota._QUOTA_TZ, "key"), reason="needs the America/Los_Angeles zone from tzdata"
+)
+
+
+def _ts(*args: int) -> float:
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+class Clock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # 10:00 Pacific (PST, UTC-8) on a regular day: 14 hours until the reset.
+    clock = Clock(_ts(2026, 1, 15, 18, 0))
+    monkeypatch.setattr(youtube_quota.time, "time", clock)
+    return clock
+
+
+def test_quota_day_turns_over_at_pacific_midnight():
+    assert quota_day(_ts(2026, 1, 15, 7, 59, 59)) == "2026-01-14"
+    assert quota_day(_ts(2026, 1, 15, 8, 0, 0)) == "2026-01-15"
+    assert quota_day(_ts(2026, 7, 15, 7, 0, 0)) == "2026-07-15"  # PDT, UTC-7
+    assert seconds_until_reset(_ts(2026, 1, 15, 7, 59, 0)) == 60
+
+
+def test_dst_days_are_23_and_25_hours_long():
+    assert seconds_until_reset(_ts(2026, 3, 8, 8, 0)) == 23 * 3600
+    assert seconds_until_reset(_ts(2026, 11, 1, 7, 0)) == 25 * 3600
+
+
+def test_spend_rolls_over_to_a_new_day(db, clock):
+    quota = YouTubeQuota(10_000)
+    quota.charge("search")
+    quota.charge("videos", calls=3)
+    assert (quota.spent, quota.calls) == (103, 4)
+
+    clock.now = _ts(2026, 1, 16, 7, 59, 59)
+    assert quota.spent == 103
+
+    clock.now = _ts(2026, 1, 16, 8, 0, 0)
+    assert (quota.spent, quota.calls) == (0, 0)
+    assert load_youtube_quota_usage("2026-01-15") == (103, 4)
+
+    quota.charge("channels")
+    quota.flush()
+    assert load_youtube_quota_usage("2026-01-16") == (1, 1)
+
+
+def test_spend_survives_a_restart(db, clock):
+    quota = YouTubeQuota(10_000)
+    quota.charge("playlistItems", calls=7)
+    quota.flush()
+    assert YouTubeQuota(10_000).spent == 7
+
+
+def test_intervals_follow_upload_gap_and_followers(db, clock):
+    quota = YouTubeQuota(1_000_000)
+    intervals = quota.plan_intervals(
+        {
+            "daily": (1, 86_400),
+            "popular": (4, 86_400),
+            "new": (1, 0),
+            "prolific": (1, 600),
+            "dormant": (1, 10_000_000),
+        },
+        min_seconds=300,
+        max_seconds=21_600,
+        poll_cost=1,
+    )
+    assert intervals == {
+        "daily": 8640,
+        "popular": 2880,  # 8640 / (1 + log2(4))
+        "new": 300,
+        "prolific": 300,
+        "dormant": 21_600,
+    }
+
+
+def test_intervals_stretch_evenly_to_fit_the_remaining_budget(db, clock):
+    quota = YouTubeQuota(1_000)
+    # 900 units of polling budget over 14 hours, against 10 channels every 300s.
+    channels = {f"c{index}": (1, 0) for index in range(10)} | {"slow": (1, 30_000)}
+    intervals = quota.plan_intervals(channels, min_seconds=300, max_seconds=21_600, poll_cost=1)
+
+    allowed = 900 / (14 * 3600)
+    projected = 10 / 300 + 1 / 3000
+    scale = projected / allowed
+    assert intervals["c0"] == pytest.approx(300 * scale, abs=1)
+    assert intervals["slow"] == pytest.approx(3000 * scale, abs=1)
+    assert sum(1 / interval for interval in intervals.values()) <= allowed * 1.001
+
+
+def test_intervals_are_not_shortened_when_the_budget_is_ample(db, clock):
+    quota = YouTubeQuota(1_000_000)
+    assert quota.plan_intervals({"c": (1, 0)}, min_seconds=300, max_seconds=21_600, poll_cost=1) == {"c": 300}
+
+
+def test_spent_budget_pushes_the_next_poll_past_the_reset(db, clock):
+    quota = YouTubeQuota(1_000)
+    quota.charge("playlistItems", calls=900)
+    intervals = quota.plan_intervals({"a": (1, 0), "b": (1, 30_000)}, min_seconds=300, max_seconds=21_600, poll_cost=1)
+    assert intervals["a"] == 14 * 3600
+    assert intervals["b"] == 10 * 14 * 3600
@@ -68,7 +68,6 @@ export async function PUT(request: NextRequest, context: { params: Promise<{ ser
       id: string;
       name: string;
       tweetId: string;
-      tweetHistory: string[];
     }>;
   } = {};
 
@@ -85,10 +84,7 @@ export async function PUT(request: NextRequest, context: { params: Promise<{ ser
       .map((item) => ({
         id: typeof item.id === "string" ? item.id : "",
         name: typeof item.name === "string" ? item.name : "",
-        tweetId: typeof item.tweetId === "string" ? item.tweetId : "",
-        tweetHistory: Array.isArray(item.tweetHistory)
-          ? item.tweetHistory.filter((value): value is string => typeof value === "string")
-          : []
+        tweetId: typeof item.tweetId === "string" ? item.tweetId : ""
       }))
       .filter((item) => item.id.trim().length > 0);
   }
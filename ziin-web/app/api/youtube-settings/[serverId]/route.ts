@@ -70,9 +70,6 @@ export async function PUT(request: NextRequest, context: { params: Promise<{ ser
       videoId: string;
       streamId: string;
       shortId: string;
-      videoHistory: string[];
-      streamHistory: string[];
-      shortHistory: string[];
     }>;
   } = {};
 
@@ -91,16 +88,7 @@ export async function PUT(request: NextRequest, context: { params: Promise<{ ser
         name: typeof item.name === "string" ? item.name : "",
         videoId: typeof item.videoId === "string" ? item.videoId : "",
         streamId: typeof item.streamId === "string" ? item.streamId : "",
-        shortId: typeof item.shortId === "string" ? item.shortId : "",
-        videoHistory: Array.isArray(item.videoHistory)
-          ? item.videoHistory.filter((value): value is string => typeof value === "string")
-          : [],
-        streamHistory: Array.isArray(item.streamHistory)
-          ? item.streamHistory.filter((value): value is string => typeof value === "string")
-          : [],
-        shortHistory: Array.isArray(item.shortHistory)
-          ? item.shortHistory.filter((value): value is string => typeof value === "string")
-          : []
+        shortId: typeof item.shortId === "string" ? item.shortId : ""
       }))
       .filter((item) => item.id.trim().length > 0);
   }
@@ -77,9 +77,6 @@ type YouTubeSubscription = {
   videoId: string;
   streamId: string;
   shortId: string;
-  videoHistory: string[];
-  streamHistory: string[];
-  shortHistory: string[];
 };
 
 type ServerSettingsSnapshot = {
@@ -104,7 +101,6 @@ type TwitterSubscription = {
   id: string;
   name: string;
   tweetId: string;
-  tweetHistory: string[];
 };
 
 type TwitterSettingsSnapshot = {
@@ -697,8 +693,7 @@ export default function Page() {
       {
         id: value,
         name: value,
-        tweetId: "",
-        tweetHistory: []
+        tweetId: ""
       }
     ]);
     setNewTwitterAccount("");
@@ -787,10 +782,7 @@ export default function Page() {
           name: typeof result.channelName === "string" && result.channelName ? result.channelName : channelId,
           videoId: "",
           streamId: "",
-          shortId: "",
-          videoHistory: [],
-          streamHistory: [],
-          shortHistory: []
+          shortId: ""
         }
       ]);
       setNewYouTubeChannelInput("");
@@ -1057,8 +1049,7 @@ export default function Page() {
           return {
             id,
             name: id,
-            tweetId: "",
-            tweetHistory: []
+            tweetId: ""
           };
         });
       });
@@ -1081,10 +1072,7 @@ export default function Page() {
             name: id,
             videoId: "",
             streamId: "",
-            shortId: "",
-            videoHistory: [],
-            streamHistory: [],
-            shortHistory: []
+            shortId: ""
           };
         });
       });
@@ -1370,16 +1358,7 @@ export default function Page() {
               name: typeof item.name === "string" ? item.name : typeof item.id === "string" ? item.id : "",
               videoId: typeof item.videoId === "string" ? item.videoId : "",
               streamId: typeof item.streamId === "string" ? item.streamId : "",
-              shortId: typeof item.shortId === "string" ? item.shortId : "",
-              videoHistory: Array.isArray(item.videoHistory)
-                ? item.videoHistory.filter((value): value is string => typeof value === "string")
-                : [],
-              streamHistory: Array.isArray(item.streamHistory)
-                ? item.streamHistory.filter((value): value is string => typeof value === "string")
-                : [],
-              shortHistory: Array.isArray(item.shortHistory)
-                ? item.shortHistory.filter((value): value is string => typeof value === "string")
-                : []
+              shortId: typeof item.shortId === "string" ? item.shortId : ""
             }))
             .filter((item) => item.id)
         : [];
@@ -1399,10 +1378,7 @@ export default function Page() {
                   ? item.id.trim().toLowerCase().replace(/^@+/, "")
                   : "",
               name: typeof item.name === "string" ? item.name : typeof item.id === "string" ? item.id : "",
-              tweetId: typeof item.tweetId === "string" ? item.tweetId : "",
-              tweetHistory: Array.isArray(item.tweetHistory)
-                ? item.tweetHistory.filter((value): value is string => typeof value === "string")
-                : []
+              tweetId: typeof item.tweetId === "string" ? item.tweetId : ""
             }))
             .filter((item) => item.id)
         : [];
@@ -28,9 +28,6 @@ type YouTubeSubscriptionRecord = {
   videoId: string;
   streamId: string;
   shortId: string;
-  videoHistory: string[];
-  streamHistory: string[];
-  shortHistory: string[];
 };
 
 type YouTubeSettingsRecord = {
@@ -43,7 +40,6 @@ type TwitterSubscriptionRecord = {
   id: string;
   name: string;
   tweetId: string;
-  tweetHistory: string[];
 };
 
 type TwitterSettingsRecord = {
@@ -145,6 +141,9 @@ const normalizeStringList = (values: unknown): string[] => {
   return result;
 };
 
+const normalizeTwitchLogins = (values: unknown): string[] =>
+  normalizeStringList(Array.isArray(values) ? values.map((value) => (typeof value === "string" ? value.toLowerCase() : value)) : values);
+
 const normalizeChannelId = (value: unknown): string | null => {
   if (value === null || value === undefined) {
     return null;
@@ -171,6 +170,16 @@ const ensureNotificationTables = (db: Database.Database) => {
       updated_at INTEGER
     );
 
+    CREATE TABLE IF NOT EXISTS twitch_subscriptions (
+      server_id TEXT NOT NULL,
+      login TEXT NOT NULL,
+      is_live INTEGER NOT NULL DEFAULT 0 CHECK (is_live IN (0, 1)),
+      stream_id TEXT,
+      last_seen_live INTEGER,
+      updated_at INTEGER,
+      PRIMARY KEY (server_id, login)
+    );
+
     CREATE TABLE IF NOT EXISTS youtube_data (
       server_id TEXT PRIMARY KEY,
       youtube_notification_text TEXT NOT NULL DEFAULT '**{ytber}** upload a video!!\\n**{url}**',
@@ -185,9 +194,6 @@ const ensureNotificationTables = (db: Database.Database) => {
       video_id TEXT,
       stream_id TEXT,
       short_id TEXT,
-      video_history TEXT NOT NULL DEFAULT '[]',
-      stream_history TEXT NOT NULL DEFAULT '[]',
-      short_history TEXT NOT NULL DEFAULT '[]',
       updated_at INTEGER,
       PRIMARY KEY (server_id, youtuber_id)
     );
@@ -204,39 +210,17 @@ const ensureNotificationTables = (db: Database.Database) => {
       account_id TEXT NOT NULL,
       display_name TEXT,
       tweet_id TEXT,
-      tweet_history TEXT NOT NULL DEFAULT '[]',
       updated_at INTEGER,
       PRIMARY KEY (server_id, account_id)
     );
 
     CREATE INDEX IF NOT EXISTS idx_twitch_data_server_id ON twitch_data(server_id);
+    CREATE INDEX IF NOT EXISTS idx_twitch_subscriptions_login ON twitch_subscriptions(login, is_live);
     CREATE INDEX IF NOT EXISTS idx_youtube_data_server_id ON youtube_data(server_id);
     CREATE INDEX IF NOT EXISTS idx_youtube_subscriptions_server_id ON youtube_subscriptions(server_id);
     CREATE INDEX IF NOT EXISTS idx_twitter_data_server_id ON twitter_data(server_id);
     CREATE INDEX IF NOT EXISTS idx_twitter_subscriptions_server_id ON twitter_subscriptions(server_id);
   `);
-
-  const columns = db
-    .prepare("PRAGMA table_info(youtube_subscriptions)")
-    .all() as Array<{ name: string }>;
-  const names = new Set(columns.map((column) => column.name));
-  if (!names.has("video_history")) {
-    db.exec("ALTER TABLE youtube_subscriptions ADD COLUMN video_history TEXT NOT NULL DEFAULT '[]'");
-  }
-  if (!names.has("stream_history")) {
-    db.exec("ALTER TABLE youtube_subscriptions ADD COLUMN stream_history TEXT NOT NULL DEFAULT '[]'");
-  }
-  if (!names.has("short_history")) {
-    db.exec("ALTER TABLE youtube_subscriptions ADD COLUMN short_history TEXT NOT NULL DEFAULT '[]'");
-  }
-
-  const twitterColumns = db
-    .prepare("PRAGMA table_info(twitter_subscriptions)")
-    .all() as Array<{ name: string }>;
-  const twitterNames = new Set(twitterColumns.map((column) => column.name));
-  if (!twitterNames.has("tweet_history")) {
-    db.exec("ALTER TABLE twitter_subscriptions ADD COLUMN tweet_history TEXT NOT NULL DEFAULT '[]'");
-  }
 };
 
 const ensureGuildSettingsDefaults = (db: Database.Database, serverId: string) => {
@@ -472,30 +456,8 @@ const normalizeYouTubeSubscriptions = (values: unknown): YouTubeSubscriptionReco
     const videoId = typeof record.videoId === "string" ? record.videoId.trim() : "";
     const streamId = typeof record.streamId === "string" ? record.streamId.trim() : "";
     const shortId = typeof record.shortId === "string" ? record.shortId.trim() : "";
-    const videoHistory = normalizeStringList(record.videoHistory);
-    const streamHistory = normalizeStringList(record.streamHistory);
-    const shortHistory = normalizeStringList(record.shortHistory);
-
-    if (videoId && !videoHistory.includes(videoId)) {
-      videoHistory.push(videoId);
-    }
-    if (streamId && !streamHistory.includes(streamId)) {
-      streamHistory.push(streamId);
-    }
-    if (shortId && !shortHistory.includes(shortId)) {
-      shortHistory.push(shortId);
-    }
 
-    result.push({
-      id,
-      name,
-      videoId,
-      streamId,
-      shortId,
-      videoHistory,
-      streamHistory,
-      shortHistory
-    });
+    result.push({ id, name, videoId, streamId, shortId });
   }
 
   return result;
@@ -528,12 +490,27 @@ export const getTwitchSettings = async (serverId: string): Promise<TwitchSetting
       }
     | undefined;
 
+  const subscriptions = db
+    .prepare("SELECT login, is_live FROM twitch_subscriptions WHERE server_id = ? ORDER BY rowid")
+    .all(serverId) as Array<{ login: string; is_live: number }>;
+
+  // Guilds the bot has not migrated yet only have the legacy JSON lists.
+  if (subscriptions.length === 0) {
+    return {
+      TwitchNotificationChannel: row?.twitch_notification_channel ?? null,
+      TwitchNotificationText: row?.twitch_notification_text ?? DEFAULT_TWITCH_NOTIFICATION_TEXT,
+      AllStreamers: parseJsonArray(row?.all_streamers),
+      OnlineStreamers: parseJsonArray(row?.online_streamers),
+      OfflineStreamers: parseJsonArray(row?.offline_streamers)
+    };
+  }
+
   return {
     TwitchNotificationChannel: row?.twitch_notification_channel ?? null,
     TwitchNotificationText: row?.twitch_notification_text ?? DEFAULT_TWITCH_NOTIFICATION_TEXT,
-    AllStreamers: parseJsonArray(row?.all_streamers),
-    OnlineStreamers: parseJsonArray(row?.online_streamers),
-    OfflineStreamers: parseJsonArray(row?.offline_streamers)
+    AllStreamers: subscriptions.map((item) => item.login),
+    OnlineStreamers: subscriptions.filter((item) => item.is_live === 1).map((item) => item.login),
+    OfflineStreamers: subscriptions.filter((item) => item.is_live !== 1).map((item) => item.login)
   };
 };
 
@@ -557,7 +534,7 @@ export const upsertTwitchSettings = async (
   }
   if (partial.AllStreamers !== undefined) {
     updates.push("all_streamers = ?");
-    values.push(JSON.stringify(normalizeStringList(partial.AllStreamers)));
+    values.push(JSON.stringify(normalizeTwitchLogins(partial.AllStreamers)));
   }
   if (partial.OnlineStreamers !== undefined) {
     updates.push("online_streamers = ?");
@@ -572,9 +549,49 @@ export const upsertTwitchSettings = async (
     return;
   }
 
+  const ts = nowTs();
   updates.push("updated_at = ?");
-  values.push(nowTs());
-  db.prepare(`UPDATE twitch_data SET ${updates.join(", ")} WHERE server_id = ?`).run(...values, serverId);
+  values.push(ts);
+
+  const setLive = db.prepare(
+    "UPDATE twitch_subscriptions SET is_live = ?, updated_at = ? WHERE server_id = ? AND login = ?"
+  );
+  const transaction = db.transaction(() => {
+    db.prepare(`UPDATE twitch_data SET ${updates.join(", ")} WHERE server_id = ?`).run(...values, serverId);
+
+    if (partial.AllStreamers !== undefined) {
+      const logins = normalizeTwitchLogins(partial.AllStreamers);
+      const existing = new Set(
+        (
+          db.prepare("SELECT login FROM twitch_subscriptions WHERE server_id = ?").all(serverId) as Array<{
+            login: string;
+          }>
+        ).map((item) => item.login)
+      );
+      const wanted = new Set(logins);
+      const remove = db.prepare("DELETE FROM twitch_subscriptions WHERE server_id = ? AND login = ?");
+      const insert = db.prepare(
+        "INSERT INTO twitch_subscriptions (server_id, login, is_live, updated_at) VALUES (?, ?, 0, ?)"
+      );
+      for (const login of existing) {
+        if (!wanted.has(login)) {
+          remove.run(serverId, login);
+        }
+      }
+      for (const login of logins) {
+        if (!existing.has(login)) {
+          insert.run(serverId, login, ts);
+        }
+      }
+    }
+    for (const login of normalizeTwitchLogins(partial.OnlineStreamers ?? [])) {
+      setLive.run(1, ts, serverId, login);
+    }
+    for (const login of normalizeTwitchLogins(partial.OfflineStreamers ?? [])) {
+      setLive.run(0, ts, serverId, login);
+    }
+  });
+  transaction();
 };
 
 export const getYouTubeSettings = async (serverId: string): Promise<YouTubeSettingsRecord> => {
@@ -606,10 +623,7 @@ export const getYouTubeSettings = async (serverId: string): Promise<YouTubeSetti
           channel_name,
           video_id,
           stream_id,
-          short_id,
-          video_history,
-          stream_history,
-          short_history
+          short_id
         FROM youtube_subscriptions
         WHERE server_id = ?
       `
@@ -620,42 +634,18 @@ export const getYouTubeSettings = async (serverId: string): Promise<YouTubeSetti
     video_id: string | null;
     stream_id: string | null;
     short_id: string | null;
-    video_history: string | null;
-    stream_history: string | null;
-    short_history: string | null;
   }>;
 
   return {
     YouTubeNotificationChannel: row?.youtube_notification_channel ?? null,
     YouTubeNotificationText: row?.youtube_notification_text ?? DEFAULT_YOUTUBE_NOTIFICATION_TEXT,
-    YouTubers: youtubers.map((item) => {
-      const id = item.youtuber_id;
-      const videoHistory = parseJsonArray(item.video_history);
-      const streamHistory = parseJsonArray(item.stream_history);
-      const shortHistory = parseJsonArray(item.short_history);
-      const videoId = item.video_id ?? "";
-      const streamId = item.stream_id ?? "";
-      const shortId = item.short_id ?? "";
-      if (videoId && !videoHistory.includes(videoId)) {
-        videoHistory.push(videoId);
-      }
-      if (streamId && !streamHistory.includes(streamId)) {
-        streamHistory.push(streamId);
-      }
-      if (shortId && !shortHistory.includes(shortId)) {
-        shortHistory.push(shortId);
-      }
-      return {
-        id,
-        name: item.channel_name?.trim() || id,
-        videoId,
-        streamId,
-        shortId,
-        videoHistory,
-        streamHistory,
-        shortHistory
-      };
-    })
+    YouTubers: youtubers.map((item) => ({
+      id: item.youtuber_id,
+      name: item.channel_name?.trim() || item.youtuber_id,
+      videoId: item.video_id ?? "",
+      streamId: item.stream_id ?? "",
+      shortId: item.short_id ?? ""
+    }))
   };
 };
 
@@ -696,12 +686,9 @@ export const upsertYouTubeSettings = async (
           video_id,
           stream_id,
           short_id,
-          video_history,
-          stream_history,
-          short_history,
           updated_at
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
       `
     );
 
@@ -715,9 +702,6 @@ export const upsertYouTubeSettings = async (
           item.videoId,
           item.streamId,
           item.shortId,
-          JSON.stringify(item.videoHistory),
-          JSON.stringify(item.streamHistory),
-          JSON.stringify(item.shortHistory),
           ts
         );
       }
@@ -747,11 +731,7 @@ const normalizeTwitterSubscriptions = (values: unknown): TwitterSubscriptionReco
 
     const name = typeof record.name === "string" && record.name.trim() ? record.name.trim() : id;
     const tweetId = typeof record.tweetId === "string" ? record.tweetId.trim() : "";
-    const tweetHistory = normalizeStringList(record.tweetHistory);
-    if (tweetId && !tweetHistory.includes(tweetId)) {
-      tweetHistory.push(tweetId);
-    }
-    result.push({ id, name, tweetId, tweetHistory });
+    result.push({ id, name, tweetId });
   }
 
   return result;
@@ -784,8 +764,7 @@ export const getTwitterSettings = async (serverId: string): Promise<TwitterSetti
         SELECT
           account_id,
           display_name,
-          tweet_id,
-          tweet_history
+          tweet_id
         FROM twitter_subscriptions
         WHERE server_id = ?
       `
@@ -794,7 +773,6 @@ export const getTwitterSettings = async (serverId: string): Promise<TwitterSetti
     account_id: string;
     display_name: string | null;
     tweet_id: string | null;
-    tweet_history: string | null;
   }>;
 
   return {
@@ -802,16 +780,10 @@ export const getTwitterSettings = async (serverId: string): Promise<TwitterSetti
     TwitterNotificationText: row?.twitter_notification_text ?? DEFAULT_TWITTER_NOTIFICATION_TEXT,
     XUsers: xusers.map((item) => {
       const id = item.account_id.trim().toLowerCase().replace(/^@+/, "");
-      const tweetHistory = parseJsonArray(item.tweet_history);
-      const tweetId = item.tweet_id ?? "";
-      if (tweetId && !tweetHistory.includes(tweetId)) {
-        tweetHistory.push(tweetId);
-      }
       return {
         id,
         name: item.display_name?.trim() || id,
-        tweetId,
-        tweetHistory
+        tweetId: item.tweet_id ?? ""
       };
     })
   };
@@ -852,10 +824,9 @@ export const upsertTwitterSettings = async (
           account_id,
           display_name,
           tweet_id,
-          tweet_history,
           updated_at
         )
-        VALUES (?, ?, ?, ?, ?, ?)
+        VALUES (?, ?, ?, ?, ?)
       `
     );
 
@@ -867,7 +838,6 @@ export const upsertTwitterSettings = async (
           item.id,
           item.name,
           item.tweetId,
-          JSON.stringify(item.tweetHistory),
           ts
         );
       }